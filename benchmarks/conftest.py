@@ -0,0 +1,112 @@
+"""
+Fixtures & hooks of the benchmark suite. Results of a run are written to output/benchmarks/latest.json & compared
+with the selected baseline at the end of the session.
+"""
+import os
+
+import pytest
+
+from benchmarks.harness import BaselineStore, BenchmarkResult, compare, measure, write_report
+from utils.app_constants import AppConstant
+
+RESULTS_KEY = pytest.StashKey[dict]()
+COMPARISONS_KEY = pytest.StashKey[list]()
+SAVED_KEY = pytest.StashKey[str]()
+
+
+def pytest_configure(config):
+    if not config.getoption('--benchmark') or not config.getoption('--benchmark-fail-on-regression'):
+        return
+
+    # Without a baseline nothing is compared, so no regression could ever fail the run.
+    baseline_path = BaselineStore().path(config.getoption('--benchmark-baseline'))
+    if not os.path.isfile(baseline_path):
+        raise pytest.UsageError(f'--benchmark-fail-on-regression needs the baseline {baseline_path}. Record it with '
+                                f'--benchmark-save or pick another one with --benchmark-baseline.')
+
+
+@pytest.fixture
+def benchmark(request):
+    """
+    Measures a callable & records the result under the name of the test.
+
+    Usage:
+        result = benchmark(lambda: schema_registry.validate('login_response', body), rounds=20, inner=200)
+    """
+    results = request.config.stash.setdefault(RESULTS_KEY, {})
+    rounds_override = request.config.getoption('--benchmark-rounds')
+
+    def run(func, rounds=10, warmup=1, inner=1, setup=None, name=None, **metadata):
+        """
+        :param func: callable to measure.
+        :param rounds: number of samples. --benchmark-rounds overrides it.
+        :param warmup: rounds run before measuring.
+        :param inner: calls per round.
+        :param setup: callable run before every round, outside of the measured time.
+        :param name: name of the benchmark. Defaults to the test name.
+        :param metadata: stored with the result, i.e.: the number of elements read.
+        :return: BenchmarkResult
+        """
+        samples = measure(func, rounds_override or rounds, warmup, inner, setup)
+        result = BenchmarkResult(name or request.node.name, samples, metadata=metadata)
+        results[result.name] = result
+        return result
+
+    return run
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    results = config.stash.get(RESULTS_KEY, None)
+    if not results:
+        return
+
+    write_report(os.path.join(AppConstant.OUTPUT_FOLDER, 'benchmarks', 'latest.json'),
+                 {name: result.to_dict() for name, result in results.items()})
+
+    store = BaselineStore()
+    baseline_name = config.getoption('--benchmark-baseline')
+    baseline = store.load(baseline_name)
+    comparisons = compare(results, baseline, config.getoption('--benchmark-max-regression'),
+                          config.getoption('--benchmark-alpha')) if baseline else []
+    config.stash[COMPARISONS_KEY] = comparisons
+
+    if config.getoption('--benchmark-save'):
+        config.stash[SAVED_KEY] = store.save(baseline_name, results)
+
+    if config.getoption('--benchmark-fail-on-regression'):
+        if baseline is None:
+            # The baseline was checked in pytest_configure, but it may have been saved in an older format.
+            session.exitstatus = pytest.ExitCode.USAGE_ERROR
+        elif any(c.regressed for c in comparisons):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(RESULTS_KEY, None)
+    if not results:
+        return
+
+    terminalreporter.section('benchmarks')
+    for name, result in sorted(results.items()):
+        terminalreporter.write_line(f'{name}: median {result.median * 1000:.3f} ms, p95 '
+                                    f'{result.percentile(95) * 1000:.3f} ms, {result.throughput:.1f}/s '
+                                    f'({len(result.samples)} rounds)')
+
+    comparisons = config.stash.get(COMPARISONS_KEY, [])
+    if comparisons:
+        terminalreporter.section(f'compared with baseline {config.getoption("--benchmark-baseline")}')
+        for comparison in comparisons:
+            terminalreporter.write_line(comparison.summary(), red=comparison.regressed, green=comparison.improved)
+    else:
+        terminalreporter.write_line(f'No baseline {config.getoption("--benchmark-baseline")} to compare with. '
+                                    f'Save one with --benchmark-save.',
+                                    red=config.getoption('--benchmark-fail-on-regression'))
+
+    missing = sorted(set(results) - {comparison.name for comparison in comparisons})
+    if comparisons and missing:
+        terminalreporter.write_line(f'Not in the baseline, so not compared: {", ".join(missing)}', yellow=True)
+
+    saved_path = config.stash.get(SAVED_KEY, None)
+    if saved_path:
+        terminalreporter.write_line(f'Baseline saved to {saved_path}')
@@ -0,0 +1,247 @@
+"""
+Measures benchmarks, stores their results as baselines & compares runs against them.
+
+A result keeps every sample (seconds per operation), so a comparison can test whether the current run is slower than
+the baseline with a one sided Mann-Whitney U test instead of trusting a difference of two medians.
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from utils.app_constants import AppConstant
+
+BASELINE_FOLDER = os.path.join(AppConstant.PROJECT_ROOT, 'benchmarks', 'baselines')
+BASELINE_FORMAT_VERSION = 1
+
+
+class BenchmarkResult:
+    """
+    Samples of one benchmark. Every sample is the time in seconds a single operation took.
+    """
+
+    def __init__(self, name, samples, unit='op', metadata=None):
+        self.name = name
+        self.samples = list(samples)
+        self.unit = unit
+        self.metadata = metadata or {}
+
+    @property
+    def median(self):
+        return statistics.median(self.samples)
+
+    @property
+    def mean(self):
+        return statistics.fmean(self.samples)
+
+    @property
+    def stdev(self):
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def throughput(self):
+        """
+        Operations per second, based on the median.
+        """
+        return 1 / self.median if self.median else math.inf
+
+    def percentile(self, percent):
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def to_dict(self):
+        return {
+            'unit': self.unit,
+            'rounds': len(self.samples),
+            'median_ms': round(self.median * 1000, 4),
+            'mean_ms': round(self.mean * 1000, 4),
+            'stdev_ms': round(self.stdev * 1000, 4),
+            'min_ms': round(min(self.samples) * 1000, 4),
+            'p95_ms': round(self.percentile(95) * 1000, 4),
+            'throughput': round(self.throughput, 2),
+            'metadata': self.metadata,
+            'samples': self.samples,
+        }
+
+    @classmethod
+    def from_dict(cls, name, data):
+        return cls(name, data['samples'], data.get('unit', 'op'), data.get('metadata'))
+
+
+def measure(func, rounds=10, warmup=1, inner=1, setup=None):
+    """
+    Calls func repeatedly & returns the seconds per call of every round.
+
+    :param func: callable to measure.
+    :param rounds: number of samples.
+    :param warmup: rounds run before measuring, their timings are dropped.
+    :param inner: calls per round. Raise it for fast operations, so timer resolution doesn't dominate the samples.
+    :param setup: callable run before every round, outside of the measured time.
+    """
+    samples = []
+    for round_index in range(warmup + rounds):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(inner):
+            func()
+        elapsed = time.perf_counter() - started
+        if round_index >= warmup:
+            samples.append(elapsed / inner)
+    return samples
+
+
+def mann_whitney_slower(current, baseline):
+    """
+    One sided Mann-Whitney U test with normal approximation & tie correction.
+
+    :return: p-value of the hypothesis that the current samples are not larger than the baseline samples. Small
+        values mean the current run is significantly slower.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end) / 2 + 1
+        tied = end - index + 1
+        tie_term += tied ** 3 - tied
+        index = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+
+    # Continuity corrected z for 'current > baseline'.
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class Comparison:
+    """
+    Current result of a benchmark compared with its baseline. A regression is significant when the median got slower
+    by more than max_regression & the Mann-Whitney p-value is below alpha.
+    """
+
+    def __init__(self, name, current, baseline, max_regression=0.10, alpha=0.05):
+        self.name = name
+        self.current = current
+        self.baseline = baseline
+        self.max_regression = max_regression
+        self.alpha = alpha
+        self.ratio = current.median / baseline.median if baseline.median else math.inf
+        self.p_value = mann_whitney_slower(current.samples, baseline.samples)
+
+    @property
+    def regressed(self):
+        return self.ratio > 1 + self.max_regression and self.p_value < self.alpha
+
+    @property
+    def improved(self):
+        return self.ratio < 1 - self.max_regression and mann_whitney_slower(self.baseline.samples,
+                                                                             self.current.samples) < self.alpha
+
+    @property
+    def verdict(self):
+        if self.regressed:
+            return 'REGRESSED'
+        if self.improved:
+            return 'improved'
+        return 'unchanged'
+
+    def summary(self):
+        return (f'{self.name}: {self.baseline.median * 1000:.3f} ms -> {self.current.median * 1000:.3f} ms '
+                f'({(self.ratio - 1) * 100:+.1f}%, p={self.p_value:.3f}) {self.verdict}')
+
+
+def compare(current_results, baseline_results, max_regression=0.10, alpha=0.05):
+    """
+    Compares every benchmark present in both runs. Benchmarks missing from the baseline are skipped.
+    """
+    return [Comparison(name, result, baseline_results[name], max_regression, alpha)
+            for name, result in current_results.items() if name in baseline_results]
+
+
+def environment_info():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=AppConstant.PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+class BaselineStore:
+    """
+    Baselines kept as benchmarks/baselines/<name>.json. Commit them, so every change to a baseline is versioned along
+    with the code it was measured on.
+    """
+
+    def __init__(self, folder=BASELINE_FOLDER):
+        self.folder = folder
+
+    def path(self, name):
+        return os.path.join(self.folder, f'{name}.json')
+
+    def load(self, name):
+        """
+        Returns the results of a baseline by benchmark name, or None if it doesn't exist or has an older format.
+        """
+        try:
+            with open(self.path(name)) as baseline_file:
+                data = json.load(baseline_file)
+        except FileNotFoundError:
+            return None
+
+        if data.get('format_version') != BASELINE_FORMAT_VERSION:
+            print(f'Ignoring baseline {name}, it was saved in format {data.get("format_version")}.')
+            return None
+        return {benchmark: BenchmarkResult.from_dict(benchmark, result)
+                for benchmark, result in data['benchmarks'].items()}
+
+    def save(self, name, results, merge=True):
+        """
+        Saves results as a baseline. With merge, benchmarks which didn't run keep their previous baseline.
+        """
+        benchmarks = {}
+        if merge:
+            previous = self.load(name) or {}
+            benchmarks.update((benchmark, result.to_dict()) for benchmark, result in previous.items())
+        benchmarks.update((benchmark, result.to_dict()) for benchmark, result in results.items())
+
+        write_report(self.path(name), benchmarks)
+        return self.path(name)
+
+
+def write_report(path, benchmarks):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as report_file:
+        json.dump({
+            'format_version': BASELINE_FORMAT_VERSION,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'environment': environment_info(),
+            'benchmarks': dict(sorted(benchmarks.items())),
+        }, report_file, indent=2)
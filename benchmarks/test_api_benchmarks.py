@@ -0,0 +1,25 @@
+import pytest
+from pages.api.authentication_api_page import AuthenticationApiPage
+from resources.data import Data
+from resources.schema.registry import schema_registry
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.api]
+
+
+def test_api_login_latency(benchmark):
+    login_api = AuthenticationApiPage()
+    data = Data()
+
+    def login():
+        response = login_api.login(data.user_email, data.user_password)
+        assert response.status_code == 200
+
+    benchmark(login, rounds=50, warmup=5)
+
+
+def test_schema_validation_throughput(benchmark):
+    data = Data()
+    body = AuthenticationApiPage().login(data.user_email, data.user_password).json()
+    schema_registry.validate('login_response', body)
+
+    benchmark(lambda: schema_registry.validate('login_response', body), rounds=20, inner=500)
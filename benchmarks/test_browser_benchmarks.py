@@ -0,0 +1,67 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from conftest import get_requested_browser
+from pages.ui.base_page import BasePage
+from pages.ui.dashboard_page import DashboardPage
+from pages.ui.login_page import LoginPage
+from resources.data import Data
+
+pytestmark = pytest.mark.benchmark
+
+BULK_ITEMS = (By.CSS_SELECTOR, '#qa-benchmark li')
+BULK_ITEM_COUNT = 200
+ADD_BULK_ITEMS = """
+var list = document.createElement('ul');
+list.id = 'qa-benchmark';
+for (var i = 0; i < arguments[0]; i++) {
+    var item = document.createElement('li');
+    item.className = 'item-' + i;
+    item.textContent = 'Item ' + i;
+    list.appendChild(item);
+}
+document.body.appendChild(list);
+"""
+
+
+def test_driver_startup(benchmark, worker_context):
+    started = []
+
+    def quit_started():
+        while started:
+            started.pop().quit()
+
+    try:
+        benchmark(lambda: started.append(get_requested_browser(worker_context.browser, worker_context)),
+                  rounds=3, setup=quit_started, browser=worker_context.browser)
+    finally:
+        quit_started()
+
+
+def test_login_flow_latency(benchmark, driver, worker_context):
+    login_page = LoginPage(driver)
+    dashboard_page = DashboardPage(driver)
+    data = Data()
+
+    def open_login_page():
+        driver.get(worker_context.url)
+        driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+        driver.get(worker_context.url)
+
+    def login():
+        login_page.login(data.user_email, data.user_password)
+        dashboard_page.wait_for_visibility_of(dashboard_page.CONTENT_MANAGER_TITLE, 10)
+
+    try:
+        benchmark(login, rounds=10, setup=open_login_page)
+    finally:
+        driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+
+
+def test_bulk_read_throughput(benchmark, driver, worker_context):
+    page = BasePage(driver)
+    driver.get(worker_context.url)
+    driver.execute_script(ADD_BULK_ITEMS, BULK_ITEM_COUNT)
+    assert len(page.get_list_of_text_from_locator(BULK_ITEMS)) == BULK_ITEM_COUNT
+
+    benchmark(lambda: page.get_list_of_text_from_locator(BULK_ITEMS), rounds=20, inner=5, elements=BULK_ITEM_COUNT)
@@ -1,9 +1,21 @@
+import contextlib
 import os
-import sys
+import re
+
 import pytest
-from selenium import webdriver
+from pages.ui import locators, step_timer
 from utils.app_constants import AppConstant
 from utils.config_parser import ConfigParser
+from utils.browser_profiles import get_browser_profile
+from utils.driver_pool import DriverPool
+from utils.driver_resolver import ChromeDriverResolver
+from utils.network_conditioner import get_network_conditioner, get_network_profile
+from utils.worker_context import WorkerContext, get_worker_id
+
+WORKER_CONTEXT_KEY = pytest.StashKey[WorkerContext]()
+STUB_SERVER_KEY = pytest.StashKey[object]()
+STEP_SUMMARY_KEY = pytest.StashKey[dict]()
+LOOKUP_REPORT_KEY = pytest.StashKey[locators.LookupReport]()
 
 
 @pytest.hookimpl(trylast=True)
@@ -11,74 +23,486 @@ def pytest_configure(config):
     url = config.getoption('--url')
     browser = config.getoption('--browser')
 
-    configs = ConfigParser()
+    try:
+        get_browser_profile(browser)
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+    if config.getoption('--benchmark') and config.getoption('--env') != 'local':
+        raise pytest.UsageError('Benchmarks run against the local stand-in server, add --env local.')
+
+    configs = ConfigParser(env=config.getoption('--env'))
 
     configs.add_file(AppConstant.SYSTEM_CONFIG)
     configs.load_configs()
 
+    for override in config.getoption('--config'):
+        key, separator, value = override.partition('=')
+        if not separator:
+            raise pytest.UsageError(f'Invalid --config {override}. Expected key=value.')
+        configs.set_config(key.strip(), value)
+
+    if config.getoption('--env') == 'local':
+        start_stub_server(config, configs)
+
     if url is not None:
         configs.set_config('url', url)
 
+    try:
+        get_network_profile(configs.get_config('network_profile') or 'no-throttling')
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+
+    context = WorkerContext(get_worker_id(config), configs, configs.get_config('url'), browser,
+                            config.getoption('browser_version'))
+    context.driver_pool_size = config.getoption('--driver-pool-size')
+    context.driver_resolver = ChromeDriverResolver(browser_version=context.browser_version,
+                                                   offline=config.getoption('--driver-offline'),
+                                                   driver_path=config.getoption('--driver-path'))
+    config.stash[WORKER_CONTEXT_KEY] = context
 
-    #   Other settings is cached here
+    #   Other settings is cached here. Kept for page objects, new code should use the worker_context fixture.
     pytest.configs = configs
-    pytest.url = configs.get_config('url')
+    pytest.url = context.url
     pytest.browser = browser
-    pytest.browser_version = config.getoption("browser_version")
+    pytest.browser_version = context.browser_version
+    pytest.worker_context = context
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Parametrizes tests using the record fixture with the records of @pytest.mark.data('<file>', limit=None). Only
+    record numbers are collected, every test reads its own record from the file when it runs. Without a file the
+    accounts_file config, or else resources/test_data/accounts.csv, is used. The tests only run with --data-matrix.
+    """
+    marker = metafunc.definition.get_closest_marker('data')
+    if marker is None or 'record' not in metafunc.fixturenames:
+        return
+
+    from utils.test_data import get_data_source
+
+    path = (marker.args[0] if marker.args else None) or pytest.configs.get_config('accounts_file') or 'accounts.csv'
+    metafunc.parametrize('record', get_data_source(path).refs(marker.kwargs.get('limit')), ids=repr, indirect=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    skips = {}
+    if not config.getoption('--load'):
+        skips['load'] = pytest.mark.skip(reason='load tests only run with --load')
+    if not config.getoption('--data-matrix'):
+        skips['data'] = pytest.mark.skip(reason='data driven tests only run with --data-matrix')
+    if not config.getoption('--benchmark'):
+        skips['benchmark'] = pytest.mark.skip(reason='benchmarks only run with --benchmark')
+
+    for item in items:
+        if any(marker.name == 'browser' for marker in item.own_markers):
+            # The driver fixture is class scoped, a browser marker on a single test would be silently ignored.
+            raise pytest.UsageError(f'{item.nodeid}: @pytest.mark.browser is only supported on test classes & '
+                                    f'modules, move the test into a class of its own.')
+        for keyword, skip in skips.items():
+            if keyword in item.keywords:
+                item.add_marker(skip)
+
+
+def start_stub_server(config, configs):
+    """
+    Starts the local stand-in of the application & points the url configs to it. Latency & error injection are
+    taken from the local_* configs.
+    """
+    from utils.stub_server import StubServer
+    from utils.test_data import get_data_source
+
+    if getattr(config, 'workerinput', None) is None and config.getoption('numprocesses', None):
+        # The xdist controller doesn't run tests, every worker starts its own server.
+        return
+
+    accounts_file = configs.get_config('accounts_file')
+    users = {str(account['email']): str(account['password'])
+             for account in get_data_source(accounts_file)} if accounts_file else None
+    server = StubServer(port=configs.get_int('local_port', 0), users=users,
+                        latency=configs.get_duration('local_latency', 0),
+                        latency_jitter=configs.get_duration('local_latency_jitter', 0),
+                        error_rate=configs.get_float('local_error_rate', 0)).start()
+    config.stash[STUB_SERVER_KEY] = server
+
+    configs.set_config('url', server.login_page_url)
+    configs.set_config('base_url', server.base_url)
+    configs.set_config('login_base_url', server.login_url)
+
+
+def pytest_unconfigure(config):
+    from pages.api.http_client import close_api_client
+    from utils.test_data import close_account_pool
+    close_api_client()
+    close_account_pool()
+
+    server = config.stash.get(STUB_SERVER_KEY, None)
+    if server is not None:
+        server.stop()
+
+    context = config.stash.get(WORKER_CONTEXT_KEY, None)
+    if context is not None:
+        context.cleanup()
+
+
+def pytest_sessionfinish(session):
+    report = session.config.stash.get(LOOKUP_REPORT_KEY, None)
+    context = session.config.stash.get(WORKER_CONTEXT_KEY, None)
+    if report is not None and context is not None:
+        report.write(context.root_dir)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    summary = config.stash.get(STEP_SUMMARY_KEY, None)
+    if summary:
+        terminalreporter.section('slowest steps')
+        slowest = sorted(summary.items(), key=lambda item: item[1][1], reverse=True)[:10]
+        for (name, locator), (calls, total, longest) in slowest:
+            terminalreporter.write_line(f'{total:8.2f}s total {longest:7.2f}s max {calls:5d}x  {name} {locator or ""}')
+
+    report = config.stash.get(LOOKUP_REPORT_KEY, None)
+    rows = report.rows()[:10] if report is not None else []
+    if rows:
+        terminalreporter.section('slowest locators')
+        for row in rows:
+            compiled = f'  (as {row["compiled"]})' if row['compiled'] else ''
+            terminalreporter.write_line(f'{row["total_ms"]:10.1f}ms total {row["mean_ms"]:8.1f}ms mean '
+                                        f'{row["lookups"]:5d}x  {row["locator"]}{compiled}')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """
+    Distributes whole test classes (or modules for plain test functions) to xdist workers instead of single tests,
+    so class scoped fixtures such as the leased driver are set up once per class. Only the default 'load'
+    distribution is replaced; any other --dist mode is left to xdist.
+    """
+    if config.getoption('dist') != 'load':
+        return None
+
+    from xdist.scheduler import LoadScopeScheduling
+    return LoadScopeScheduling(config, log)
+
+
+@pytest.fixture(scope='session')
+def worker_context(pytestconfig):
+    """
+    Settings & scratch folders owned by the current worker.
+    """
+    return pytestconfig.stash[WORKER_CONTEXT_KEY]
+
+
+@pytest.fixture(scope='session')
+def driver_pools(worker_context):
+    """
+    Session wide pools of warm browsers, one pool per requested browser profile. Every browser started by the pools
+    is quit at the end of the session.
+    """
+    pools = {}
+    yield pools
+    for pool in pools.values():
+        pool.quit_all()
+
+
+@pytest.fixture(scope='session')
+def driver_pool(driver_pools, worker_context):
+    """
+    Pool of browsers for the profile selected with --browser.
+    """
+    return get_driver_pool(driver_pools, worker_context.browser, worker_context)
+
+
+def output_file_name(nodeid):
+    """
+    File name, without extension, for output written per test.
+    """
+    return re.sub(r'[^\w.-]+', '_', nodeid)
+
+
+@pytest.fixture(autouse=True)
+def step_timeline(request, worker_context):
+    """
+    Times the page object steps & WebDriver commands of every test. Tests which ran any step get their timeline
+    attached to the Allure report & written as JSON & CSV to the timings folder of the worker.
+    """
+    mode = request.config.getoption('--step-timing')
+    if mode == 'off':
+        yield None
+        return
+
+    timeline = step_timer.start_timeline(request.node.nodeid, record_commands=mode == 'commands')
+    try:
+        yield timeline
+    finally:
+        step_timer.stop_timeline()
+
+    if timeline.records:
+        import allure
+
+        step_timer.add_to_summary(timeline, request.config.stash.setdefault(STEP_SUMMARY_KEY, {}))
+        request.config.stash.setdefault(LOOKUP_REPORT_KEY, locators.LookupReport()).add_timeline(timeline)
+        timeline_json, timeline_csv = timeline.to_json(), timeline.to_csv()
+        allure.attach(timeline_json, name='step timings', attachment_type=allure.attachment_type.JSON)
+        allure.attach(timeline_csv, name='step timings csv', attachment_type=allure.attachment_type.CSV)
+
+        timings_dir = os.path.join(worker_context.root_dir, 'timings')
+        os.makedirs(timings_dir, exist_ok=True)
+        file_name = output_file_name(request.node.nodeid)
+        for extension, content in (('json', timeline_json), ('csv', timeline_csv)):
+            with open(os.path.join(timings_dir, f'{file_name}.{extension}'), 'w') as timings_file:
+                timings_file.write(content)
+
+
+@pytest.fixture(autouse=True)
+def performance_report(request, worker_context):
+    """
+    Collects the browser performance samples taken by page objects during a test, if asked for with
+    --performance-budgets warn or enforce. Tests with samples get their report attached to the Allure report & written
+    as JSON to the performance folder of the worker.
+    """
+    mode = request.config.getoption('--performance-budgets')
+    if mode == 'off':
+        yield None
+        return
+
+    from pages.ui import performance
+
+    report = performance.start_report(request.node.nodeid, enforce_budgets=mode == 'enforce')
+    try:
+        yield report
+    finally:
+        performance.stop_report()
+
+    if report.samples:
+        import allure
+
+        report_json = report.to_json()
+        allure.attach(report_json, name='performance', attachment_type=allure.attachment_type.JSON)
+        if report.violations and not report.enforce_budgets:
+            print(f'Performance budget exceeded:\n{report.describe_violations()}')
+
+        performance_dir = os.path.join(worker_context.root_dir, 'performance')
+        os.makedirs(performance_dir, exist_ok=True)
+        file_name = output_file_name(request.node.nodeid)
+        with open(os.path.join(performance_dir, f'{file_name}.json'), 'w') as report_file:
+            report_file.write(report_json)
+
 
-def get_driver():
+@pytest.fixture
+def clock():
     """
-    Initialize driver & yield it to currently running test suite. If any suite uses @pytest.mark.no_auto
-    mark then no driver will be returned.
+    FrozenClock used by get_clock() & the clock aware helpers for the duration of the test, starting at the current
+    time. Hand it to page.browser_clock.sync(clock) so the application sees the same time.
     """
-    driver = get_requested_browser(pytest.browser)
-    driver.get(pytest.url)
+    from utils.clock import FrozenClock, use_clock
+
+    with use_clock(FrozenClock()) as frozen:
+        yield frozen
+
+
+@pytest.fixture(autouse=True)
+def network_conditions(request):
+    """
+    Applies @pytest.mark.network(profile, block=[...]) to the browser of the test class for the duration of the test.
+    profile is a name from utils/network_conditioner.NETWORK_PROFILES i.e.: offline, slow-3g or fast-3g, block takes
+    URL patterns or the presets analytics, fonts, images & media.
+    """
+    marker = request.node.get_closest_marker('network')
+    if marker is None:
+        yield None
+        return
+
+    profile = marker.args[0] if marker.args else marker.kwargs.get('profile')
+    conditioner = get_network_conditioner(request.getfixturevalue('driver'))
+    with conditioner.conditions(profile, marker.kwargs.get('block', ())):
+        yield conditioner
+
+
+def get_driver_pool(driver_pools, browser, context):
+    if browser not in driver_pools:
+        driver_pools[browser] = DriverPool(lambda slot: get_requested_browser(browser, context, f'{browser}-{slot}'),
+                                           context.url, context.driver_pool_size)
+    return driver_pools[browser]
+
+
+@pytest.fixture(scope='class')
+def driver(request, driver_pools, worker_context):
+    """
+    Leases a driver from the pool for the whole test class & exposes it as `driver` attribute of the class. The
+    driver is returned to the pool, with its cookies & storage cleared, once the class is finished.
+
+    A class or module can ask for a different browser profile than --browser with @pytest.mark.browser('<name>').
+    The marker isn't allowed on single tests, see pytest_collection_modifyitems.
+    """
+    marker = request.node.get_closest_marker('browser')
+    browser = marker.args[0] if marker else worker_context.browser
+    driver_pool = get_driver_pool(driver_pools, browser, worker_context)
+
+    leased_driver = driver_pool.acquire()
+    if request.cls is not None:
+        request.cls.driver = leased_driver
+    yield leased_driver
+    driver_pool.release(leased_driver)
 
-    browser_version = driver.capabilities['browserVersion']
-    os.environ['browser_version'] = browser_version
+
+@pytest.fixture
+def record(request):
+    """
+    Record of the test data file given with @pytest.mark.data, read when the test runs.
+    """
+    return request.param.load()
+
+
+@contextlib.contextmanager
+def lease_account():
+    """
+    Leases an account from the accounts_file config for the duration of the block. Without an accounts file every
+    test shares the user of resources/data.py.
+    """
+    from resources.data import Data
+    from utils.test_data import get_account_pool
+
+    pool = get_account_pool()
+    if pool is None:
+        data = Data()
+        yield {'email': data.user_email, 'password': data.user_password}
+        return
+
+    with pool.leased() as account:
+        yield account
+
+
+@pytest.fixture
+def account():
+    """
+    Account no other test of any worker uses at the same time, i.e.: {'email': ..., 'password': ...}.
+    """
+    with lease_account() as leased:
+        yield leased
+
+
+@pytest.fixture(scope='class')
+def logged_in_driver(request, driver):
+    """
+    The class' leased driver, logged in & showing the page the application opens after login. The login form is used
+    once per user; later classes & workers restore the user's storage state snapshot instead.
+
+    Classes log in with an account leased for the whole class (see the account fixture) unless they ask for a user
+    with @pytest.mark.user('<email>', '<password>').
+    """
+    from pages.ui.login_page import LoginPage
+
+    marker = request.node.get_closest_marker('user')
+    if marker is not None:
+        LoginPage(driver).login_with_storage_state(*marker.args)
+        yield driver
+        return
+
+    with lease_account() as leased:
+        LoginPage(driver).login_with_storage_state(leased['email'], leased['password'])
+        yield driver
+
+
+def get_driver(context=None):
+    """
+    Initialize a driver outside of the driver pool & navigate it to the base url. The started browser version is
+    recorded on the worker context.
+    """
+    context = context or pytest.worker_context
+    driver = get_requested_browser(context.browser, context)
+    driver.get(context.url)
     print('browser opened')
     return driver
 
 
-def get_requested_browser(requested_browser_name='chrome'):
-    if requested_browser_name == 'chrome':
-        from selenium.webdriver.chrome.service import Service
-        from webdriver_manager.chrome import ChromeDriverManager
+def get_requested_browser(requested_browser_name='chrome', context=None, cache_slot=None):
+    """
+    Starts the requested browser. When a worker context is given the browser gets its own profile & download folder,
+    so browsers started by parallel workers never share state.
 
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_argument('--use-fake-device-for-media-stream')
-        chrome_options.add_argument('--use-fake-ui-for.media-stream')
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
-        driver = webdriver.Chrome(
-                    service=Service(ChromeDriverManager().install()), options=chrome_options)
+    :param cache_slot: driver pool slot i.e.: hc-0, naming the disk cache folder of headless profiles.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    from pages.ui import wait_engine
 
-    elif requested_browser_name == 'debugging':
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.chrome.service import Service
-        from webdriver_manager.chrome import ChromeDriverManager
+    context = context or pytest.worker_context
+    profile = get_browser_profile(requested_browser_name)
 
-        options = Options()
-        options.add_experimental_option('debuggerAddress', 'localhost:9222')
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = webdriver.Chrome(service=Service(context.driver_resolver.resolve()),
+                              options=profile.build_chrome_options(context, cache_slot))
 
-    else:
-        print('Invalid browser type. Please try with Chrome or Firefox.')
-        sys.exit()
+    if profile.window_size is None and profile.debugger_address is None:
+        driver.maximize_window()
+    # Event driven waits block inside execute_async_script, set its timeout once for the whole session.
+    wait_engine.set_script_timeout(driver)
+    context.started_browser_version = driver.capabilities.get('browserVersion')
 
-    driver.maximize_window()
+    network_profile = context.configs.get_config('network_profile')
+    blocked_requests = context.configs.get_list('blocked_requests', [])
+    if network_profile or blocked_requests:
+        get_network_conditioner(driver, network_profile, blocked_requests)
 
     return driver
 
 
 def pytest_addoption(parser):
     parser.addoption('--env', action='store', default='dev',
-                     help='env: dev, staging or prod/live')
+                     help='env: dev, staging, prod/live or local. local runs against a bundled stand-in server.')
+    parser.addoption('--config', action='append', default=[], metavar='KEY=VALUE',
+                     help='config: overrides a config from the .properties files & environment. Can be repeated.')
     parser.addoption('--url', action='store', help='url: dev, staging or production url. If it is provided,'
                                                    'this value will override the value provided by config file.')
     parser.addoption('--browser', action='store', default='chrome',
-                     help='browser: chrome/firefox/hc/headless-chrome. Used for browser selection,')
+                     help='browser: chrome/hc/headless-chrome/hl/headless-lite/debugging. Used for browser selection,')
     parser.addoption('--browser-version', action='store',
-                     help='browser-version: 116/117/118/119/120. Used for selecting '
-                          'chrome browser version to execute test cases.')
-
+                     help='browser-version: 116/117/118/119/120 or a full version i.e.: 120.0.6099.109. Used for '
+                          'selecting the chromedriver. Only full versions are downloaded when they differ from the '
+                          'installed chrome.')
+    parser.addoption('--driver-pool-size', action='store', type=int, default=1,
+                     help='driver-pool-size: maximum number of browsers kept alive & shared between test classes.')
+    parser.addoption('--driver-offline', action='store_true', default=False,
+                     help='driver-offline: never download chromedriver. Only cached or locally provisioned '
+                          'binaries are used.')
+    parser.addoption('--driver-path', action='store',
+                     help='driver-path: path to a locally provisioned chromedriver binary.')
+    parser.addoption('--step-timing', action='store', default='steps', choices=('off', 'steps', 'commands'),
+                     help='step-timing: off, steps (time page object steps) or commands (also list every WebDriver '
+                          'command as a step). Timelines are written to output/workers/<worker>/timings.')
+    parser.addoption('--performance-budgets', action='store', default='off', choices=('off', 'warn', 'enforce'),
+                     help='performance-budgets: off (default) collects no browser performance metrics, warn collects '
+                          'them & reports exceeded budgets & enforce fails the tests exceeding a budget.')
+    parser.addoption('--load', action='store_true', default=False,
+                     help='load: run the tests marked with load. They are skipped otherwise.')
+    parser.addoption('--data-matrix', action='store_true', default=False,
+                     help='data-matrix: run the tests marked with data, one per record. They are skipped otherwise.')
+    parser.addoption('--load-url', action='store',
+                     help='load-url: login endpoint to put under load. A local stub server is used if not provided.')
+    parser.addoption('--load-concurrency', action='store', type=int, default=10,
+                     help='load-concurrency: number of virtual users.')
+    parser.addoption('--load-duration', action='store', type=float, default=10,
+                     help='load-duration: seconds the load is applied for, ramp-up included.')
+    parser.addoption('--load-ramp-up', action='store', type=float, default=0,
+                     help='load-ramp-up: seconds over which the virtual users are started.')
+    parser.addoption('--load-rps', action='store', type=float,
+                     help='load-rps: target requests per second across all virtual users. Unlimited if not provided.')
+    parser.addoption('--load-max-error-rate', action='store', type=float, default=0.01,
+                     help='load-max-error-rate: highest share of failed requests the load run accepts.')
+    parser.addoption('--benchmark', action='store_true', default=False,
+                     help='benchmark: run the tests marked with benchmark (see benchmarks/). Requires --env local.')
+    parser.addoption('--benchmark-baseline', action='store', default='local',
+                     help='benchmark-baseline: name of the baseline in benchmarks/baselines the run is compared with.')
+    parser.addoption('--benchmark-save', action='store_true', default=False,
+                     help='benchmark-save: save the results of this run as the baseline.')
+    parser.addoption('--benchmark-rounds', action='store', type=int,
+                     help='benchmark-rounds: overrides the number of measured rounds of every benchmark.')
+    parser.addoption('--benchmark-fail-on-regression', action='store_true', default=False,
+                     help='benchmark-fail-on-regression: fail the run if a benchmark got significantly slower than '
+                          'the baseline.')
+    parser.addoption('--benchmark-max-regression', action='store', type=float, default=0.10,
+                     help='benchmark-max-regression: slowdown of the median tolerated before a benchmark regresses, '
+                          'i.e.: 0.1 for 10%%.')
+    parser.addoption('--benchmark-alpha', action='store', type=float, default=0.05,
+                     help='benchmark-alpha: significance level of the Mann-Whitney U test deciding a regression.')
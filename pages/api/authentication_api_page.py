@@ -1,10 +1,15 @@
-import pytest
+import threading
+
 from pages.api.base_page import BasePage
-import json
+from pages.api.token_cache import get_token_cache
+from utils.config_parser import ConfigValue
 
 
 class AuthenticationApiPage(BasePage):
-    login_base_url = pytest.configs.get_config('login_base_url')
+    login_base_url = ConfigValue('login_base_url')
+    auth_storage_key = ConfigValue('auth_storage_key', 'token')
+
+    _login_lock = threading.Lock()
 
     def create_auth_payload(self, email_id: str, password: str):
         auth_body = {
@@ -13,4 +18,67 @@ class AuthenticationApiPage(BasePage):
             "rememberMe": True
         }
 
-        return auth_body
\ No newline at end of file
+        return auth_body
+
+    def login(self, email_id: str, password: str):
+        """
+        Posts the credentials to the login endpoint & returns the raw response.
+        """
+        return self.client.post(self.login_base_url, json=self.create_auth_payload(email_id, password))
+
+    def get_auth(self, email_id: str, password: str):
+        """
+        Returns the login response body for the credentials. Logs in only if no valid response is cached yet.
+
+        :raises RuntimeError: if the login request fails.
+        """
+        token_cache = get_token_cache()
+        auth = token_cache.get(email_id, password, self.login_base_url)
+        if auth is not None:
+            return auth
+
+        with self._login_lock:
+            # Another thread may have logged in with the same credentials while we were waiting.
+            auth = token_cache.get(email_id, password, self.login_base_url)
+            if auth is None:
+                response = self.login(email_id, password)
+                if response.status_code != 200:
+                    raise RuntimeError(f'Login for {email_id} failed with status {response.status_code}.')
+                auth = response.json()
+                token_cache.put(email_id, password, self.login_base_url, auth)
+        return auth
+
+    def get_token(self, email_id: str, password: str):
+        return self.get_auth(email_id, password)['token']
+
+    def authorize_client(self, email_id: str, password: str):
+        """
+        Sends the cached token of the credentials with every further request of the API client.
+        """
+        auth = self.get_auth(email_id, password)
+        self.client.set_header('Authorization', f"{auth.get('type', 'Bearer')} {auth['token']}")
+
+    def inject_into_browser(self, driver, email_id: str, password: str, url=None):
+        """
+        Puts the cached token into the browser's cookies & localStorage under auth_storage_key, so the application
+        treats the browser as logged in without going through the login form.
+
+        :param driver: WebDriver to authenticate.
+        :param email_id: email of the user.
+        :param password: password of the user.
+        :param url: page opened once the token is in place. Defaults to base_url.
+        """
+        token = self.get_token(email_id, password)
+
+        # Cookies & storage can only be written for the origin currently loaded.
+        if not driver.current_url.startswith(self.base_url):
+            driver.get(self.base_url)
+        driver.add_cookie({'name': self.auth_storage_key, 'value': token, 'path': '/'})
+        driver.execute_script('window.localStorage.setItem(arguments[0], arguments[1]);', self.auth_storage_key, token)
+        driver.get(url or self.base_url)
+
+    def invalidate_token(self, email_id: str, password: str):
+        """
+        Forgets the cached token i.e.: after the application rejected it.
+        """
+        get_token_cache().invalidate(email_id, password, self.login_base_url)
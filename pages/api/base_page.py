@@ -1,5 +1,13 @@
-import pytest
+from pages.api.http_client import get_api_client
+from utils.config_parser import ConfigValue
 
 
 class BasePage:
-    base_url = pytest.configs.get_config('base_url')
\ No newline at end of file
+    base_url = ConfigValue('base_url')
+
+    @property
+    def client(self):
+        """
+        Session wide, connection pooled HTTP client every API page sends its requests through.
+        """
+        return get_api_client()
@@ -0,0 +1,94 @@
+"""
+Provides the HTTP client shared by all API pages. A single keep-alive session is used for the whole test session so
+connections to the gateway are reused instead of being opened for every request.
+"""
+import pytest
+
+
+class ApiClient:
+    """
+    Connection pooled wrapper around requests.Session with retries, backoff, a default timeout & default JSON headers.
+    """
+
+    DEFAULT_HEADERS = {
+        'Accept': 'application/json',
+        'Content-Type': 'application/json',
+    }
+
+    def __init__(self, pool_size=10, retries=3, backoff_factor=0.3, timeout=30, headers=None,
+                 retry_statuses=(502, 503, 504)):
+        """
+        :param pool_size: maximum number of kept alive connections per host.
+        :param retries: number of retries for failed connections & retry_statuses responses.
+        :param backoff_factor: retries wait backoff_factor * 2 ** (retry - 1) seconds.
+        :param timeout: default timeout in seconds for every request.
+        :param headers: headers sent with every request, on top of DEFAULT_HEADERS.
+        :param retry_statuses: response status codes which are retried for idempotent methods.
+        """
+        # Imported here so collecting tests doesn't pay for importing requests.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(self.DEFAULT_HEADERS)
+        self.session.headers.update(headers or {})
+
+        retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=retry_statuses,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def set_header(self, name, value):
+        self.session.headers[name] = value
+
+    def remove_header(self, name):
+        self.session.headers.pop(name, None)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+
+
+def get_api_client():
+    """
+    Returns the session wide client, creating it from the api_* configs on first use.
+    """
+    global _client
+    if _client is None:
+        configs = pytest.configs
+        _client = ApiClient(pool_size=configs.get_int('api_pool_size', 10),
+                            retries=configs.get_int('api_retries', 3),
+                            backoff_factor=configs.get_float('api_backoff_factor', 0.3),
+                            timeout=configs.get_duration('api_timeout', 30))
+    return _client
+
+
+def close_api_client():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
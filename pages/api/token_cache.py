@@ -0,0 +1,122 @@
+"""
+Caches login responses so every test session logs in only once per set of credentials.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from utils.app_constants import AppConstant
+from utils.file_lock import FileLock
+
+
+class TokenCache:
+    """
+    Keeps login responses keyed by credentials & login url until they expire. If a path is given, entries are
+    persisted to disk as well so other workers & later sessions can reuse them.
+
+    The expiry is taken from the `exp` claim when the token is a JWT, otherwise `default_ttl` seconds after login.
+    Entries are dropped `expiry_margin` seconds early so a token never expires in the middle of a test.
+    """
+
+    def __init__(self, path=None, default_ttl=3600, expiry_margin=60):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.expiry_margin = expiry_margin
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(email, password, login_url):
+        """
+        Cache key for a pair of credentials of the environment behind login_url, so a token is never handed to
+        another environment with the same users. Passwords are never written to disk in clear text.
+        """
+        return hashlib.sha256(f'{email}\0{password}\0{login_url}'.encode()).hexdigest()
+
+    def get(self, email, password, login_url):
+        """
+        Returns the cached login response for the credentials or None.
+        """
+        key = self.key(email, password, login_url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.path:
+                entry = self._read_file().get(key)
+                if entry is not None:
+                    self._entries[key] = entry
+
+            if entry is None:
+                return None
+            if entry['expires_at'] - self.expiry_margin <= time.time():
+                self._entries.pop(key, None)
+                return None
+            return entry['auth']
+
+    def put(self, email, password, login_url, auth):
+        """
+        Stores a login response (the parsed JSON body holding the token).
+        """
+        key = self.key(email, password, login_url)
+        entry = {'auth': auth, 'expires_at': self._get_expiry(auth.get('token'))}
+
+        with self._lock:
+            self._entries[key] = entry
+            if self.path:
+                with FileLock(f'{self.path}.lock'):
+                    entries = self._read_file()
+                    entries[key] = entry
+                    self._write_file(entries)
+
+    def invalidate(self, email, password, login_url):
+        key = self.key(email, password, login_url)
+        with self._lock:
+            self._entries.pop(key, None)
+            if self.path:
+                with FileLock(f'{self.path}.lock'):
+                    entries = self._read_file()
+                    if entries.pop(key, None) is not None:
+                        self._write_file(entries)
+
+    def _get_expiry(self, token):
+        try:
+            payload = token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            return float(claims['exp'])
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+            return time.time() + self.default_ttl
+
+    def _read_file(self):
+        try:
+            with open(self.path) as cache_file:
+                return json.load(cache_file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_file(self, entries):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as cache_file:
+            json.dump(entries, cache_file)
+        os.replace(temp_path, self.path)
+
+
+_token_cache = None
+
+
+def get_token_cache():
+    """
+    Returns the session wide token cache, creating it from the token_* configs on first use. A relative
+    token_cache_file is resolved against the project root. Leave it empty to keep tokens in memory only.
+    """
+    global _token_cache
+    if _token_cache is None:
+        configs = pytest.configs
+        path = configs.get_config('token_cache_file')
+        _token_cache = TokenCache(path=os.path.join(AppConstant.PROJECT_ROOT, path) if path else None,
+                                  default_ttl=configs.get_duration('token_ttl', 3600))
+    return _token_cache
@@ -1,11 +1,10 @@
 """
 Provides generic methods for interacting with application UI using selenium library at the core.
 """
-import os
+import contextlib
 import time
 import sys
-import pytest
-from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -14,9 +13,19 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.relative_locator import locate_with
 from selenium.webdriver.support.ui import Select, WebDriverWait
 
+from pages.ui import locators, performance, scripts, step_timer, wait_engine
+from pages.ui.element_cache import ElementCache
+from pages.ui.performance import PerformanceCollector
+from pages.ui.wait_engine import WaitEngine
+from utils.clock import get_browser_clock
+from utils.network_conditioner import get_network_conditioner
 
-def wait_for(max_wait=15):
-    time.sleep(max_wait)
+
+def wait_for(driver, max_wait=15):
+    """
+    Waits until the page of the given driver is settled, at most max_wait seconds.
+    """
+    WaitEngine(driver).wait_for_settle(max_wait)
 
 
 class ElementAttributeToBe:
@@ -27,6 +36,7 @@ class ElementAttributeToBe:
         self.locator = locator
         self.attribute = attribute
         self.attribute_value = expected_attribute_value
+        self.js_condition = ('attribute', locator, {'name': attribute, 'value': expected_attribute_value})
 
     def __call__(self, driver, *args, **kwargs):
         expected_element = driver.find_element(*self.locator)
@@ -38,6 +48,7 @@ class ElementCountToBeEqual:
     def __init__(self, locator, expected_count):
         self.locator = locator
         self.expected_count = expected_count
+        self.js_condition = ('count', locator, {'count': expected_count})
 
     def __call__(self, driver, *args, **kwargs):
         elements = driver.find_elements(*self.locator)
@@ -52,6 +63,7 @@ class ElementCountToBeEqualOrGrater:
     def __init__(self, locator, expected_count):
         self.locator = locator
         self.expected_count = expected_count
+        self.js_condition = ('count_at_least', locator, {'count': expected_count})
 
     def __call__(self, driver, *args, **kwargs):
         elements = driver.find_elements(*self.locator)
@@ -64,10 +76,48 @@ class BasePage:
     """
     Contains methods for basic page interaction. All the methods are wrapper arround selenium
     webdriver methods.
+
+    When BATCH_DOM_READS is True, methods returning a list of texts/attributes read every element in a single
+    execute_script call instead of one WebDriver round-trip per element.
+
+    When CACHE_ELEMENTS is True (or cache_elements=True is passed), elements resolved by get_element are cached by
+    locator & reused, after one cheap check that they are still attached, until they go stale, the page navigates,
+    an element is clicked or the window/frame is switched.
+
+    When EVENT_DRIVEN_WAITS is True, waits on locators are resolved inside the browser by a MutationObserver in one
+    blocking call instead of polling through WebDriverWait. Other conditions are still polled.
+
+    When COMPILE_LOCATORS is True, XPath locators CSS can express are looked up as CSS selectors (see
+    pages/ui/locators.py). Page objects can set LOCATOR_CONTAINER to a (By, value) locator, the other XPath locators
+    of the page are then only evaluated inside that container.
+
+    When COLLECT_PERFORMANCE is True & a performance report is running, which is opt-in with --performance-budgets,
+    every navigation through the page object is sampled (see pages/ui/performance.py) & checked against
+    PERFORMANCE_BUDGET. measure_action samples any action.
+
+    Public methods of BasePage & of every page object deriving from it are timed as steps, with the WebDriver
+    commands they send, whenever a step timeline is running (see pages/ui/step_timer.py).
     """
 
-    def __init__(self, driver):
-        self.driver = driver
+    BATCH_DOM_READS = True
+    CACHE_ELEMENTS = False
+    EVENT_DRIVEN_WAITS = True
+    COMPILE_LOCATORS = True
+    LOCATOR_CONTAINER = None
+    COLLECT_PERFORMANCE = True
+    PERFORMANCE_BUDGET = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        step_timer.instrument_page_class(cls)
+
+    def __init__(self, driver, cache_elements=None):
+        self.driver = step_timer.instrument_driver(driver)
+        if cache_elements is None:
+            cache_elements = self.CACHE_ELEMENTS
+        self.element_cache = ElementCache() if cache_elements else None
+        self.wait_engine = WaitEngine(driver)
+        self.performance = PerformanceCollector(driver)
         # Determine the correct modifier key based on the platform
         if sys.platform == "darwin": # 'darwin' is the platform name for macOS
             self.modifier_key = Keys.COMMAND
@@ -77,12 +127,144 @@ class BasePage:
     def get_current_url(self):
         return self.driver.current_url
 
+    def navigate_to(self, url):
+        self.invalidate_element_cache()
+        self.driver.get(url)
+        self._record_page_load()
+
+    def refresh_page(self):
+        self.invalidate_element_cache()
+        self.driver.refresh()
+        self._record_page_load()
+
+    def navigate_back(self):
+        self.invalidate_element_cache()
+        self.driver.back()
+        self._record_page_load()
+
+    def _record_page_load(self):
+        if self.COLLECT_PERFORMANCE and performance.current_report() is not None:
+            self.collect_page_performance()
+
+    def collect_page_performance(self, name=None, budget=None):
+        """
+        Samples the load of the current page, i.e.: after a click opened it, & adds the sample to the performance
+        report of the running test.
+
+        :param name: label of the sample. Defaults to the url.
+        :param budget: {metric: maximum} the sample must stay within. Defaults to PERFORMANCE_BUDGET.
+        :return: the PerformanceSample.
+        :raises AssertionError: if budgets are enforced & exceeded.
+        """
+        sample = self.performance.collect_navigation(name, budget or self.PERFORMANCE_BUDGET)
+        report = performance.current_report()
+        if report is not None:
+            report.add(sample)
+        return sample
+
+    @step_timer.untimed
+    @contextlib.contextmanager
+    def measure_action(self, name, budget=None, settle=5):
+        """
+        Samples the performance of the actions run inside the with block & adds the sample to the performance report
+        of the running test. Nothing is measured if no report is running.
+
+        Usage:
+            with login_page.measure_action('login to dashboard', budget={'duration': 8000}):
+                login_page.login(email, password)
+
+        :param name: label of the sample.
+        :param budget: {metric: maximum} the sample must stay within, i.e.: duration, largest_contentful_paint,
+            total_blocking_time.
+        :param settle: maximum time to wait for the page to settle before the metrics are read. The wait isn't part
+            of the measured duration.
+        :raises AssertionError: if budgets are enforced & exceeded.
+        """
+        report = performance.current_report()
+        if report is None or not self.COLLECT_PERFORMANCE:
+            yield
+            return
+
+        marker = self.performance.start_action()
+        yield
+        ended = time.perf_counter()
+        self.wait_for_page_to_settle(settle)
+        report.add(self.performance.finish_action(marker, name, budget, ended))
+
+    def _compiled(self, locator):
+        """
+        Returns the locator actually sent to the browser for a page object locator.
+        """
+        if not self.COMPILE_LOCATORS:
+            return locator
+        compiled = locators.compile_locator(locator)
+        if compiled is locator and self.LOCATOR_CONTAINER is not None and isinstance(locator, tuple):
+            try:
+                return locators.scope_locator(locator, self.LOCATOR_CONTAINER)
+            except ValueError:
+                pass
+        return compiled
+
+    def invalidate_element_cache(self):
+        """
+        Drops every cached element. Called whenever the elements found so far can't be trusted anymore.
+        """
+        if self.element_cache is not None:
+            self.element_cache.clear()
+
     def get_element(self, by_locator, max_wait=120):
-        self.wait_for_existence_of(by_locator, max_wait)
-        return self.driver.find_element(*by_locator)
+        if self.element_cache is not None:
+            # Reading the tag name is the cheapest call failing for a stale element, which is evicted & looked up again.
+            element = self.element_cache.get(by_locator, revalidate=lambda cached: cached.tag_name)
+            if element is not None:
+                return element
+
+        condition = wait_engine.presence_of(self._compiled(by_locator))
+        element = self.wait_for_expected_condition(condition, max_wait)
+
+        if self.element_cache is not None:
+            self.element_cache.put(by_locator, element)
+        return element
+
+    def get_visible_element(self, by_locator, max_wait=120):
+        """
+        Returns the element for a locator once it is visible.
+        """
+        if self.element_cache is not None:
+            element = self.element_cache.get(by_locator, revalidate=lambda cached: cached.is_displayed())
+            if element is not None:
+                return element
+
+        condition = wait_engine.visibility_of(self._compiled(by_locator))
+        element = self.wait_for_expected_condition(condition, max_wait)
+
+        if self.element_cache is not None:
+            self.element_cache.put(by_locator, element)
+        return element
+
+    def perform_on_element(self, by_locator, action, max_wait=120, visible=False):
+        """
+        Runs action(element) for the element found by a locator. If a cached element went stale it is evicted,
+        looked up again & the action is retried once.
+
+        :param by_locator: locator of the element.
+        :param action: callable receiving the WebElement.
+        :param max_wait: maximum time to wait for the element.
+        :param visible: wait for visibility instead of existence.
+        :return: whatever the action returns.
+        """
+        lookup = self.get_visible_element if visible else self.get_element
+        try:
+            return action(lookup(by_locator, max_wait))
+        except StaleElementReferenceException:
+            if self.element_cache is None:
+                raise
+            self.element_cache.evict(by_locator, stale=True)
+            step_timer.record_retry()
+            return action(lookup(by_locator, max_wait))
 
     def get_elements(self, by_locator, max_wait=120):
-        return self.driver.find_elements(*by_locator)
+        return self.driver.find_elements(*self._compiled(by_locator))
 
     def get_element_above_of(self, reference_locator, target_locator):
         """
@@ -126,13 +308,13 @@ class BasePage:
         return element.find_element(By.XPATH, './/parent::*')
 
     def get_attribute(self, locator, attribute):
-        return self.get_element(locator).get_attribute(attribute).strip()
+        return self.perform_on_element(locator, lambda element: element.get_attribute(attribute).strip())
 
     def get_attribute_from_element(self, element, attribute):
         return element.get_attribute(attribute).strip()
 
     def get_property(self, locator, _property):
-        return self.get_element(locator).get_property(_property).strip()
+        return self.perform_on_element(locator, lambda element: element.get_property(_property).strip())
 
     def get_properties(self, locator):
         """
@@ -151,7 +333,52 @@ class BasePage:
 
         return self.driver.execute_script(script, element)
 
+    def get_bulk_element_data(self, by_locator, text=True, attributes=(), css_properties=(), rect=False,
+                              include_elements=False):
+        """
+        Reads data for every element found by a locator in one execute_script round-trip.
+
+        Args:
+            by_locator: the locator for which elements to be found. A list of WebElements is accepted as well.
+            text (bool): collect the visible text of every element under 'text'.
+            attributes (iterable): attribute names collected under 'attributes'.
+            css_properties (iterable): css properties collected under 'css'. Colors are returned as rgba like
+                selenium's value_of_css_property does.
+            rect (bool): collect x, y, width & height of every element under 'rect'.
+            include_elements (bool): if True a tuple of (elements, items) is returned.
+
+        Returns:
+            list: one dict per element with the requested data.
+        """
+        spec = {
+            'text': text,
+            'attributes': list(attributes),
+            'css': list(css_properties),
+            'rect': rect,
+            'elements': include_elements,
+        }
+
+        if not by_locator:
+            return ([], []) if include_elements else []
+
+        if isinstance(by_locator, (list, tuple)) and by_locator and isinstance(by_locator[0], WebElement):
+            result = self.driver.execute_script(scripts.BULK_READ, None, None, list(by_locator), spec)
+        else:
+            by, value = self._compiled(by_locator)
+            result = self.driver.execute_script(scripts.BULK_READ, by, value, None, spec)
+            if not result['supported']:
+                # Locator strategies the browser side can't resolve are found through WebDriver first.
+                elements = self.get_elements(by_locator)
+                result = self.driver.execute_script(scripts.BULK_READ, None, None, elements, spec)
+
+        if include_elements:
+            return result['elements'], result['items']
+        return result['items']
+
     def get_list_of_text_from_locator(self, by_locator):
+        if self.BATCH_DOM_READS:
+            return [item['text'].strip() for item in self.get_bulk_element_data(by_locator)]
+
         elements = self.get_elements(by_locator)
 
         list_of_texts = [element.text.strip() for element in elements]
@@ -163,6 +390,9 @@ class BasePage:
         :param elements: list of elements from which text will be extracted
         :return: returns a list of texts/strings extracted from elements provided
         """
+        if self.BATCH_DOM_READS and elements:
+            return [item['text'].strip() for item in self.get_bulk_element_data(list(elements))]
+
         list_of_texts = [element.text.strip() for element in elements]
         return list_of_texts
 
@@ -177,10 +407,44 @@ class BasePage:
         Returns:
             list: a list of values of the specified attribute.
         """
+        if self.BATCH_DOM_READS:
+            items = self.get_bulk_element_data(by_locator, text=False, attributes=[attribute])
+            return [self._strip(item['attributes'][attribute]) for item in items]
+
         elements = self.get_elements(by_locator)
         list_of_values = [element.get_attribute(attribute).strip() for element in elements]
         return list_of_values
 
+    def get_list_of_css_values_from_locator(self, by_locator, css_property):
+        """
+        Returns a css property value for all elements found by given locator in a single round-trip.
+
+        Args:
+            by_locator: the locator for which elements to be found.
+            css_property (str): the css property i.e.: color, background-color, padding etc.
+
+        Returns:
+            list: a list of values of the specified css property.
+        """
+        items = self.get_bulk_element_data(by_locator, text=False, css_properties=[css_property])
+        return [item['css'][css_property].strip() for item in items]
+
+    def get_list_of_rects_from_locator(self, by_locator):
+        """
+        Returns position & size of all elements found by given locator in a single round-trip.
+
+        Args:
+            by_locator: the locator for which elements to be found.
+
+        Returns:
+            list: a list of dicts with x, y, width & height keys.
+        """
+        return [item['rect'] for item in self.get_bulk_element_data(by_locator, text=False, rect=True)]
+
+    @staticmethod
+    def _strip(value):
+        return value.strip() if isinstance(value, str) else value
+
     def get_total_count(self, by_locator, max_wait=60):
         """
         :param by_locator: the locator for which total items to be counted/found
@@ -195,7 +459,7 @@ class BasePage:
         :param max_wait: max wait time to find the required element by locator
         :return: returns a trimmed/stripped string for element located by provided locator
         """
-        return self.get_element(locator, max_wait).text.strip()
+        return self.perform_on_element(locator, lambda element: element.text.strip(), max_wait)
 
     def get_text_by_element(self, element):
         """
@@ -211,6 +475,9 @@ class BasePage:
         :param locator: the locator for which text list to be extracted.
         :return: list of text.
         """
+        if self.BATCH_DOM_READS:
+            return self.get_list_of_text_from_locator(locator)
+
         return [item.text.strip() for item in self.get_elements(locator)]
 
     def get_css_value(self, locator, css_property):
@@ -220,8 +487,7 @@ class BasePage:
         :param css_property: the css property for which value to be extracted
         :return: returns css property value after stripping it off.
         """
-        expected_element = self.get_element(locator)
-        return expected_element.value_of_css_property(css_property).strip()
+        return self.perform_on_element(locator, lambda element: element.value_of_css_property(css_property).strip())
 
     def get_css_value_from_element(self, expected_element, css_property):
         """
@@ -234,27 +500,30 @@ class BasePage:
 
     def click_and_wait(self, by_locator, wait_time=0, max_wait_for_clickable=120):
         """
-        Clicks an element for provided locator & wait for a specified amount of time.
+        Clicks an element for provided locator & wait for the page to settle, at most the specified amount of time.
         :param by_locator: locator for which element to be clicked
-        :param wait_time: wait after click on the element. wait time is in second
+        :param wait_time: maximum wait for the page to settle after the click. wait time is in second
         :param max_wait_for_clickable: maximum waiting time for element to clickable
         :return: returns nothing
         """
-        self.wait_for_element_to_clickable(by_locator, max_wait=max_wait_for_clickable)
-        self.driver.find_element(*by_locator).click()
-        time.sleep(wait_time)
+        condition = wait_engine.clickable(self._compiled(by_locator))
+        element = self.wait_for_expected_condition(condition, max_wait_for_clickable)
+        element.click()
+        self.invalidate_element_cache()
+        self.wait_for_page_to_settle(wait_time)
 
     def click_and_wait_by_element(self, element, wait_time=0, max_wait_for_clickable=120):
         """
-        Click on provided element & wait for a specified amount of time.
+        Click on provided element & wait for the page to settle, at most the specified amount of time.
         :param element: element for which element to be clicked
-        :param wait_time: wait after click on the element. wait time is in second
+        :param wait_time: maximum wait for the page to settle after the click. wait time is in second
         :param max_wait_for_clickable: maximum waiting time for element to clickable
         :return: returns nothing
         """
         self.wait_for_element_to_clickable(element, max_wait=max_wait_for_clickable)
         element.click()
-        time.sleep(wait_time)
+        self.invalidate_element_cache()
+        self.wait_for_page_to_settle(wait_time)
 
     def get_selected_text_from_dropdown(self, dropdown_locator):
         """
@@ -296,21 +565,24 @@ class BasePage:
     def hover(self, by_locator, wait_time=0):
         element = self.get_element(by_locator)
         ActionChains(self.driver).move_to_element(element).perform()
-        time.sleep(wait_time)
+        self.wait_for_page_to_settle(wait_time)
 
     def hover_element(self, by_element, wait_time=0):
         ActionChains(self.driver).move_to_element(by_element).perform()
-        time.sleep(wait_time)
+        self.wait_for_page_to_settle(wait_time)
 
     def hover_and_click(self, by_locator):
         element = self.get_element(by_locator)
         ActionChains(self.driver).move_to_element(element).click().perform()
+        self.invalidate_element_cache()
 
     def hover_and_click_by_element(self, element):
         ActionChains(self.driver).move_to_element(element).click().perform()
+        self.invalidate_element_cache()
 
     def hover_and_double_click_by_element(self, element):
         ActionChains(self.driver).move_to_element(element).double_click().perform()
+        self.invalidate_element_cache()
 
     def clear_field(self, by_locator):
         self.enter_text_at('', by_locator)
@@ -342,6 +614,8 @@ class BasePage:
         else:
             element = self.get_element(target_locator)
             element.send_keys(Keys.ENTER)
+        # Enter may submit a form.
+        self.invalidate_element_cache()
 
     def press_escape(self):
         action = ActionChains(self.driver)
@@ -385,16 +659,16 @@ class BasePage:
         :param clear_existing: if set to True existing content/data is cleared before entering new data.
         :return: returns nothing
         """
-        self.wait_for_visibility_of(target_locator)
-        element = self.get_element(target_locator)
+        def enter_text(element):
+            if clear_existing:
+                element.clear()
+            else:
+                actions = ActionChains(self.driver)
+                actions.key_down(Keys.LEFT_CONTROL).key_down(Keys.END) \
+                    .key_up(Keys.LEFT_CONTROL).key_up(Keys.END).perform()
+            element.send_keys(text)
 
-        if clear_existing:
-            element.clear()
-        else:
-            actions = ActionChains(self.driver)
-            actions.key_down(Keys.LEFT_CONTROL).key_down(Keys.END) \
-                .key_up(Keys.LEFT_CONTROL).key_up(Keys.END).perform()
-        element.send_keys(text)
+        self.perform_on_element(target_locator, enter_text, visible=True)
 
     def select_by_visible_text(self, locator, text_to_select):
         """
@@ -447,15 +721,31 @@ class BasePage:
         else:
             print(f'No selectable item {value_to_select} found...')
 
+    def wait_for_page_to_settle(self, max_wait=10, quiet_period=0.2):
+        """
+        Waits until no request is in flight, no animation is running & the DOM stopped changing for quiet_period
+        seconds. Returns as soon as the page settled, so max_wait is only an upper bound & reaching it is not an error.
+
+        :param max_wait: maximum time in seconds to wait for the page to settle. Nothing is done for 0.
+        :param quiet_period: time in seconds the DOM must stay unchanged.
+        :return: True if the page settled, False if max_wait was reached first.
+        """
+        if max_wait <= 0:
+            return True
+        return self.wait_engine.wait_for_settle(max_wait, quiet_period)
+
     def wait_for_expected_condition(self, condition, max_wait=120):
         """
         Wait for specified time until provided CONDITION is met.
         :param condition: condition for which we must wait until specified amount of time
         :param max_wait: maximum time to wait for the CONDITION to be satisfied
-        :return: nothing
+        :return: the value returned by the CONDITION i.e.: the element for presence/visibility conditions
         """
+        if self.EVENT_DRIVEN_WAITS:
+            return self.wait_engine.until(condition, max_wait)
+
         wait = WebDriverWait(self.driver, max_wait)
-        wait.until(condition)
+        return wait.until(condition)
 
     def wait_for_existence_of(self, locator, max_wait=120):
         """
@@ -465,7 +755,7 @@ class BasePage:
             locator (_type_): the locator for the expected element.
             max_wait (int, optional): maximum wait time before throwing an exception. Defaults to 120.
         """
-        self.wait_for_expected_condition(EC.presence_of_element_located(locator), max_wait)
+        self.wait_for_expected_condition(wait_engine.presence_of(self._compiled(locator)), max_wait)
 
     def wait_for_visibility_of(self, locator, max_wait=120):
         """
@@ -475,7 +765,7 @@ class BasePage:
         :param max_wait: the time we need to wait for until the element is visible for the locator
         :return:
         """
-        self.wait_for_expected_condition(EC.visibility_of_element_located(locator), max_wait)
+        self.wait_for_expected_condition(wait_engine.visibility_of(self._compiled(locator)), max_wait)
 
     def wait_for_visibility_of_element(self, element, max_wait=120):
         """
@@ -494,7 +784,7 @@ class BasePage:
         :param max_wait: the time we need to wait for until the element is invisible for the locator
         :return: returns nothing
         """
-        self.wait_for_expected_condition(EC.invisibility_of_element_located(locator), max_wait)
+        self.wait_for_expected_condition(wait_engine.invisibility_of(self._compiled(locator)), max_wait)
 
         return True
 
@@ -510,7 +800,7 @@ class BasePage:
         Returns:
             boolean: Returns True upon success.
         """
-        self.wait_for_expected_condition(EC.text_to_be_present_in_element(locator, text), max_wait)
+        self.wait_for_expected_condition(wait_engine.text_present(self._compiled(locator), text), max_wait)
 
         return True
 
@@ -534,17 +824,12 @@ class BasePage:
         specified element.
         locator, text
         """
-        for _ in range(second):
-            try:
-                if text not in self.get_text_by_element(element):
-                    return True
-            except Exception as e:
-                print('An exception occurred:', e)
-            time.sleep(1)
-        return False
+        return self._wait_for_element_text(element, lambda element_text: text not in element_text, second)
 
     def wait_for_invisibility_of_text(self, locator, text, max_wait=120):
-        self.wait_for_expected_condition(self.text_to_be_not_present_in_element(locator, text), max_wait)
+        locator = self._compiled(locator)
+        condition = wait_engine.text_absent(locator, text, self.text_to_be_not_present_in_element(locator, text))
+        self.wait_for_expected_condition(condition, max_wait)
         return True
 
     def text_to_be_present_in_web_element(self, element, text, second):
@@ -552,24 +837,31 @@ class BasePage:
         specified element.
         locator, text
         """
-        for _ in range(second):
-            try:
-                if text in self.get_text_by_element(element):
-                    return True
-            except Exception as e:
-                print('An exception occurred:', e)
-            time.sleep(1)
-        return False
+        return self._wait_for_element_text(element, lambda element_text: text in element_text, second)
+
+    def _wait_for_element_text(self, element, predicate, max_wait):
+        """
+        Polls the element's text until predicate(text) holds. Returns False instead of raising on timeout.
+        """
+        try:
+            WebDriverWait(self.driver, max_wait, poll_frequency=0.25, ignored_exceptions=(WebDriverException,)) \
+                .until(lambda driver: predicate(self.get_text_by_element(element)))
+            return True
+        except TimeoutException:
+            return False
 
     def wait_for_element_to_clickable(self, locator, max_wait=120):
-        self.wait_for_expected_condition(EC.element_to_be_clickable(locator), max_wait)
+        if isinstance(locator, tuple):
+            self.wait_for_expected_condition(wait_engine.clickable(self._compiled(locator)), max_wait)
+        else:
+            self.wait_for_expected_condition(EC.element_to_be_clickable(locator), max_wait)
 
     def wait_for_element_count_to_be(self, locator, expected_count, max_wait=120):
-        expected_condition = ElementCountToBeEqual(locator, expected_count)
+        expected_condition = ElementCountToBeEqual(self._compiled(locator), expected_count)
         self.wait_for_expected_condition(expected_condition, max_wait)
 
     def wait_for_attribute_to_be(self, locator, attribute, attribute_value):
-        condition = ElementAttributeToBe(locator, attribute, attribute_value)
+        condition = ElementAttributeToBe(self._compiled(locator), attribute, attribute_value)
         self.wait_for_expected_condition(condition)
 
     def wait_until_attribute_contains(self, element, attribute, attribute_value, timeout=10):
@@ -647,10 +939,20 @@ class BasePage:
             return False
 
     def select_item_from_selection_list(self, locator, expected_item):
+        if self.BATCH_DOM_READS:
+            selection_items, items = self.get_bulk_element_data(locator, include_elements=True)
+            texts = [item['text'].strip() for item in items]
+            if expected_item in texts:
+                selection_items[texts.index(expected_item)].click()
+                self.invalidate_element_cache()
+                print(f'Selection item {expected_item.upper()} selected.')
+            return
+
         selection_items = self.get_elements(locator)
         for item in selection_items:
             if self.get_text_by_element(item) == expected_item:
                 item.click()
+                self.invalidate_element_cache()
                 print(f'Selection item {expected_item.upper()} selected.')
                 break
 
@@ -673,12 +975,13 @@ class BasePage:
     def drag_item_by_offset(self, source_locator, x_offset, y_offset):
         actions = ActionChains(self.driver)
         actions.drag_and_drop_by_offset(self.get_element(source_locator), x_offset, y_offset).perform()
-        time.sleep(1)
+        self.wait_for_page_to_settle(1)
 
     def click_element_by_offset(self, locator, x_offset, y_offset):
         element = self.get_element(locator)
         actions = ActionChains(self.driver)
         actions.move_to_element_with_offset(element, x_offset, y_offset).click().perform()
+        self.invalidate_element_cache()
 
     def drag_mouse_from_one_element_to_another(self, source_locator, destination_locator):
         source_element = self.get_element(source_locator)
@@ -695,6 +998,7 @@ class BasePage:
     def perform_double_click_on(self, locator):
         actions = ActionChains(self.driver)
         actions.double_click(self.get_element(locator)).perform()
+        self.invalidate_element_cache()
 
     def perform_right_click_on(self, element):
         """
@@ -721,6 +1025,7 @@ class BasePage:
 
         :param window_identifier: position of the window or window handle
         """
+        self.invalidate_element_cache()
         if isinstance(window_identifier, int):
             self.driver.switch_to.window(self.driver.window_handles[window_identifier - 1])
         elif isinstance(window_identifier, str):
@@ -729,6 +1034,7 @@ class BasePage:
             print('Invalid window type provided...')
 
     def change_frame(self, frame_identifier, max_wait=60):
+        self.invalidate_element_cache()
         if isinstance(frame_identifier, int):
             self.driver.switch_to.frame(self.get_elements((By.TAG_NAME, 'iframe'))[frame_identifier])
             print(f'Frame switched by using id/index {frame_identifier}...')
@@ -740,7 +1046,7 @@ class BasePage:
             self.wait_for_expected_condition(
                 EC.frame_to_be_available_and_switch_to_it(self.get_element(frame_identifier)), max_wait)
             print(f'Frame switched by using locator {frame_identifier}...')
-        time.sleep(2)
+        self.wait_for_page_to_settle(2)
 
     def wait_for_alert_window_present(self, max_wait=30):
         self.wait_for_expected_condition(EC.alert_is_present(), max_wait=max_wait)
@@ -754,6 +1060,7 @@ class BasePage:
         alert.dismiss()
 
     def back_to_default_content(self):
+        self.invalidate_element_cache()
         self.driver.switch_to.default_content()
 
     def get_css_property(self, attribute, locator):
@@ -773,29 +1080,48 @@ class BasePage:
         # self.Press_Ctrl_And_V(locator)
         ActionChains(self.driver).key_down(self.modifier_key).send_keys('v').key_up(self.modifier_key).perform()
 
-    def get_element_by_text(self, text):
-        locator = (By.XPATH, f'//*[contains(text(),"{text}")]')
-        return self.get_element(locator, 3)
+    def get_element_by_text(self, text, container_locator=None):
+        """
+        Returns the first element containing the text. Pass container_locator to search only inside that container
+        instead of every element of the document.
+        """
+        return self.get_element(self._text_locator(text, container_locator), 3)
 
-    def get_elements_by_text(self, text):
-        locator = (By.XPATH, f'//*[contains(text(),"{text}")]')
-        return self.get_elements(locator)
+    def get_elements_by_text(self, text, container_locator=None):
+        return self.get_elements(self._text_locator(text, container_locator))
 
     @staticmethod
-    def toggle_network(enable=True):
-        password = pytest.configs.get_config('local_password')
-        import platform
-        os_name = platform.system()
-        if os_name == 'Darwin':
-            if enable:
-                os.system(f'echo {password} | sudo -S networksetup -setnetworkserviceenabled Wi-Fi on')
-            else:
-                os.system(f'echo {password} | sudo -S networksetup -setnetworkserviceenabled Wi-Fi off')
-        elif os_name == 'Linux':
-            if enable:
-                os.system('enable_network')
-            else:
-                os.system('disable_network')
+    def _text_locator(text, container_locator=None):
+        locator = (By.XPATH, f'//*[contains(text(),{locators.xpath_string(text)})]')
+        if container_locator is not None:
+            locator = locators.scope_locator(locator, container_locator)
+        return locator
+
+    @property
+    def network(self):
+        """
+        Network conditions of this page's browser: offline mode, throttling profiles & blocked URLs. See
+        utils/network_conditioner.py.
+        """
+        return get_network_conditioner(self.driver)
+
+    @property
+    def browser_clock(self):
+        """
+        Time the application sees in this page's browser, i.e.: browser_clock.sync(clock) for a FrozenClock. See
+        utils/clock.py.
+        """
+        return get_browser_clock(self.driver)
+
+    def toggle_network(self, enable=True):
+        """
+        Takes this browser offline or back online through the DevTools protocol. Other browsers & the machine keep
+        their network.
+        """
+        if enable:
+            self.network.go_online()
+        else:
+            self.network.go_offline()
 
     def disable_network(self):
         self.toggle_network(enable=False)
@@ -818,3 +1144,6 @@ class BasePage:
         action = ActionChains(self.driver)
         self.press_ctrl_and_a(locator)
         action.key_down(self.modifier_key).send_keys('C').key_up(self.modifier_key).perform()
+
+
+step_timer.instrument_page_class(BasePage)
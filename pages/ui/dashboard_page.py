@@ -5,6 +5,8 @@ from resources.data import Data
 
 class DashboardPage(BasePage):
     CONTENT_MANAGER_TITLE = (By.XPATH, "//a[text()='Content Manager']")
+    # Times in ms. Web Vitals consider LCP above 4s & TBT above 600ms poor.
+    PERFORMANCE_BUDGET = {'load': 10000, 'largest_contentful_paint': 4000, 'total_blocking_time': 600}
 
     def __init__(self, driver):
         super().__init__(driver)
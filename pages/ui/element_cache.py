@@ -0,0 +1,91 @@
+"""
+Provides a per-page cache of resolved WebElements keyed by locator.
+"""
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pages.ui import step_timer
+
+
+class ElementCache:
+    """
+    Remembers the WebElement found for a locator, so repeated actions on the same element skip the wait & lookup
+    round-trips. A cached element is revalidated with one cheap WebDriver call before it is handed out & evicted if it
+    went stale. Should it go stale between the check & its use, the page evicts it & looks it up again. Pages clear the
+    whole cache when they navigate, click or switch window/frame.
+
+    Hits & misses are also counted on the step timeline of the running test.
+    """
+
+    def __init__(self):
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale = 0
+        self.stale_hits = 0
+
+    @staticmethod
+    def _key(locator):
+        # Relative locators are dicts & can't be used as keys, those are simply never cached.
+        return locator if isinstance(locator, tuple) else None
+
+    def get(self, locator, revalidate=None):
+        """
+        Returns the cached element for the locator or None.
+
+        :param revalidate: callable receiving the cached element, i.e.: reading its tag name. A stale element is
+            evicted, a falsy result is a miss as well but keeps the element cached.
+        """
+        element = self._elements.get(self._key(locator))
+        if element is not None and revalidate is not None:
+            try:
+                if not revalidate(element):
+                    element = None
+            except StaleElementReferenceException:
+                self._elements.pop(self._key(locator))
+                self.evictions += 1
+                self.stale += 1
+                element = None
+
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        step_timer.record_cache_lookup(element is not None)
+        return element
+
+    def put(self, locator, element):
+        key = self._key(locator)
+        if key is not None:
+            self._elements[key] = element
+
+    def evict(self, locator, stale=False):
+        """
+        Drops the cached element for a locator. Pass stale=True when the element went stale after get() returned it,
+        so the hit that returned it isn't counted as a saved round-trip.
+        """
+        if self._elements.pop(self._key(locator), None) is not None:
+            self.evictions += 1
+            if stale:
+                self.stale += 1
+                self.stale_hits += 1
+
+    def clear(self):
+        self.evictions += len(self._elements)
+        self._elements.clear()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = self.stale = self.stale_hits = 0
+
+    def stats(self):
+        """
+        Returns the cache counters. A hit costs the revalidation call instead of the existence wait & the lookup, so
+        every hit that didn't go stale on use saved at least one round-trip.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'stale': self.stale,
+            'round_trips_saved': self.hits - self.stale_hits,
+        }
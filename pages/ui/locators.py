@@ -0,0 +1,288 @@
+"""
+Compiles (By, value) locators into faster equivalents before they are handed to the browser.
+
+XPath locators are evaluated by walking the document, while CSS selectors are matched by the browser's optimized
+selector engine. XPath made only of element & attribute tests is rewritten to the equivalent CSS selector, i.e.:
+
+    //input[contains(@class, 'mantine-TextInput-input')]  ->  input[class*="mantine-TextInput-input"]
+
+Anything CSS can't express (text(), normalize-space(), axes, unions, ...) stays XPath. Such locators can be scoped to
+a container, so the expensive part is evaluated only inside the container instead of the whole document:
+
+    scope_locator((By.XPATH, "//button[normalize-space()='Sign in']"), (By.ID, 'login-form'))
+    ->  (By.XPATH, "(id('login-form'))//button[normalize-space()='Sign in']")
+
+CSS compares a few HTML attribute values (i.e.: type) case-insensitively where XPath doesn't, other than that the
+rewritten selectors match the same elements in the same document order.
+"""
+import csv
+import functools
+import json
+import os
+import re
+
+CSS_SELECTOR = 'css selector'
+XPATH = 'xpath'
+
+NAME = r'[A-Za-z_][\w-]*'
+LITERAL = r'''(?:'[^']*'|"[^"]*")'''
+STEP_PATTERN = re.compile(rf'^(\*|{NAME})(.*)$', re.S)
+CONDITIONS = [
+    (re.compile(rf'^@({NAME})$'), lambda name: f'[{name}]'),
+    (re.compile(rf'^@({NAME})\s*=\s*({LITERAL})$'), lambda name, value: f'[{name}={css_string(value)}]'),
+    (re.compile(rf'^contains\(\s*@({NAME})\s*,\s*({LITERAL})\s*\)$'),
+     lambda name, value: f'[{name}*={css_string(value)}]' if value[1:-1] else None),
+    (re.compile(rf'^starts-with\(\s*@({NAME})\s*,\s*({LITERAL})\s*\)$'),
+     lambda name, value: f'[{name}^={css_string(value)}]' if value[1:-1] else None),
+    # The usual idiom for matching a whole class name.
+    (re.compile(r'''^contains\(\s*concat\(\s*(['"]) \1\s*,\s*normalize-space\(\s*@class\s*\)\s*,'''
+                r'''\s*(['"]) \2\s*\)\s*,\s*(['"]) (-?[A-Za-z_][\w-]*) \3\s*\)$'''),
+     lambda _, __, ___, class_name: f'.{class_name}'),
+]
+POSITION_PATTERN = re.compile(r'^(\d+|last\(\))$')
+CONTAINER_XPATH = {
+    'id': lambda value: f'id({xpath_string(value)})',
+    'name': lambda value: f'//*[@name={xpath_string(value)}]',
+    'tag name': lambda value: f'//{value}',
+    XPATH: lambda value: value,
+}
+
+
+def css_string(literal):
+    """
+    Turns an XPath string literal into a CSS string.
+    """
+    return css_quote(literal[1:-1])
+
+
+def css_quote(value):
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\a ') + '"'
+
+
+def xpath_string(value):
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return 'concat(' + ', "\'", '.join(f"'{part}'" for part in value.split("'")) + ')'
+
+
+def _split(text, separators, start=0):
+    """
+    Splits text at the given separators, ignoring separators inside quotes, brackets & parentheses.
+
+    :return: list of (separator found before the part, part). The first separator is '' if text doesn't start with one.
+    """
+    parts = []
+    depth = 0
+    quote = None
+    separator = ''
+    part_start = position = start
+    while position < len(text):
+        character = text[position]
+        if quote:
+            if character == quote:
+                quote = None
+        elif character in '\'"':
+            quote = character
+        elif character in '[(':
+            depth += 1
+        elif character in '])':
+            depth -= 1
+        elif depth == 0:
+            found = next((candidate for candidate in separators if text.startswith(candidate, position)), None)
+            if found is not None:
+                if position > part_start or parts or separator:
+                    parts.append((separator, text[part_start:position]))
+                separator = found
+                position += len(found)
+                part_start = position
+                continue
+        position += 1
+    if quote or depth:
+        return None
+    parts.append((separator, text[part_start:]))
+    return parts
+
+
+def _predicates(text):
+    """
+    Splits '[a][b]' into ['a', 'b']. Returns None if text isn't a sequence of predicates.
+    """
+    predicates = []
+    depth = 0
+    quote = None
+    start = None
+    for position, character in enumerate(text):
+        if quote:
+            if character == quote:
+                quote = None
+        elif character in '\'"':
+            quote = character
+        elif character == '[':
+            if depth == 0:
+                start = position + 1
+            depth += 1
+        elif character == ']':
+            depth -= 1
+            if depth == 0:
+                predicates.append(text[start:position].strip())
+            elif depth < 0:
+                return None
+        elif depth == 0 and not character.isspace():
+            return None
+    return predicates if depth == 0 and quote is None else None
+
+
+def _step_to_css(step):
+    match = STEP_PATTERN.match(step.strip())
+    if match is None:
+        return None
+    tag, rest = match.groups()
+    predicates = _predicates(rest)
+    if predicates is None or ':' in tag:
+        return None
+
+    css = '' if tag == '*' else tag
+    for index, predicate in enumerate(predicates):
+        if POSITION_PATTERN.match(predicate):
+            # Positions count siblings of the same tag only while no other predicate filtered them before.
+            if index or tag == '*':
+                return None
+            css += ':last-of-type' if predicate == 'last()' else f':nth-of-type({predicate})'
+            continue
+
+        conditions = _split(predicate, (' and ',))
+        if conditions is None:
+            return None
+        for _, condition in conditions:
+            translated = _condition_to_css(condition.strip())
+            if translated is None:
+                return None
+            css += translated
+    return css or '*'
+
+
+def _condition_to_css(condition):
+    for pattern, translate in CONDITIONS:
+        match = pattern.match(condition)
+        if match:
+            return translate(*match.groups())
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def xpath_to_css(xpath):
+    """
+    Returns the CSS selector matching the same elements as the XPath, or None if CSS can't express it.
+    """
+    xpath = xpath.strip()
+    if xpath.startswith('.//'):
+        # Relative to the element searched from, which is how CSS is evaluated from an element too.
+        xpath = xpath[1:]
+    if not xpath.startswith('//') or '|' in xpath or '::' in xpath:
+        return None
+
+    steps = _split(xpath, ('//', '/'))
+    if not steps or steps[0][0] != '//':
+        return None
+
+    selector = []
+    for separator, step in steps:
+        css = _step_to_css(step)
+        if css is None:
+            return None
+        if selector:
+            selector.append(' > ' if separator == '/' else ' ')
+        selector.append(css)
+    return ''.join(selector)
+
+
+def compile_locator(locator):
+    """
+    Returns the fastest equivalent of a (By, value) locator: XPath CSS can express is rewritten to CSS. Other
+    locators, including relative locators, are returned unchanged.
+    """
+    if isinstance(locator, tuple) and len(locator) == 2 and locator[0] == XPATH:
+        css = xpath_to_css(locator[1])
+        if css is not None:
+            return CSS_SELECTOR, css
+    return locator
+
+
+def scope_locator(locator, container):
+    """
+    Restricts a locator to the inside of a container. CSS & XPath CSS can express are prefixed with the container
+    selector, other XPath is evaluated from the container element(s) instead of the document root.
+
+    :param locator: (By, value) locator, either CSS or XPath starting with //.
+    :param container: (By, value) locator of the container. CSS, XPath, id, name & tag name are supported.
+    :raises ValueError: if the locator or container can't be combined.
+    """
+    by, value = compile_locator(locator)
+
+    if by == CSS_SELECTOR:
+        container_by, container_value = compile_locator(container)
+        if container_by in (CSS_SELECTOR, 'tag name', 'id') and ',' not in value and ',' not in container_value:
+            container_css = f'[id={css_quote(container_value)}]' if container_by == 'id' else container_value
+            return CSS_SELECTOR, f'{container_css} {value}'
+
+    container_by, container_value = container
+    if by == XPATH and value.lstrip().startswith('//') and container_by in CONTAINER_XPATH:
+        return XPATH, f'({CONTAINER_XPATH[container_by](container_value)}){value.lstrip()}'
+
+    raise ValueError(f'Can not scope {locator} to {container}.')
+
+
+class LookupReport:
+    """
+    Collects the time page objects spent looking up each locator, from the step timelines of the tests.
+    """
+
+    LOOKUP_STEPS = ('get_element', 'get_visible_element', 'get_elements', 'wait_for_existence_of',
+                    'wait_for_visibility_of', 'wait_for_element_to_clickable')
+
+    def __init__(self):
+        self.lookups = {}
+
+    def add_timeline(self, timeline):
+        for record in timeline.records:
+            if record.locator is None or record.name not in self.LOOKUP_STEPS:
+                continue
+            entry = self.lookups.setdefault(record.locator, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += record.duration
+            entry[2] = max(entry[2], record.duration)
+
+    def rows(self):
+        """
+        One row per locator, slowest total lookup time first. Times are in milliseconds.
+        """
+        rows = []
+        for locator, (count, total, longest) in self.lookups.items():
+            by, _, value = locator.partition('=')
+            compiled = compile_locator((by, value))
+            rows.append({
+                'locator': locator,
+                'compiled': f'{compiled[0]}={compiled[1]}' if compiled != (by, value) else '',
+                'lookups': count,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total / count * 1000, 3),
+                'max_ms': round(longest * 1000, 3),
+            })
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def write(self, folder):
+        """
+        Writes locator_report.json & locator_report.csv to the folder. Nothing is written if nothing was looked up.
+        """
+        rows = self.rows()
+        if not rows:
+            return
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, 'locator_report.json'), 'w') as report_file:
+            json.dump(rows, report_file, indent=2)
+        with open(os.path.join(folder, 'locator_report.csv'), 'w', newline='') as report_file:
+            writer = csv.DictWriter(report_file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
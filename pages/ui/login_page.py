@@ -1,6 +1,13 @@
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
 from pages.ui.base_page import BasePage
+from pages.ui.dashboard_page import DashboardPage
+from pages.ui.storage_state import get_storage_state_store
 from resources.data import Data
+from utils.config_parser import ConfigValue
 
 
 class LoginPage(BasePage):
@@ -8,9 +15,58 @@ class LoginPage(BasePage):
     EMAIL_FIELD = (By.XPATH, "//input[contains(@class, 'mantine-TextInput-input')]")
     PASSWORD_FIELD = (By.XPATH, "//input[contains(@class, 'mantine-PasswordInput-innerInput')]")
 
+    url = ConfigValue('url')
+
     def __init__(self, driver):
         super().__init__(driver)
         self.driver = driver
         self.data = Data()
 
-    
\ No newline at end of file
+    def login(self, email, password, max_wait=10):
+        """
+        Logs in through the login form & waits until the login form is gone.
+
+        :param email: email of the user.
+        :param password: password of the user.
+        :param max_wait: maximum time to wait for the form to show up & to disappear after submitting.
+        """
+        self.wait_for_visibility_of(self.LOGIN_BUTTON, max_wait)
+        self.enter_text_at(email, self.EMAIL_FIELD)
+        self.enter_text_at(password, self.PASSWORD_FIELD)
+        self.click_and_wait_for_invisibility(self.LOGIN_BUTTON, max_wait)
+
+    def is_logged_in(self, max_wait=10):
+        """
+        Waits until either the dashboard or the login form shows up.
+
+        :return: True for the dashboard, False for the login form or if neither showed up within max_wait seconds.
+        """
+        try:
+            self.wait_for_expected_condition(EC.any_of(
+                EC.visibility_of_element_located(self._compiled(DashboardPage.CONTENT_MANAGER_TITLE)),
+                EC.visibility_of_element_located(self._compiled(self.LOGIN_BUTTON))), max_wait)
+        except TimeoutException:
+            return False
+        return self.is_element_visible(DashboardPage.CONTENT_MANAGER_TITLE, 0)
+
+    def login_with_storage_state(self, email, password, max_wait=10):
+        """
+        Logs in from the user's storage state snapshot (see pages/ui/storage_state.py) & opens the page shown after
+        login. The login form is only used if there is no valid snapshot yet or the application rejected it, the
+        browser state is snapshotted afterwards.
+
+        :param email: email of the user.
+        :param password: password of the user.
+        :param max_wait: maximum time to wait for the dashboard or the login form.
+        :return: True if the snapshot was used, False if the user logged in through the form.
+        """
+        def login():
+            if not self.get_current_url().startswith(self.url):
+                self.driver.get(self.url)
+            self.login(email, password, max_wait)
+            if not self.is_logged_in(max_wait):
+                raise AssertionError(f'Login of {email} through the login form failed.')
+
+        url = urlsplit(self.url)
+        return get_storage_state_store().authenticate(self.driver, email, password, f'{url.scheme}://{url.netloc}',
+                                                      login, lambda: self.is_logged_in(max_wait))
@@ -0,0 +1,229 @@
+"""
+Captures browser side performance of page loads & tagged actions: Navigation & Paint Timing, largest contentful paint,
+long tasks, resource timing & JS heap size from the page, plus the CDP Performance.getMetrics counters.
+
+Samples are added to the report of the running test (the performance_report fixture starts one per test) & checked
+against budgets given as {metric: maximum}. Times are in milliseconds, sizes in bytes.
+"""
+import json
+import time
+
+from pages.ui import scripts
+from utils.driver_pool import add_document_script
+
+# CDP Performance.getMetrics counters kept in a sample. Durations are reported in seconds & converted to ms.
+CDP_METRICS = {
+    'JSHeapUsedSize': ('cdp_js_heap_used', 1),
+    'Nodes': ('cdp_nodes', 1),
+    'LayoutCount': ('cdp_layout_count', 1),
+    'RecalcStyleCount': ('cdp_recalc_style_count', 1),
+    'LayoutDuration': ('cdp_layout_duration', 1000),
+    'RecalcStyleDuration': ('cdp_recalc_style_duration', 1000),
+    'ScriptDuration': ('cdp_script_duration', 1000),
+    'TaskDuration': ('cdp_task_duration', 1000),
+}
+# Counters growing over the life of the browser tab. Actions report how much they grew while the action ran.
+CDP_COUNTERS = {'cdp_layout_count', 'cdp_recalc_style_count', 'cdp_layout_duration', 'cdp_recalc_style_duration',
+                'cdp_script_duration', 'cdp_task_duration'}
+
+_report = None
+
+
+class PerformanceSample:
+    """
+    Metrics of one page load or action.
+
+    :param name: label of the sample i.e.: the url or 'login to dashboard'.
+    :param kind: 'navigation' or 'action'.
+    :param metrics: flat dict of metric name -> value.
+    :param slowest_resources: the slowest resources loaded, with name, type, duration & size.
+    :param budget: {metric: maximum} the sample is checked against.
+    """
+
+    def __init__(self, name, kind, url, metrics, slowest_resources=(), budget=None):
+        self.name = name
+        self.kind = kind
+        self.url = url
+        self.metrics = metrics
+        self.slowest_resources = list(slowest_resources)
+        self.budget = dict(budget or {})
+
+    @property
+    def violations(self):
+        """
+        Budget violations as a list of (metric, value, maximum). Metrics the browser didn't report are skipped.
+        """
+        return [(metric, self.metrics[metric], maximum) for metric, maximum in self.budget.items()
+                if self.metrics.get(metric) is not None and self.metrics[metric] > maximum]
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'url': self.url,
+            'metrics': self.metrics,
+            'slowest_resources': self.slowest_resources,
+            'budget': self.budget,
+            'violations': [{'metric': metric, 'value': value, 'budget': maximum}
+                           for metric, value, maximum in self.violations],
+        }
+
+
+class PerformanceReport:
+    """
+    Performance samples taken during one test.
+
+    :param test_id: pytest node id of the test.
+    :param enforce_budgets: fail the test with an AssertionError as soon as a sample exceeds its budget. Otherwise
+        violations are only reported.
+    """
+
+    def __init__(self, test_id, enforce_budgets=True):
+        self.test_id = test_id
+        self.enforce_budgets = enforce_budgets
+        self.samples = []
+
+    def add(self, sample):
+        """
+        Adds a sample & checks it against its budget.
+
+        :raises AssertionError: if budgets are enforced & the sample exceeds its budget.
+        """
+        self.samples.append(sample)
+        if self.enforce_budgets and sample.violations:
+            raise AssertionError('Performance budget exceeded. ' + '; '.join(
+                f'{sample.name}: {metric} {value} > {maximum}' for metric, value, maximum in sample.violations))
+
+    @property
+    def violations(self):
+        return [(sample, metric, value, maximum) for sample in self.samples
+                for metric, value, maximum in sample.violations]
+
+    def to_json(self):
+        return json.dumps({'test': self.test_id, 'samples': [sample.to_dict() for sample in self.samples]}, indent=2)
+
+    def describe_violations(self):
+        return '\n'.join(f'{sample.name}: {metric} {value} exceeds the budget of {maximum}'
+                         for sample, metric, value, maximum in self.violations)
+
+
+def start_report(test_id, enforce_budgets=True):
+    global _report
+    _report = PerformanceReport(test_id, enforce_budgets)
+    return _report
+
+
+def stop_report():
+    global _report
+    report, _report = _report, None
+    return report
+
+
+def current_report():
+    return _report
+
+
+class PerformanceCollector:
+    """
+    Reads the performance timings of the page loaded in a driver.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._cdp_enabled = None
+
+    def install(self):
+        """
+        Registers the tracker for every new document through CDP, so long tasks & layout shifts are recorded from the
+        start of each page load. Without CDP it is installed lazily when metrics are collected.
+
+        The tracker is registered once per driver & only once something is measured, so browsers of tests without a
+        performance report don't run its observers. The driver pool removes it before the driver is leased again.
+        """
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            add_document_script(self.driver, 'performance_tracker', scripts.PERFORMANCE_TRACKER)
+        except WebDriverException:
+            pass
+
+    def read_page(self, since=0):
+        self.install()
+        return self.driver.execute_async_script(scripts.COLLECT_PERFORMANCE, since)
+
+    def read_cdp_metrics(self):
+        """
+        Returns the CDP Performance.getMetrics counters, or {} for browsers without CDP.
+        """
+        from selenium.common.exceptions import WebDriverException
+
+        if self._cdp_enabled is None:
+            try:
+                self.driver.execute_cdp_cmd('Performance.enable', {})
+                self._cdp_enabled = True
+            except (AttributeError, WebDriverException):
+                self._cdp_enabled = False
+        if not self._cdp_enabled:
+            return {}
+
+        metrics = {}
+        for metric in self.driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']:
+            if metric['name'] in CDP_METRICS:
+                name, factor = CDP_METRICS[metric['name']]
+                metrics[name] = round(metric['value'] * factor, 2)
+        return metrics
+
+    def collect_navigation(self, name=None, budget=None):
+        """
+        Returns a sample of the current document's load.
+        """
+        page = self.read_page()
+        metrics = _page_metrics(page)
+        metrics.update(self.read_cdp_metrics())
+        return PerformanceSample(name or page['url'], 'navigation', page['url'], metrics, page['slowest_resources'],
+                                 budget)
+
+    def start_action(self):
+        """
+        Marks the start of an action. Returns the marker finish_action needs.
+        """
+        self.install()
+        page = self.driver.execute_script('return [performance.timeOrigin, performance.now()];')
+        return {'time_origin': page[0], 'now': page[1], 'started': time.perf_counter(),
+                'cdp': self.read_cdp_metrics()}
+
+    def finish_action(self, marker, name, budget=None, ended=None):
+        """
+        Returns a sample of everything that happened since start_action: entries of the same document created after
+        the mark, or the whole load of the new document if the action navigated.
+
+        :param ended: time.perf_counter() when the action ended. Defaults to now.
+        """
+        duration = round(((ended or time.perf_counter()) - marker['started']) * 1000, 2)
+        page = self.read_page(marker['now'])
+        navigated = page['timeOrigin'] != marker['time_origin']
+        if navigated:
+            # The new document's entries all belong to the action.
+            page = self.read_page()
+
+        metrics = _page_metrics(page, include_navigation=navigated)
+        metrics['duration'] = duration
+        metrics['navigated'] = navigated
+
+        cdp = self.read_cdp_metrics()
+        for metric, value in cdp.items():
+            if metric in CDP_COUNTERS:
+                value = round(value - marker['cdp'].get(metric, 0), 2)
+            metrics[metric] = value
+        return PerformanceSample(name, 'action', page['url'], metrics, page['slowest_resources'], budget)
+
+
+def _page_metrics(page, include_navigation=True):
+    metrics = {key: page[key] for key in ('long_tasks', 'long_task_time', 'total_blocking_time', 'resources',
+                                          'resource_transfer_size', 'cumulative_layout_shift', 'js_heap_used',
+                                          'js_heap_total')}
+    if include_navigation:
+        metrics.update(page['navigation'] or {})
+        for key in ('first_paint', 'first_contentful_paint', 'largest_contentful_paint'):
+            metrics[key] = page[key]
+    return metrics
@@ -0,0 +1,309 @@
+"""
+JavaScript snippets executed in the browser by page objects. Snippets which need to locate elements are prefixed
+with FIND_ELEMENTS, so a (By, value) locator can be resolved inside the browser without extra WebDriver round-trips.
+"""
+
+# Resolves a selenium (By, value) locator inside the page. Returns null for locator strategies it does not support,
+# so callers can fall back to driver.find_elements & pass the elements in instead.
+FIND_ELEMENTS = """
+function __findElements(by, value, root) {
+    root = root || document;
+    var toArray = function (list) { return Array.prototype.slice.call(list); };
+    switch (by) {
+        case 'css selector':
+            return toArray(root.querySelectorAll(value));
+        case 'xpath':
+            var result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) {
+                var node = result.snapshotItem(i);
+                if (node.nodeType === 1) { nodes.push(node); }
+            }
+            return nodes;
+        case 'id':
+            return toArray(root.querySelectorAll('[id="' + value.replace(/(["\\\\])/g, '\\\\$1') + '"]'));
+        case 'name':
+            return toArray(root.querySelectorAll('[name="' + value.replace(/(["\\\\])/g, '\\\\$1') + '"]'));
+        case 'class name':
+            return toArray(root.getElementsByClassName(value));
+        case 'tag name':
+            return toArray(root.getElementsByTagName(value));
+        case 'link text':
+            return toArray(root.querySelectorAll('a')).filter(function (a) { return a.innerText.trim() === value; });
+        case 'partial link text':
+            return toArray(root.querySelectorAll('a')).filter(function (a) { return a.innerText.indexOf(value) > -1; });
+    }
+    return null;
+}
+"""
+
+# Element helpers mirroring what selenium's is_displayed, get_attribute & value_of_css_property report.
+ELEMENT_HELPERS = """
+function __isRendered(el) {
+    var style = getComputedStyle(el);
+    return el.getClientRects().length > 0 && style.visibility !== 'hidden' && parseFloat(style.opacity) !== 0;
+}
+
+function __readAttribute(el, name) {
+    var property = el[name];
+    if (property !== undefined && property !== null && typeof property !== 'object' && typeof property !== 'function') {
+        if (typeof property === 'boolean') { return property ? 'true' : null; }
+        return String(property);
+    }
+    return el.getAttribute(name);
+}
+
+function __readCss(style, name) {
+    var cssValue = style.getPropertyValue(name);
+    var rgb = /^rgb\\((\\d+), (\\d+), (\\d+)\\)$/.exec(cssValue);
+    return rgb ? 'rgba(' + rgb[1] + ', ' + rgb[2] + ', ' + rgb[3] + ', 1)' : cssValue;
+}
+"""
+
+# arguments: by, value, elements (used when by is null), spec {text, attributes, css, rect, elements}
+# Returns {supported, elements, items} where every item holds the requested data for one element.
+BULK_READ = FIND_ELEMENTS + ELEMENT_HELPERS + """
+var by = arguments[0], value = arguments[1], spec = arguments[3];
+var elements = by === null ? arguments[2] : __findElements(by, value);
+if (elements === null) { return {supported: false}; }
+
+var items = elements.map(function (el) {
+    var item = {};
+    if (spec.text) { item.text = __isRendered(el) ? el.innerText : ''; }
+    if (spec.attributes.length) {
+        item.attributes = {};
+        spec.attributes.forEach(function (name) { item.attributes[name] = __readAttribute(el, name); });
+    }
+    if (spec.css.length) {
+        var style = getComputedStyle(el);
+        item.css = {};
+        spec.css.forEach(function (name) { item.css[name] = __readCss(style, name); });
+    }
+    if (spec.rect) {
+        var rect = el.getBoundingClientRect();
+        item.rect = {x: rect.left + window.pageXOffset, y: rect.top + window.pageYOffset,
+                     width: rect.width, height: rect.height};
+    }
+    return item;
+});
+return {supported: true, elements: spec.elements ? elements : null, items: items};
+"""
+
+# Async script. arguments: by, value, kind, params, timeout in ms, callback.
+# Evaluates the condition whenever the DOM mutates (plus a short in-page interval for pure style/layout changes the
+# observer can't see) & calls back with true as soon as it holds, false on timeout or {unsupported: true}.
+WAIT_FOR_CONDITION = FIND_ELEMENTS + ELEMENT_HELPERS + """
+var by = arguments[0], value = arguments[1], kind = arguments[2], params = arguments[3], timeout = arguments[4];
+var callback = arguments[arguments.length - 1];
+
+function check() {
+    var elements = __findElements(by, value);
+    if (elements === null) { return {unsupported: true}; }
+    var first = elements[0];
+    switch (kind) {
+        case 'presence': return elements.length > 0;
+        case 'visibility': return !!first && __isRendered(first);
+        case 'invisibility': return !first || !__isRendered(first);
+        case 'clickable': return !!first && __isRendered(first) && !first.disabled;
+        case 'text': return !!first && __isRendered(first) && first.innerText.indexOf(params.text) > -1;
+        case 'text_absent': return !!first && first.innerText.indexOf(params.text) === -1;
+        case 'count': return elements.length === params.count;
+        case 'count_at_least': return elements.length >= params.count;
+        case 'attribute': return !!first && __readAttribute(first, params.name) === params.value;
+    }
+    return {unsupported: true};
+}
+
+var done = false, scheduled = false, observer = null, interval = null, deadline = null;
+
+function finish(result) {
+    if (done) { return; }
+    done = true;
+    if (observer) { observer.disconnect(); }
+    clearInterval(interval);
+    clearTimeout(deadline);
+    callback(result);
+}
+
+function evaluate() {
+    scheduled = false;
+    try {
+        var result = check();
+        if (result === true || typeof result === 'object') { finish(result); }
+    } catch (e) {
+        finish({error: String(e)});
+    }
+}
+
+function schedule() {
+    // Coalesce bursts of mutations into a single evaluation.
+    if (!scheduled) { scheduled = true; Promise.resolve().then(evaluate); }
+}
+
+evaluate();
+if (!done) {
+    observer = new MutationObserver(schedule);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    interval = setInterval(schedule, 100);
+    deadline = setTimeout(function () { finish(false); }, timeout);
+}
+"""
+
+# Counts in-flight fetch & XMLHttpRequest calls in window.__qaPendingRequests. Safe to run more than once.
+NETWORK_TRACKER = """
+(function () {
+    if (window.__qaNetworkTracker) { return; }
+    window.__qaNetworkTracker = true;
+    window.__qaPendingRequests = 0;
+    var done = function () { window.__qaPendingRequests = Math.max(0, window.__qaPendingRequests - 1); };
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            window.__qaPendingRequests++;
+            return originalFetch.apply(this, arguments).then(
+                function (response) { done(); return response; },
+                function (error) { done(); throw error; });
+        };
+    }
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__qaPendingRequests++;
+        this.addEventListener('loadend', done, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+# Async script. arguments: quiet period in ms, timeout in ms, callback.
+# Calls back with true once the document is loaded, no tracked request is in flight, no finite animation is running
+# & the DOM hasn't mutated for the quiet period. Calls back with false on timeout.
+WAIT_FOR_SETTLE = NETWORK_TRACKER + """
+var quietPeriod = arguments[0], timeout = arguments[1];
+var callback = arguments[arguments.length - 1];
+var lastMutation = Date.now(), started = Date.now();
+
+var observer = new MutationObserver(function () { lastMutation = Date.now(); });
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+
+function runningAnimations() {
+    if (!document.getAnimations) { return 0; }
+    return document.getAnimations().filter(function (animation) {
+        // Infinite animations such as decorative spinners would never finish, those are ignored.
+        var timing = animation.effect ? animation.effect.getComputedTiming() : null;
+        return animation.playState === 'running' && timing && isFinite(timing.endTime);
+    }).length;
+}
+
+function settled() {
+    return document.readyState === 'complete' && window.__qaPendingRequests === 0 && runningAnimations() === 0 &&
+        Date.now() - lastMutation >= quietPeriod;
+}
+
+var interval = setInterval(function () {
+    var isSettled = settled();
+    if (isSettled || Date.now() - started >= timeout) {
+        clearInterval(interval);
+        observer.disconnect();
+        callback(isSettled);
+    }
+}, 50);
+"""
+
+# Records largest contentful paint, long tasks & layout shifts of the document in window.__qaPerformance. Buffered
+# observers also report entries from before the tracker was installed. Safe to run more than once.
+PERFORMANCE_TRACKER = """
+(function () {
+    if (window.__qaPerformance || !window.PerformanceObserver) { return; }
+    var tracker = window.__qaPerformance = {lcp: null, longTasks: [], layoutShift: 0};
+    var observe = function (type, onEntry) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(onEntry); })
+                .observe({type: type, buffered: true});
+        } catch (e) { /* entry type not supported by this browser */ }
+    };
+    observe('largest-contentful-paint', function (entry) {
+        tracker.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+    });
+    observe('longtask', function (entry) { tracker.longTasks.push([entry.startTime, entry.duration]); });
+    observe('layout-shift', function (entry) { if (!entry.hadRecentInput) { tracker.layoutShift += entry.value; } });
+})();
+"""
+
+# Async script. arguments: time in ms (performance.now() of the document) entries must start after, callback.
+# Calls back with the performance timings of the current document. Waits one task, so buffered observer entries of a
+# tracker installed just now are delivered first.
+COLLECT_PERFORMANCE = PERFORMANCE_TRACKER + """
+var since = arguments[0] || 0;
+var callback = arguments[arguments.length - 1];
+
+setTimeout(function () {
+    var round = function (value) { return value == null ? null : Math.round(value * 100) / 100; };
+    var tracker = window.__qaPerformance || {lcp: null, longTasks: [], layoutShift: 0};
+    var navigation = performance.getEntriesByType('navigation')[0];
+    var paints = {};
+    performance.getEntriesByType('paint').forEach(function (entry) { paints[entry.name] = entry.startTime; });
+
+    var longTasks = tracker.longTasks.filter(function (task) { return task[0] >= since; });
+    var resources = performance.getEntriesByType('resource').filter(function (entry) {
+        return entry.startTime >= since;
+    });
+    var sum = function (values) { return values.reduce(function (total, value) { return total + value; }, 0); };
+    var slowest = resources.slice().sort(function (a, b) { return b.duration - a.duration; }).slice(0, 5);
+
+    callback({
+        url: location.href,
+        timeOrigin: performance.timeOrigin,
+        now: round(performance.now()),
+        navigation: navigation ? {
+            navigation_type: navigation.type,
+            ttfb: round(navigation.responseStart),
+            dom_interactive: round(navigation.domInteractive),
+            dom_content_loaded: round(navigation.domContentLoadedEventEnd),
+            load: round(navigation.loadEventEnd),
+            document_transfer_size: navigation.transferSize
+        } : null,
+        first_paint: round(paints['first-paint']),
+        first_contentful_paint: round(paints['first-contentful-paint']),
+        largest_contentful_paint: round(tracker.lcp),
+        cumulative_layout_shift: round(tracker.layoutShift * 1000) / 1000,
+        long_tasks: longTasks.length,
+        long_task_time: round(sum(longTasks.map(function (task) { return task[1]; }))),
+        total_blocking_time: round(sum(longTasks.map(function (task) { return Math.max(0, task[1] - 50); }))),
+        resources: resources.length,
+        resource_transfer_size: sum(resources.map(function (entry) { return entry.transferSize || 0; })),
+        slowest_resources: slowest.map(function (entry) {
+            return {name: entry.name, type: entry.initiatorType, duration: round(entry.duration),
+                    size: entry.transferSize};
+        }),
+        js_heap_used: performance.memory ? performance.memory.usedJSHeapSize : null,
+        js_heap_total: performance.memory ? performance.memory.totalJSHeapSize : null
+    });
+}, 0);
+"""
+
+# Cookies aside, the state a logged in page keeps in the browser.
+CAPTURE_STORAGE = """
+var copy = function (storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) { items[storage.key(i)] = storage.getItem(storage.key(i)); }
+    return items;
+};
+return {origin: location.origin, url: location.href, local: copy(window.localStorage),
+        session: copy(window.sessionStorage)};
+"""
+
+# Function expression writing captured storage back. Only applied to documents of the captured origin, called with
+# the state either from execute_script or from a script evaluated on every new document.
+HYDRATE_STORAGE = """
+function (state) {
+    if (location.origin !== state.origin) { return false; }
+    var fill = function (storage, items) {
+        Object.keys(items).forEach(function (key) { storage.setItem(key, items[key]); });
+    };
+    fill(window.localStorage, state.local);
+    fill(window.sessionStorage, state.session);
+    return true;
+}
+"""
@@ -0,0 +1,285 @@
+"""
+Times the steps of a test: every public page object method & the WebDriver commands it sends. Recording only happens
+while a timeline is active (the step_timeline fixture starts one per test), otherwise the instrumented methods cost a
+single global lookup.
+
+Every step records its locator, total time, time spent in waits, time spent in WebDriver commands, stale element
+retries & element cache hits & misses. Nested page methods (i.e.: get_element called by click_and_wait) are recorded as
+child steps & their times are rolled up into the parent.
+"""
+import csv
+import functools
+import inspect
+import io
+import json
+import time
+
+WAIT_PREFIXES = ('wait_for', 'wait_until')
+
+_timeline = None
+
+
+class StepRecord:
+    __slots__ = ('index', 'parent', 'depth', 'name', 'locator', 'started', 'duration', 'wait_time', 'command_time',
+                 'commands', 'retries', 'cache_hits', 'cache_misses', 'status')
+
+    FIELDS = __slots__
+
+    def __init__(self, index, parent, depth, name, locator, started):
+        self.index = index
+        self.parent = parent
+        self.depth = depth
+        self.name = name
+        self.locator = locator
+        self.started = started
+        self.duration = 0.0
+        self.wait_time = 0.0
+        self.command_time = 0.0
+        self.commands = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.status = 'passed'
+
+    @property
+    def action_time(self):
+        """
+        Time of the step not spent waiting.
+        """
+        return max(self.duration - self.wait_time, 0.0)
+
+    def to_dict(self):
+        record = {field: getattr(self, field) for field in self.FIELDS}
+        for field in ('started', 'duration', 'wait_time', 'command_time'):
+            record[field] = round(record[field] * 1000, 3)
+        record['action_time'] = round(self.action_time * 1000, 3)
+        return record
+
+
+class StepTimeline:
+    """
+    Steps recorded for one test. Times in the exported timeline are in milliseconds relative to the start of the test.
+
+    :param test_id: pytest node id of the test.
+    :param record_commands: also record every WebDriver command as a step of its own. Otherwise commands are only
+        counted & timed on the step that sent them.
+    """
+
+    def __init__(self, test_id, record_commands=False):
+        self.test_id = test_id
+        self.record_commands = record_commands
+        self.records = []
+        self.started = time.perf_counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._open = []
+
+    def start_step(self, name, locator=None):
+        parent = self._open[-1] if self._open else None
+        record = StepRecord(len(self.records), parent.index if parent else None, len(self._open), name, locator,
+                            time.perf_counter() - self.started)
+        self.records.append(record)
+        self._open.append(record)
+        return record
+
+    def end_step(self, record, failed=False):
+        record.duration = time.perf_counter() - self.started - record.started
+        if failed:
+            record.status = 'failed'
+        if name_is_wait(record.name):
+            record.wait_time = record.duration
+
+        self._open.pop()
+        if self._open:
+            parent = self._open[-1]
+            parent.command_time += record.command_time
+            parent.commands += record.commands
+            parent.retries += record.retries
+            parent.cache_hits += record.cache_hits
+            parent.cache_misses += record.cache_misses
+            if not name_is_wait(parent.name):
+                parent.wait_time += record.wait_time
+
+    def add_command(self, command, duration):
+        if self.record_commands or not self._open:
+            record = self.start_step(f'command:{command}')
+            record.command_time = duration
+            record.commands = 1
+            self.end_step(record)
+            # end_step measured the bookkeeping, the command itself is what matters.
+            record.started -= duration
+            record.duration = duration
+        else:
+            step = self._open[-1]
+            step.command_time += duration
+            step.commands += 1
+
+    def add_retry(self):
+        if self._open:
+            self._open[-1].retries += 1
+
+    def add_cache_lookup(self, hit):
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+        if self._open:
+            if hit:
+                self._open[-1].cache_hits += 1
+            else:
+                self._open[-1].cache_misses += 1
+
+    @property
+    def steps(self):
+        """
+        Records of the outermost steps, the ones called by the test itself.
+        """
+        return [record for record in self.records if record.depth == 0]
+
+    def to_dict(self):
+        return {
+            'test': self.test_id,
+            'duration': round((time.perf_counter() - self.started) * 1000, 3),
+            'element_cache': {'hits': self.cache_hits, 'misses': self.cache_misses},
+            'steps': [record.to_dict() for record in self.records],
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_csv(self):
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=['test', *StepRecord.FIELDS, 'action_time'], lineterminator='\n')
+        writer.writeheader()
+        for record in self.records:
+            writer.writerow({'test': self.test_id, **record.to_dict()})
+        return output.getvalue()
+
+
+def add_to_summary(timeline, summary):
+    """
+    Adds the outermost steps of a timeline to a summary dict of (step, locator) -> [calls, total seconds, max seconds].
+    """
+    for record in timeline.steps:
+        entry = summary.setdefault((record.name, record.locator), [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += record.duration
+        entry[2] = max(entry[2], record.duration)
+    return summary
+
+
+def name_is_wait(name):
+    return name.startswith(WAIT_PREFIXES)
+
+
+def start_timeline(test_id, record_commands=False):
+    global _timeline
+    _timeline = StepTimeline(test_id, record_commands)
+    return _timeline
+
+
+def stop_timeline():
+    global _timeline
+    timeline, _timeline = _timeline, None
+    return timeline
+
+
+def current_timeline():
+    return _timeline
+
+
+def record_retry():
+    """
+    Counts a retry, i.e.: an action repeated after its element went stale, on the running step.
+    """
+    if _timeline is not None:
+        _timeline.add_retry()
+
+
+def record_cache_lookup(hit):
+    """
+    Counts an element cache lookup on the running step & the timeline.
+    """
+    if _timeline is not None:
+        _timeline.add_cache_lookup(hit)
+
+
+def describe_locator(args, kwargs):
+    """
+    Finds the locator among the arguments of a page method & returns it as 'by=value'.
+    """
+    for value in (*args, *(value for key, value in kwargs.items() if 'locator' in key)):
+        if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str):
+            return f'{value[0]}={value[1]}'
+    return None
+
+
+def timed_step(method):
+    """
+    Records a page method as a step of the running timeline.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        timeline = _timeline
+        if timeline is None:
+            return method(self, *args, **kwargs)
+
+        record = timeline.start_step(name, describe_locator(args, kwargs))
+        try:
+            result = method(self, *args, **kwargs)
+        except BaseException:
+            timeline.end_step(record, failed=True)
+            raise
+        timeline.end_step(record)
+        return result
+
+    wrapper.__timed_step__ = True
+    return wrapper
+
+
+def untimed(method):
+    """
+    Keeps a public page method out of the timeline, i.e.: methods returning context managers, which would only be
+    timed while creating them.
+    """
+    method.__timed_step__ = False
+    return method
+
+
+def instrument_page_class(cls):
+    """
+    Wraps every public method defined on the class with timed_step. Static & class methods, properties, untimed &
+    already wrapped methods are left alone.
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.isfunction(attribute) or hasattr(attribute, '__timed_step__'):
+            continue
+        setattr(cls, name, timed_step(attribute))
+    return cls
+
+
+def instrument_driver(driver):
+    """
+    Times every WebDriver command sent through the driver, WebElement commands included. Safe to call repeatedly.
+    """
+    if getattr(driver, '_step_timer_installed', False):
+        return driver
+
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        timeline = _timeline
+        if timeline is None:
+            return execute(driver_command, params)
+
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            timeline.add_command(driver_command, time.perf_counter() - started)
+
+    driver.execute = timed_execute
+    driver._step_timer_installed = True
+    return driver
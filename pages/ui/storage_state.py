@@ -0,0 +1,255 @@
+"""
+Snapshots of a logged in browser: cookies, localStorage & sessionStorage captured once a user logged in through the
+login form. Later browsers are hydrated from the snapshot before they open the application, so only the tests of the
+login itself pay for going through LoginPage.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from pages.ui import scripts
+from utils.app_constants import AppConstant
+from utils.driver_pool import DriverPool
+from utils.file_lock import FileLock
+
+
+class StorageState:
+    """
+    Browser state of a logged in user.
+
+    :param origin: origin the state belongs to i.e.: http://qa-assessment.broadmail.it.
+    :param url: page shown after login, opened when the state is restored.
+    :param cookies: cookies as returned by driver.get_cookies().
+    :param local_storage: localStorage items of the origin.
+    :param session_storage: sessionStorage items of the origin.
+    :param created: epoch time the state was captured.
+    """
+
+    def __init__(self, origin, url, cookies, local_storage, session_storage, created=None):
+        self.origin = origin
+        self.url = url
+        self.cookies = list(cookies)
+        self.local_storage = dict(local_storage)
+        self.session_storage = dict(session_storage)
+        self.created = created if created is not None else time.time()
+
+    @classmethod
+    def capture(cls, driver):
+        """
+        Snapshots the page currently loaded in the driver.
+        """
+        storage = driver.execute_script(scripts.CAPTURE_STORAGE)
+        return cls(storage['origin'], storage['url'], driver.get_cookies(), storage['local'], storage['session'])
+
+    def expires_at(self, ttl):
+        """
+        Epoch time the state is no longer trusted: ttl seconds after capturing it or when its first cookie expires.
+        """
+        return min([self.created + ttl] + [cookie['expiry'] for cookie in self.cookies if 'expiry' in cookie])
+
+    def to_dict(self):
+        return {
+            'origin': self.origin,
+            'url': self.url,
+            'cookies': self.cookies,
+            'local_storage': self.local_storage,
+            'session_storage': self.session_storage,
+            'created': self.created,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['origin'], data['url'], data['cookies'], data['local_storage'], data['session_storage'],
+                   data['created'])
+
+
+def hydrate(driver, state, url=None):
+    """
+    Restores a state into a browser & opens url, by default the page the state was captured on.
+
+    Chrome gets the cookies through CDP & the storage from a script evaluated before the first document of the origin
+    runs its own scripts, so the application never sees the browser logged out. Other browsers open the origin first
+    & write the state from there.
+    """
+    storage = {'origin': state.origin, 'local': state.local_storage, 'session': state.session_storage}
+    if hasattr(driver, 'execute_cdp_cmd'):
+        driver.execute_cdp_cmd('Network.setCookies',
+                               {'cookies': [_cdp_cookie(cookie, state.origin) for cookie in state.cookies]})
+        script = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                        {'source': f'({scripts.HYDRATE_STORAGE})({json.dumps(storage)});'})
+        try:
+            driver.get(url or state.url)
+        finally:
+            # Later documents must see the storage as the test left it, i.e.: after logging out.
+            driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': script['identifier']})
+        return
+
+    # Cookies & storage can only be written for the origin currently loaded.
+    if not driver.current_url.startswith(state.origin):
+        driver.get(state.origin)
+    for cookie in state.cookies:
+        driver.add_cookie(cookie)
+    driver.execute_script(f'return ({scripts.HYDRATE_STORAGE})(arguments[0]);', storage)
+    driver.get(url or state.url)
+
+
+def clear(driver):
+    """
+    Removes cookies & storage of the origin currently loaded, i.e.: what was left of a rejected state.
+    """
+    driver.delete_all_cookies()
+    driver.execute_script(DriverPool.RESET_STORAGE_SCRIPT)
+
+
+def _cdp_cookie(cookie, origin):
+    converted = {key: cookie[key] for key in ('name', 'value', 'path', 'secure', 'httpOnly', 'sameSite')
+                 if key in cookie}
+    if cookie.get('domain'):
+        converted['domain'] = cookie['domain']
+    else:
+        converted['url'] = origin
+    if 'expiry' in cookie:
+        converted['expires'] = cookie['expiry']
+    return converted
+
+
+class StorageStateStore:
+    """
+    Keeps the storage state of every user until it expires or the application rejects it. If a folder is given,
+    states are written to <folder>/<key>.json as well, so other workers & later sessions reuse them. The files hold
+    live session cookies & tokens, keep the folder out of version control.
+
+    :param folder: folder the states are persisted to. None keeps them in memory only.
+    :param ttl: seconds a state is trusted after it was captured.
+    :param expiry_margin: states are dropped this many seconds early, so they never expire in the middle of a test.
+    """
+
+    def __init__(self, folder=None, ttl=1800, expiry_margin=60):
+        self.folder = folder
+        self.ttl = ttl
+        self.expiry_margin = expiry_margin
+        self._states = {}
+        self._lock = threading.Lock()
+        self._login_lock = threading.Lock()
+
+    @staticmethod
+    def key(email, password, origin):
+        """
+        Key of a user's state. Passwords are never written to disk in clear text.
+        """
+        return hashlib.sha256(f'{email}\0{password}\0{origin}'.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.folder, f'{key}.json')
+
+    def get(self, key, reload=False):
+        """
+        Returns the state stored under the key, or None if there is none or it expired.
+
+        :param reload: read the state from disk again, in case another worker replaced it.
+        """
+        with self._lock:
+            state = None if reload and self.folder else self._states.get(key)
+            if state is None and self.folder:
+                state = self._read_file(key)
+                if state is not None:
+                    self._states[key] = state
+
+            if state is None:
+                return None
+            if state.expires_at(self.ttl) - self.expiry_margin <= time.time():
+                self._states.pop(key, None)
+                return None
+            return state
+
+    def put(self, key, state):
+        with self._lock:
+            self._states[key] = state
+            if self.folder:
+                os.makedirs(self.folder, exist_ok=True)
+                temp_path = f'{self.path(key)}.{os.getpid()}.tmp'
+                with open(temp_path, 'w') as state_file:
+                    json.dump(state.to_dict(), state_file)
+                os.replace(temp_path, self.path(key))
+
+    def invalidate(self, key):
+        with self._lock:
+            self._states.pop(key, None)
+            if self.folder:
+                try:
+                    os.remove(self.path(key))
+                except FileNotFoundError:
+                    pass
+
+    def authenticate(self, driver, email, password, origin, login, is_logged_in):
+        """
+        Logs a browser in as the user from the user's state. Without a valid state login() logs the browser in & its
+        state is captured for the next browsers. Only one worker logs a user in at a time, the others wait for its
+        state instead of logging in themselves.
+
+        :param driver: WebDriver to log in.
+        :param email: email of the user.
+        :param password: password of the user.
+        :param origin: origin of the application i.e.: http://qa-assessment.broadmail.it.
+        :param login: callable logging the browser in through the UI.
+        :param is_logged_in: callable telling whether the application accepted the restored state.
+        :return: True if the browser was logged in from a stored state, False if login() was used.
+        """
+        key = self.key(email, password, origin)
+        state = self.get(key)
+        if state is not None and self._restore(driver, state, is_logged_in):
+            return True
+
+        rejected = state
+        with self._user_lock(key):
+            state = self.get(key, reload=True)
+            # Another worker may have logged the user in while this one was waiting.
+            if state is not None and (rejected is None or state.created != rejected.created):
+                if self._restore(driver, state, is_logged_in):
+                    return True
+                rejected = state
+
+            if rejected is not None:
+                print(f'Storage state of {email} was rejected, logging in again.')
+                self.invalidate(key)
+                clear(driver)
+            login()
+            self.put(key, StorageState.capture(driver))
+        return False
+
+    @staticmethod
+    def _restore(driver, state, is_logged_in):
+        hydrate(driver, state)
+        return is_logged_in()
+
+    def _user_lock(self, key):
+        return FileLock(f'{self.path(key)}.lock') if self.folder else self._login_lock
+
+    def _read_file(self, key):
+        try:
+            with open(self.path(key)) as state_file:
+                return StorageState.from_dict(json.load(state_file))
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+
+_storage_state_store = None
+
+
+def get_storage_state_store():
+    """
+    Returns the session wide store, creating it from the storage_state_* configs on first use. A relative
+    storage_state_folder is resolved against the project root. Leave it empty to keep states in memory only.
+    """
+    global _storage_state_store
+    if _storage_state_store is None:
+        configs = pytest.configs
+        folder = configs.get_config('storage_state_folder')
+        _storage_state_store = StorageStateStore(
+            folder=os.path.join(AppConstant.PROJECT_ROOT, folder) if folder else None,
+            ttl=configs.get_duration('storage_state_ttl', 1800))
+    return _storage_state_store
@@ -0,0 +1,176 @@
+"""
+Event driven waits. Instead of polling a condition through WebDriverWait, the condition is resolved inside the browser
+by a MutationObserver & reported back through a single blocking execute_async_script call.
+"""
+import time
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from pages.ui import scripts
+from utils.driver_pool import add_document_script
+
+# Script timeout of a WebDriver session nobody changed.
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+
+class InPageCondition:
+    """
+    Wraps a regular expected condition with a description the browser can evaluate itself. Calling the object runs
+    the wrapped condition, so it can still be handed to WebDriverWait.
+
+    :param kind: condition name understood by scripts.WAIT_FOR_CONDITION.
+    :param locator: (By, value) locator the condition applies to.
+    :param fallback: expected condition used for polling & to produce the return value.
+    :param returns_element: True if callers expect the element the fallback returns.
+    :param params: extra values for the in-page check i.e.: count, text, attribute name & value.
+    """
+
+    def __init__(self, kind, locator, fallback, returns_element=False, **params):
+        self.js_condition = (kind, locator, params)
+        self.fallback = fallback
+        self.returns_element = returns_element
+
+    def __call__(self, driver, *args, **kwargs):
+        return self.fallback(driver)
+
+
+def presence_of(locator):
+    return InPageCondition('presence', locator, EC.presence_of_element_located(locator), returns_element=True)
+
+
+def visibility_of(locator):
+    return InPageCondition('visibility', locator, EC.visibility_of_element_located(locator), returns_element=True)
+
+
+def invisibility_of(locator):
+    return InPageCondition('invisibility', locator, EC.invisibility_of_element_located(locator))
+
+
+def clickable(locator):
+    return InPageCondition('clickable', locator, EC.element_to_be_clickable(locator), returns_element=True)
+
+
+def text_present(locator, text):
+    return InPageCondition('text', locator, EC.text_to_be_present_in_element(locator, text), text=text)
+
+
+def text_absent(locator, text, fallback):
+    return InPageCondition('text_absent', locator, fallback, text=text)
+
+
+class WaitEngine:
+    """
+    Waits for conditions carrying a `js_condition` (kind, locator, params) description inside the browser. Anything
+    else, including locators the browser side can't resolve, is polled through WebDriverWait like before.
+
+    Long waits are split into segments, so a single async script call never outlives the HTTP read timeout of the
+    remote connection or the script timeout of the driver. The engine never changes the script timeout itself: drivers
+    prepared with set_script_timeout() wait in segments of SEGMENT seconds, others in segments fitting the default
+    script timeout.
+    """
+
+    SEGMENT = 30
+    SCRIPT_TIMEOUT = SEGMENT + 5
+
+    SETTLE_ATTEMPTS = 3
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @property
+    def segment(self):
+        return min(self.SEGMENT, getattr(self.driver, 'script_timeout', DEFAULT_SCRIPT_TIMEOUT) - 5)
+
+    def until(self, condition, max_wait=120):
+        """
+        Waits until the condition holds & returns its value, the same way WebDriverWait.until does.
+
+        :raises selenium.common.exceptions.TimeoutException: if the condition isn't met within max_wait seconds.
+        """
+        js_condition = getattr(condition, 'js_condition', None)
+        if js_condition is None or not isinstance(js_condition[1], tuple):
+            return self._poll(condition, max_wait)
+
+        kind, (by, value), params = js_condition
+        deadline = time.monotonic() + max_wait
+
+        while True:
+            remaining = deadline - time.monotonic()
+            segment = max(0, min(remaining, self.segment))
+            try:
+                result = self.driver.execute_async_script(scripts.WAIT_FOR_CONDITION, by, value, kind, params,
+                                                          int(segment * 1000))
+            except WebDriverException:
+                # i.e.: the page navigated while waiting. Continue with polling for the remaining time.
+                return self._poll(condition, max(0, deadline - time.monotonic()))
+
+            if result is True:
+                break
+            if isinstance(result, dict):
+                return self._poll(condition, max(0, deadline - time.monotonic()))
+            if remaining <= self.segment:
+                # Give selenium the final word before timing out, in case the browser side check disagrees.
+                return self._poll(condition, 0)
+
+        if not getattr(condition, 'returns_element', False):
+            return True
+
+        # Fetch the element the caller expects. Should the browser side & selenium disagree, poll what's left.
+        try:
+            element = condition(self.driver)
+        except (NoSuchElementException, StaleElementReferenceException):
+            element = None
+        return element or self._poll(condition, max(0, deadline - time.monotonic()))
+
+    def wait_for_settle(self, max_wait, quiet_period=0.2):
+        """
+        Waits until the page is settled: document loaded, no fetch/XHR in flight, no finite animation running & no DOM
+        mutation for quiet_period seconds. Returns early as soon as that is the case.
+
+        :param max_wait: upper bound in seconds. Reaching it is not an error.
+        :param quiet_period: time in seconds the DOM must stay unchanged.
+        :return: True if the page settled, False if max_wait was reached first.
+        """
+        self._install_network_tracker()
+        deadline = time.monotonic() + max_wait
+        failures = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            segment = min(remaining, self.segment)
+            try:
+                if self.driver.execute_async_script(scripts.WAIT_FOR_SETTLE, int(quiet_period * 1000),
+                                                    int(segment * 1000)):
+                    return True
+            except WebDriverException:
+                # i.e.: the document was replaced while waiting or an alert is open. Retry a few times only, an
+                # alert would otherwise keep us here for the whole max_wait.
+                failures += 1
+                if failures >= self.SETTLE_ATTEMPTS:
+                    return False
+
+    def _install_network_tracker(self):
+        """
+        Registers the request tracker for every new document through CDP, once per driver, so requests started before
+        the first settle call are counted too. Browsers without CDP install it lazily from the settle script.
+        """
+        try:
+            add_document_script(self.driver, 'network_tracker', scripts.NETWORK_TRACKER)
+        except WebDriverException:
+            pass
+
+    def _poll(self, condition, max_wait):
+        return WebDriverWait(self.driver, max_wait).until(condition)
+
+
+def set_script_timeout(driver, timeout=WaitEngine.SCRIPT_TIMEOUT):
+    """
+    Sets the script timeout of a new driver, so event driven waits block for up to WaitEngine.SEGMENT seconds per
+    call. Every execute_async_script of the session runs with this timeout. Called once when a browser is started.
+    """
+    driver.set_script_timeout(timeout)
+    driver.script_timeout = timeout
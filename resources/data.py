@@ -1,6 +1,14 @@
-import os
-import pytest
+from utils.test_data import get_data_source
+
+
 class Data:
     def __init__(self):
        self.user_email = "muhtasimabidv2@gmail.com"
-       self.user_password = "123456"
\ No newline at end of file
+       self.user_password = "123456"
+
+    @staticmethod
+    def records(file_name):
+        """
+        Streams the records of a CSV, JSONL or .properties file in resources/test_data (see utils/test_data.py).
+        """
+        return get_data_source(file_name)
@@ -0,0 +1,112 @@
+"""
+Loads every JSON schema in this folder once & keeps a compiled validator per schema, so validating a response costs
+only the validation itself instead of reading, checking & compiling the schema every time.
+
+Schemas are registered by file name without the `_schema.json` suffix i.e.: login_response_schema.json is available
+as `login_response`.
+
+jsonschema is imported on first validation, so collecting tests that use the registry stays cheap.
+"""
+import glob
+import json
+import os
+import threading
+
+SCHEMA_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+
+class SchemaRegistry:
+
+    def __init__(self, folder=SCHEMA_FOLDER):
+        self.folder = folder
+        self._format_checker = None
+        self._schemas = None
+        self._validators = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def schema_name(path):
+        name = os.path.splitext(os.path.basename(path))[0]
+        return name[:-len('_schema')] if name.endswith('_schema') else name
+
+    @property
+    def schemas(self):
+        if self._schemas is None:
+            with self._lock:
+                if self._schemas is None:
+                    schemas = {}
+                    for path in sorted(glob.glob(os.path.join(self.folder, '*.json'))):
+                        with open(path) as schema_file:
+                            schemas[self.schema_name(path)] = json.load(schema_file)
+                    self._schemas = schemas
+        return self._schemas
+
+    @property
+    def format_checker(self):
+        if self._format_checker is None:
+            from jsonschema import FormatChecker
+            self._format_checker = FormatChecker()
+        return self._format_checker
+
+    def names(self):
+        return sorted(self.schemas)
+
+    def get_schema(self, name):
+        try:
+            return self.schemas[name]
+        except KeyError:
+            raise KeyError(f'Unknown schema {name}. Available schemas: {", ".join(self.names())}.') from None
+
+    def get_validator(self, name):
+        """
+        Returns the compiled validator for a schema. The schema itself is checked only when it is compiled.
+        """
+        validator = self._validators.get(name)
+        if validator is None:
+            from jsonschema.validators import validator_for
+
+            schema = self.get_schema(name)
+            validator_class = validator_for(schema)
+            validator_class.check_schema(schema)
+            validator = validator_class(schema, format_checker=self.format_checker)
+            self._validators[name] = validator
+        return validator
+
+    def validate(self, name, instance):
+        """
+        Validates an instance against a schema.
+
+        :raises jsonschema.ValidationError: the most relevant error, like jsonschema.validate does.
+        """
+        validator = self.get_validator(name)
+        if validator.is_valid(instance):
+            return
+
+        from jsonschema.exceptions import best_match
+        raise best_match(validator.iter_errors(instance))
+
+    def is_valid(self, name, instance):
+        return self.get_validator(name).is_valid(instance)
+
+    def validate_many(self, name, instances):
+        """
+        Validates a list of instances against one schema. Valid instances take the fast is_valid path, detailed
+        errors are only collected for invalid ones.
+
+        :return: list of (index, ValidationError) for every invalid instance. Empty if all are valid.
+        """
+        from jsonschema.exceptions import best_match
+
+        validator = self.get_validator(name)
+        return [(index, best_match(validator.iter_errors(instance)))
+                for index, instance in enumerate(instances) if not validator.is_valid(instance)]
+
+
+schema_registry = SchemaRegistry()
+
+
+def validate(name, instance):
+    """
+    Validates an instance against a schema of the shared registry.
+    """
+    schema_registry.validate(name, instance)
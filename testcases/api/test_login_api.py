@@ -1,10 +1,8 @@
-import requests
-import json
 import pytest
 from testcases.api.base_test import BaseTest
 from pages.api.authentication_api_page import AuthenticationApiPage
 from resources.data import Data
-from jsonschema import validate
+from resources.schema.registry import schema_registry
 
 class TestLoginApi(BaseTest):
     def setup_class(self):
@@ -16,7 +14,7 @@ class TestLoginApi(BaseTest):
     def test_login_success(self):
         payload = self.login_api.create_auth_payload(self.data.user_email, self.data.user_password)
 
-        response = requests.post(self.url, json=payload)
+        response = self.login_api.login(self.data.user_email, self.data.user_password)
 
         assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
         
@@ -31,13 +29,8 @@ class TestLoginApi(BaseTest):
 
     @pytest.mark.api
     def test_login_schema_from_file(self):
-        with open("resources/schema/login_response_schema.json") as f:
-            schema = json.load(f)
-
-        payload = self.login_api.create_auth_payload(self.data.user_email, self.data.user_password)
-
-        response = requests.post(self.url, json=payload)
+        response = self.login_api.login(self.data.user_email, self.data.user_password)
         assert response.status_code == 200
 
         response_data = response.json()
-        validate(instance=response_data, schema=schema)
\ No newline at end of file
+        schema_registry.validate('login_response', response_data)
\ No newline at end of file
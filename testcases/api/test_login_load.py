@@ -0,0 +1,48 @@
+import json
+
+import allure
+import pytest
+from testcases.api.base_test import BaseTest
+from pages.api.authentication_api_page import AuthenticationApiPage
+from resources.data import Data
+
+
+@pytest.fixture(scope='module')
+def login_url(pytestconfig):
+    url = pytestconfig.getoption('--load-url')
+    if url:
+        yield url
+        return
+
+    from utils.stub_server import StubServer
+    with StubServer() as server:
+        yield server.login_url
+
+
+class TestLoginLoad(BaseTest):
+    def setup_class(self):
+        self.login_api = AuthenticationApiPage()
+        self.data = Data()
+
+    @pytest.mark.load
+    @pytest.mark.api
+    def test_login_under_load(self, pytestconfig, login_url):
+        # Imported here so that collecting the api tests doesn't import asyncio.
+        from utils.load_runner import LoadProfile, LoadRunner
+
+        profile = LoadProfile(concurrency=pytestconfig.getoption('--load-concurrency'),
+                              duration=pytestconfig.getoption('--load-duration'),
+                              ramp_up=pytestconfig.getoption('--load-ramp-up'),
+                              target_rps=pytestconfig.getoption('--load-rps'))
+        payload = self.login_api.create_auth_payload(self.data.user_email, self.data.user_password)
+
+        report = LoadRunner(login_url, lambda user, request: payload, profile).run()
+
+        print(f'\nLoad on {login_url}: {report.summary()}')
+        allure.attach(json.dumps(report.to_dict(), indent=2), name='login load report',
+                      attachment_type=allure.attachment_type.JSON)
+
+        assert report.total > 0, "No request was sent"
+        max_error_rate = pytestconfig.getoption('--load-max-error-rate')
+        assert report.error_rate <= max_error_rate, \
+            f"Error rate {report.error_rate:.2%} above {max_error_rate:.2%}: {report.errors}"
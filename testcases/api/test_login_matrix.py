@@ -0,0 +1,16 @@
+import pytest
+from testcases.api.base_test import BaseTest
+from pages.api.authentication_api_page import AuthenticationApiPage
+
+
+class TestLoginMatrix(BaseTest):
+    def setup_class(self):
+        self.login_api = AuthenticationApiPage()
+
+    @pytest.mark.api
+    @pytest.mark.data()
+    def test_login_for_every_account(self, record):
+        response = self.login_api.login(record['email'], record['password'])
+
+        assert response.status_code == 200, f"Login of {record['email']} failed with {response.status_code}"
+        assert response.json().get("email") == record['email'], "Returned email does not match"
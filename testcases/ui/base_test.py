@@ -1,5 +1,16 @@
 import pytest
+
+
+@pytest.mark.usefixtures('driver')
 class BaseTest:
     """
-    Base class for all test classes.
-    """
\ No newline at end of file
+    Base class for all test classes. Every UI test class leases a browser from the session driver pool.
+    """
+
+
+@pytest.mark.usefixtures('logged_in_driver')
+class LoggedInBaseTest(BaseTest):
+    """
+    Base class for test classes starting behind the login. The browser is logged in from a storage state snapshot,
+    only the first class of a user goes through the login form.
+    """
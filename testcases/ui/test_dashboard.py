@@ -0,0 +1,18 @@
+import allure
+import pytest
+from testcases.ui.base_test import LoggedInBaseTest
+from pages.ui.dashboard_page import DashboardPage
+
+
+class TestDashboard(LoggedInBaseTest):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def setup_pages(self, request, logged_in_driver):
+        request.cls.dashboard_page = DashboardPage(logged_in_driver)
+
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.sanity
+    def test_dashboard_opens_for_logged_in_user(self):
+        with allure.step("Verify the dashboard is shown without going through the login form"):
+            assert self.dashboard_page.is_element_visible(self.dashboard_page.CONTENT_MANAGER_TITLE, 5)
+            assert '/login' not in self.dashboard_page.get_current_url()
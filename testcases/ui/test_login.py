@@ -4,16 +4,15 @@ from testcases.ui.base_test import BaseTest
 from resources.data import Data
 from pages.ui.login_page import LoginPage
 from pages.ui.dashboard_page import DashboardPage
-from conftest import get_driver
 import time
 
 class TestLogin(BaseTest):
 
-    def setup_class(self):
-        self.driver = get_driver()
-        self.login_page = LoginPage(self.driver)
-        self.dashboard_page = DashboardPage(self.driver)
-        self.data = Data()
+    @pytest.fixture(scope='class', autouse=True)
+    def setup_pages(self, request, driver):
+        request.cls.login_page = LoginPage(driver)
+        request.cls.dashboard_page = DashboardPage(driver)
+        request.cls.data = Data()
     
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.sanity
@@ -27,7 +26,9 @@ class TestLogin(BaseTest):
             self.login_page.enter_text_at(self.data.user_password, self.login_page.PASSWORD_FIELD)
             assert self.login_page.get_attribute(self.login_page.PASSWORD_FIELD,
                                                     'value') == self.data.user_password
-            self.login_page.click_and_wait_for_invisibility(self.login_page.LOGIN_BUTTON, 10)
+            with self.dashboard_page.measure_action('login to dashboard',
+                                                    budget={**DashboardPage.PERFORMANCE_BUDGET, 'duration': 10000}):
+                self.login_page.click_and_wait_for_invisibility(self.login_page.LOGIN_BUTTON, 10)
+                assert self.login_page.is_element_visible(self.dashboard_page.CONTENT_MANAGER_TITLE, 5)
             assert not self.login_page.is_element_visible(self.login_page.LOGIN_BUTTON, 2)
-            assert self.login_page.is_element_visible(self.dashboard_page.CONTENT_MANAGER_TITLE, 5)
             
\ No newline at end of file
@@ -0,0 +1,5 @@
+import pytest
+class BaseTest:
+    """
+    Base class for all test classes.
+    """
\ No newline at end of file
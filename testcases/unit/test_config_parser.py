@@ -0,0 +1,57 @@
+import pytest
+from testcases.unit.base_test import BaseTest
+from utils.config_parser import ConfigParser
+
+
+class TestConfigParser(BaseTest):
+    def test_layers_override_in_order(self, tmp_path):
+        (tmp_path / 'system.properties').write_text('base_url=https://qa.example.com\ntimeout=10\nbrowser=chrome\n')
+        (tmp_path / 'system.local.properties').write_text('base_url=http://127.0.0.1:8080\n')
+        config_parser = ConfigParser(defaults={'timeout': '5', 'retries': '1'}, env='local',
+                                     environ={'QA_BROWSER': 'headless-lite', 'BROWSER': 'ignored'})
+        config_parser.add_file(str(tmp_path / 'system.properties')).load_configs()
+        config_parser.set_config('retries', ' 3 ')
+
+        assert config_parser.get_config('base_url') == 'http://127.0.0.1:8080'
+        assert config_parser.get_int('timeout') == 10
+        assert config_parser.get_config('browser') == 'headless-lite'
+        assert config_parser.get_int('retries') == 3
+
+    def test_set_and_delete_config_refresh_the_merged_configs(self):
+        config_parser = ConfigParser(defaults={'browser': 'chrome'}, environ={})
+        assert config_parser.get_config('browser') == 'chrome'
+
+        config_parser.set_config('browser', 'debugging')
+        assert config_parser.get_config('browser') == 'debugging'
+
+        config_parser.delete_config('browser')
+        assert config_parser.get_config('browser') is None
+        with pytest.raises(TypeError):
+            config_parser.configs['browser'] = 'chrome'
+
+    def test_typed_getters(self):
+        config_parser = ConfigParser(defaults={'count': '4', 'ratio': '0.5', 'headless': 'Yes', 'tags': 'a, b,,c',
+                                               'empty': ''}, environ={})
+
+        assert config_parser.get_int('count') == 4
+        assert config_parser.get_float('ratio') == 0.5
+        assert config_parser.get_bool('headless') is True
+        assert config_parser.get_list('tags') == ['a', 'b', 'c']
+        assert config_parser.get_int('empty', 7) == 7
+        assert config_parser.get_int('missing') is None
+
+    @pytest.mark.parametrize('value, seconds', [('500ms', 0.5), ('30s', 30), ('2m', 120), ('1h', 3600), (' 1.5 ', 1.5)])
+    def test_get_duration(self, value, seconds):
+        config_parser = ConfigParser(defaults={'timeout': value}, environ={})
+        assert config_parser.get_duration('timeout') == seconds
+
+    @pytest.mark.parametrize('value', ['fast', '10 days', '-5s', '1.5.2m'])
+    def test_get_duration_rejects_invalid_values(self, value):
+        config_parser = ConfigParser(defaults={'timeout': value}, environ={})
+        with pytest.raises(ValueError, match='Invalid value .* for config timeout'):
+            config_parser.get_duration('timeout')
+
+    def test_get_bool_rejects_invalid_values(self):
+        config_parser = ConfigParser(defaults={'headless': 'maybe'}, environ={})
+        with pytest.raises(ValueError, match='Invalid value \'maybe\' for config headless'):
+            config_parser.get_bool('headless')
@@ -0,0 +1,45 @@
+import string
+
+import pytest
+from testcases.unit.base_test import BaseTest
+from utils import helper
+
+
+class TestHelper(BaseTest):
+    def test_passwords_are_unique_and_hold_every_class(self):
+        passwords = helper.generate_passwords(2000, length=8, seed=1)
+
+        assert len(set(passwords)) == 2000
+        for password in passwords:
+            assert len(password) == 8
+            assert all(any(character in group for character in password) for group in helper.PASSWORD_CLASSES)
+
+    def test_unique_batch_uses_up_every_possible_string(self):
+        strings = helper.generate_strings(16, 4, 'ab', seed=2)
+
+        assert sorted(strings) == sorted(f'{number:04b}'.translate(str.maketrans('01', 'ab')) for number in range(16))
+
+    def test_required_classes_are_counted_when_checking_uniqueness(self):
+        # 'ab' & 'ba' are the only strings of length 2 holding both an a & a b.
+        assert sorted(helper.generate_strings(2, 2, 'ab', required=('a', 'b'), seed=3)) == ['ab', 'ba']
+        with pytest.raises(ValueError, match='less than 3 unique strings'):
+            helper.generate_strings(3, 2, 'ab', required=('a', 'b'))
+
+    def test_more_unique_strings_than_exist_are_rejected(self):
+        with pytest.raises(ValueError, match='less than 17 unique strings of length 4'):
+            helper.generate_strings(17, 4, 'ab')
+        assert len(helper.generate_strings(17, 4, 'ab', unique=False)) == 17
+
+    def test_length_must_hold_the_required_classes(self):
+        with pytest.raises(ValueError, match='Length 3 can not hold'):
+            helper.generate_passwords(1, length=3)
+
+    def test_seeded_batches_are_reproducible(self):
+        assert helper.generate_custom_ids(50, 12, seed=4) == helper.generate_custom_ids(50, 12, seed=4)
+        assert all(set(custom_id) <= set(string.ascii_lowercase + string.digits)
+                   for custom_id in helper.generate_custom_ids(50, 12, seed=4))
+
+    def test_secure_generator_can_not_be_seeded(self):
+        with pytest.raises(ValueError):
+            helper.generate_random_alphanumeric_strings(1, seed=5, secure=True)
+        assert len(helper.generate_random_alphanumeric_strings(3, 10, secure=True)) == 3
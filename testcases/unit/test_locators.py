@@ -0,0 +1,51 @@
+import pytest
+from testcases.unit.base_test import BaseTest
+from pages.ui.locators import CSS_SELECTOR, XPATH, compile_locator, scope_locator, xpath_to_css
+
+
+class TestLocators(BaseTest):
+    @pytest.mark.parametrize('xpath, css', [
+        ("//input[contains(@class, 'mantine-TextInput-input')]", 'input[class*="mantine-TextInput-input"]'),
+        ("//button[@type='submit']", 'button[type="submit"]'),
+        ('//div[@data-testid]/span', 'div[data-testid] > span'),
+        ("//form[@id='login']//input[starts-with(@name, 'pass')]", 'form[id="login"] input[name^="pass"]'),
+        ("//li[2]", 'li:nth-of-type(2)'),
+        ("//li[last()]", 'li:last-of-type'),
+        ("//*[contains(concat(' ', normalize-space(@class), ' '), ' active ')]", '.active'),
+        ("//a[@href='a\"b']", 'a[href="a\\"b"]'),
+        (".//td[@class='name' and @title]", 'td[class="name"][title]'),
+    ])
+    def test_translatable_xpath_is_compiled_to_css(self, xpath, css):
+        assert xpath_to_css(xpath) == css
+        assert compile_locator((XPATH, xpath)) == (CSS_SELECTOR, css)
+
+    @pytest.mark.parametrize('xpath', [
+        "//button[text()='Sign in']",
+        "//button[normalize-space()='Sign in']",
+        "//div[@id='a'] | //div[@id='b']",
+        '//input/following-sibling::label',
+        '//input/..',
+        "//li[@class='item'][2]",
+        '//*[1]',
+        "//a[contains(@href, '')]",
+        "//div[@id='a' or @id='b']",
+        "/html/body",
+        "//svg:path",
+        "//button[@type='submit'",
+    ])
+    def test_untranslatable_xpath_stays_xpath(self, xpath):
+        assert xpath_to_css(xpath) is None
+        assert compile_locator((XPATH, xpath)) == (XPATH, xpath)
+
+    def test_other_locators_are_returned_unchanged(self):
+        assert compile_locator(('id', 'email')) == ('id', 'email')
+        assert compile_locator((CSS_SELECTOR, 'input')) == (CSS_SELECTOR, 'input')
+
+    def test_scope_locator(self):
+        assert scope_locator((XPATH, "//input[@name='email']"), ('id', 'login-form')) == \
+            (CSS_SELECTOR, '[id="login-form"] input[name="email"]')
+        assert scope_locator((XPATH, "//button[normalize-space()='Sign in']"), ('id', 'login-form')) == \
+            (XPATH, "(id('login-form'))//button[normalize-space()='Sign in']")
+
+        with pytest.raises(ValueError):
+            scope_locator(('link text', 'Sign in'), ('id', 'login-form'))
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from testcases.unit.base_test import BaseTest
+from utils.test_data import AccountPool, DataSource
+
+
+class TestDataSource(BaseTest):
+    def test_csv_records_are_read_by_number(self, tmp_path):
+        path = tmp_path / 'accounts.csv'
+        path.write_text('email,password\nfirst@example.com,one\n"second@example.com","multi\nline"\n\n'
+                        'third@example.com,three\n')
+        source = DataSource(str(path))
+
+        assert len(source) == 3
+        assert source.record_at(2) == {'email': 'third@example.com', 'password': 'three'}
+        assert source.record_at(1) == {'email': 'second@example.com', 'password': 'multi\nline'}
+        assert list(source) == [source.record_at(number) for number in range(3)]
+        assert [repr(ref) for ref in source.refs(limit=2)] == ['accounts.csv:0', 'accounts.csv:1']
+
+    def test_jsonl_and_properties_records_are_read_by_number(self, tmp_path):
+        jsonl = tmp_path / 'accounts.jsonl'
+        jsonl.write_text('{"email": "first@example.com"}\n\n{"email": "second@example.com"}\n')
+        properties = tmp_path / 'accounts.properties'
+        properties.write_text('# users\nuser1.email=first@example.com\nuser1.password=one\n'
+                              'user2.email=second@example.com\nuser2.password: two\n')
+
+        assert DataSource(str(jsonl)).record_at(1) == {'email': 'second@example.com'}
+        assert DataSource(str(properties)).record_at(1) == {'email': 'second@example.com', 'password': 'two'}
+
+    def test_unsupported_format_is_rejected(self):
+        with pytest.raises(ValueError):
+            DataSource('accounts.xlsx')
+
+
+class TestAccountPool(BaseTest):
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / 'accounts.csv'
+        path.write_text('email,password\n' + ''.join(f'user{number}@example.com,secret\n' for number in range(3)))
+        return DataSource(str(path))
+
+    def test_accounts_are_leased_round_robin_without_overlap(self, source, tmp_path):
+        pool = AccountPool(source, str(tmp_path / 'leases.json'), timeout=0)
+        other_worker = AccountPool(source, pool.lease_file, timeout=0)
+        other_worker.owner = 'other-host:1'
+
+        first, second, third = pool.lease(), other_worker.lease(), pool.lease()
+
+        assert [first['email'], second['email'], third['email']] == \
+            ['user0@example.com', 'user1@example.com', 'user2@example.com']
+        with pytest.raises(TimeoutError):
+            pool.lease()
+
+        other_worker.release(second)
+        assert pool.lease()['email'] == 'user1@example.com'
+
+    def test_expired_leases_are_handed_out_again(self, source, tmp_path):
+        crashed_worker = AccountPool(source, str(tmp_path / 'leases.json'), lease_ttl=0.2, timeout=0)
+        crashed_worker.owner = 'other-host:1'
+        for _ in range(3):
+            crashed_worker.lease()
+
+        pool = AccountPool(source, crashed_worker.lease_file, timeout=1, poll_interval=0.05)
+        with pytest.raises(TimeoutError):
+            AccountPool(source, crashed_worker.lease_file, timeout=0).lease()
+        time.sleep(0.2)
+
+        assert pool.lease()['email'] == 'user0@example.com'
+
+    def test_release_owned_keeps_the_leases_of_other_owners(self, source, tmp_path):
+        pool = AccountPool(source, str(tmp_path / 'leases.json'), timeout=0)
+        other_worker = AccountPool(source, pool.lease_file, timeout=0)
+        other_worker.owner = 'other-host:1'
+        pool.lease()
+        other_worker.lease()
+
+        pool.release_owned()
+
+        assert pool.lease()['email'] == 'user2@example.com'
+        assert pool.lease()['email'] == 'user0@example.com'
+        with pytest.raises(TimeoutError):
+            pool.lease()
@@ -0,0 +1,46 @@
+import pytest
+from testcases.unit.base_test import BaseTest
+from utils import helper, time_utils
+
+
+class TestTimeUtils(BaseTest):
+    @pytest.mark.parametrize('value, seconds', [('12:00 AM', 0), ('12:30 PM', 45000), ('09:30 PM', 77400),
+                                                ('1:05 am', 3900)])
+    def test_parse_time(self, value, seconds):
+        assert time_utils.parse_time(value) == seconds
+        assert time_utils.parse_time(time_utils.format_time(seconds)) == seconds
+
+    @pytest.mark.parametrize('value', ['13:00 PM', '10:60 AM', '10:30', 'noon'])
+    def test_parse_time_rejects_invalid_values(self, value):
+        with pytest.raises(ValueError):
+            time_utils.parse_time(value)
+
+    def test_format_time(self):
+        assert time_utils.format_time(0) == '12:00 AM'
+        assert time_utils.format_time(77400) == '09:30 PM'
+        assert time_utils.format_time(90000, '%H:%M:%S') == '01:00:00'
+
+    def test_get_time_difference_wraps_past_midnight(self):
+        assert helper.get_time_difference('11:30 PM', '12:15 AM') == ('0h', '45m')
+        assert helper.get_time_difference('09:30 AM', '10:35 AM') == ('1h', '05m')
+        assert helper.get_time_difference('10:00 AM', '10:00 AM') == ('0h', '00m')
+        assert helper.get_time_difference('10:00 AM', '09:59 AM') == ('23h', '59m')
+
+    def test_time_difference_without_wrap_is_negative(self):
+        assert time_utils.time_difference('11:30 PM', '12:15 AM', wrap=False) == -83700
+        assert time_utils.time_differences(['11:30 PM', '01:00 AM'], ['12:15 AM', '02:00 AM']) == [2700, 3600]
+
+    def test_timeline_and_chronological_order_across_midnight(self):
+        schedule = ['10:00 PM', '11:00 PM', '01:00 AM']
+
+        assert time_utils.to_timeline(schedule) == [79200, 82800, 90000]
+        assert not time_utils.is_chronological(schedule)
+        assert time_utils.is_chronological(schedule, max_day_wraps=1)
+        assert not time_utils.is_chronological(['10:00 PM', '10:00 PM'], strict=True, max_day_wraps=1)
+
+    def test_durations(self):
+        assert time_utils.duration_to_seconds('1:02:03') == 3723
+        assert time_utils.durations_to_seconds(['02:03', '45']) == [123, 45]
+        assert helper.seconds_to_mm_ss(125) == '2:05'
+        with pytest.raises(ValueError):
+            helper.seconds_to_mm_ss(-1)
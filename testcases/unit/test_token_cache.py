@@ -0,0 +1,37 @@
+from testcases.unit.base_test import BaseTest
+from pages.api.token_cache import TokenCache
+
+
+class TestTokenCache(BaseTest):
+    def setup_class(self):
+        self.email = 'user@example.com'
+        self.password = 'secret'
+        self.auth = {'token': 'opaque-token', 'type': 'Bearer'}
+
+    def test_same_credentials_on_two_origins_do_not_share_an_entry(self, tmp_path):
+        token_cache = TokenCache(path=str(tmp_path / 'tokens.json'))
+        token_cache.put(self.email, self.password, 'https://qa.example.com/api/login', self.auth)
+
+        assert token_cache.get(self.email, self.password, 'https://qa.example.com/api/login') == self.auth
+        assert token_cache.get(self.email, self.password, 'https://staging.example.com/api/login') is None
+
+        # Nor through the file another worker reads.
+        other_worker = TokenCache(path=token_cache.path)
+        assert other_worker.get(self.email, self.password, 'https://staging.example.com/api/login') is None
+        assert other_worker.get(self.email, self.password, 'https://qa.example.com/api/login') == self.auth
+
+    def test_invalidate_only_drops_the_entry_of_its_origin(self):
+        token_cache = TokenCache()
+        token_cache.put(self.email, self.password, 'https://qa.example.com/api/login', self.auth)
+        token_cache.put(self.email, self.password, 'https://staging.example.com/api/login', self.auth)
+
+        token_cache.invalidate(self.email, self.password, 'https://qa.example.com/api/login')
+
+        assert token_cache.get(self.email, self.password, 'https://qa.example.com/api/login') is None
+        assert token_cache.get(self.email, self.password, 'https://staging.example.com/api/login') == self.auth
+
+    def test_password_is_not_persisted_in_clear_text(self, tmp_path):
+        token_cache = TokenCache(path=str(tmp_path / 'tokens.json'))
+        token_cache.put(self.email, self.password, 'https://qa.example.com/api/login', self.auth)
+
+        assert self.password not in (tmp_path / 'tokens.json').read_text()
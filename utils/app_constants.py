@@ -1,7 +1,7 @@
 """
 Provides paths for various resource under resource folder.
 """
-from os.path import dirname, join
+from os.path import dirname, expanduser, join
 
 
 class AppConstant:
@@ -10,4 +10,8 @@ class AppConstant:
     """
     PROJECT_ROOT = dirname(dirname(__file__))
     RESOURCE_FOLDER = join(PROJECT_ROOT, 'resources')
-    SYSTEM_CONFIG = join(RESOURCE_FOLDER, 'system.properties')
\ No newline at end of file
+    SYSTEM_CONFIG = join(RESOURCE_FOLDER, 'system.properties')
+    TEST_DATA_FOLDER = join(RESOURCE_FOLDER, 'test_data')
+    OUTPUT_FOLDER = join(PROJECT_ROOT, 'output')
+    WORKER_OUTPUT_FOLDER = join(OUTPUT_FOLDER, 'workers')
+    DRIVER_CACHE_FOLDER = join(expanduser('~'), '.cache', 'qa-webdrivers')
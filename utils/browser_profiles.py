@@ -0,0 +1,110 @@
+"""
+Describes the browser flavours that can be requested with --browser or the `browser` marker & builds the matching
+chrome options.
+"""
+import os
+
+
+class BrowserProfile:
+    """
+    A named set of chrome settings.
+
+    :param name: name used on the command line & in markers.
+    :param headless: run chrome without a visible window.
+    :param lightweight: drop images, extensions & background services to save memory & bandwidth.
+    :param window_size: fixed (width, height). None maximizes the window instead.
+    :param page_load_strategy: 'normal' waits for all resources, 'eager' returns once the DOM is ready.
+    :param slot_cache: keep the disk cache of every driver pool slot of a worker, so a browser replacing a broken or
+        retired one starts with a warm cache. Browsers running at the same time never share a cache folder.
+    :param debugger_address: attach to an already running chrome instead of starting one.
+    """
+
+    def __init__(self, name, headless=False, lightweight=False, window_size=None, page_load_strategy='normal',
+                 slot_cache=False, debugger_address=None):
+        self.name = name
+        self.headless = headless
+        self.lightweight = lightweight
+        self.window_size = window_size
+        self.page_load_strategy = page_load_strategy
+        self.slot_cache = slot_cache
+        self.debugger_address = debugger_address
+
+    def build_chrome_options(self, context, cache_slot=None):
+        """
+        Creates chrome options for this profile. Browsers get their own profile & download folder from the worker
+        context.
+
+        :param cache_slot: name of the driver pool slot the browser occupies i.e.: hc-0. Browsers started outside a
+            pool keep the cache inside their own profile.
+        """
+        from selenium import webdriver
+
+        options = webdriver.ChromeOptions()
+
+        if self.debugger_address:
+            options.add_experimental_option('debuggerAddress', self.debugger_address)
+            return options
+
+        options.add_argument('--use-fake-device-for-media-stream')
+        options.add_argument('--use-fake-ui-for.media-stream')
+        options.add_experimental_option('useAutomationExtension', False)
+        options.add_experimental_option('excludeSwitches', ['enable-automation'])
+        options.add_argument(f'--user-data-dir={context.new_profile_dir()}')
+        options.page_load_strategy = self.page_load_strategy
+
+        prefs = {
+            'download.default_directory': context.downloads_dir,
+            'download.prompt_for_download': False,
+        }
+
+        if self.headless:
+            options.add_argument('--headless=new')
+            options.add_argument('--disable-gpu')
+            options.add_argument('--disable-dev-shm-usage')
+
+        if self.window_size:
+            options.add_argument('--window-size={},{}'.format(*self.window_size))
+
+        if self.slot_cache and cache_slot is not None:
+            options.add_argument(f'--disk-cache-dir={os.path.join(context.root_dir, "browser-cache", cache_slot)}')
+
+        if self.lightweight:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_argument('--disable-extensions')
+            options.add_argument('--disable-background-networking')
+            options.add_argument('--disable-component-update')
+            options.add_argument('--disable-default-apps')
+            options.add_argument('--disable-sync')
+            options.add_argument('--no-first-run')
+            options.add_argument('--mute-audio')
+            options.add_argument('--disable-features=Translate,OptimizationHints,MediaRouter')
+            prefs['profile.managed_default_content_settings.images'] = 2
+
+        options.add_experimental_option('prefs', prefs)
+        return options
+
+
+HEADLESS_CHROME = BrowserProfile('headless-chrome', headless=True, window_size=(1920, 1080),
+                                 page_load_strategy='eager', slot_cache=True)
+HEADLESS_LITE = BrowserProfile('headless-lite', headless=True, lightweight=True, window_size=(1920, 1080),
+                               page_load_strategy='eager', slot_cache=True)
+
+BROWSER_PROFILES = {
+    'chrome': BrowserProfile('chrome'),
+    'debugging': BrowserProfile('debugging', debugger_address='localhost:9222'),
+    'hc': HEADLESS_CHROME,
+    'headless-chrome': HEADLESS_CHROME,
+    'hl': HEADLESS_LITE,
+    'headless-lite': HEADLESS_LITE,
+}
+
+
+def get_browser_profile(name):
+    """
+    Returns the profile registered under the given name.
+    """
+    try:
+        return BROWSER_PROFILES[name]
+    except KeyError:
+        raise ValueError(f'Invalid browser type {name}. Please try with one of: '
+                         f'{", ".join(sorted(BROWSER_PROFILES))}.') from None
@@ -0,0 +1,235 @@
+"""
+Time source of the tests & helpers. Code asking get_clock() for the time can be run against a FrozenClock, which
+only moves when told to, & BrowserClock makes the application under test see the same time as the test.
+
+Usage:
+    with use_clock(FrozenClock(datetime(2024, 1, 1, 9, 59, 50))) as clock:
+        page.browser_clock.sync(clock)
+        clock.advance(15)
+"""
+import contextlib
+import json
+import time
+from datetime import datetime
+
+# Function expression replacing Date, so the page sees the time of the test clock. state.frozen stops the time at
+# state.time, otherwise state.offset milliseconds are added to the real time. Date.now, new Date() & Date() follow
+# the override, performance.now & timers keep running normally.
+CLOCK_OVERRIDE = """
+function (state) {
+    var RealDate = window.__qaRealDate || Date;
+    window.__qaRealDate = RealDate;
+    var now = function () { return state.frozen ? state.time : RealDate.now() + state.offset; };
+    function ClockDate() {
+        if (!(this instanceof ClockDate)) { return new RealDate(now()).toString(); }
+        if (arguments.length === 0) { return new RealDate(now()); }
+        var args = [null].concat(Array.prototype.slice.call(arguments));
+        return new (Function.prototype.bind.apply(RealDate, args))();
+    }
+    ClockDate.prototype = RealDate.prototype;
+    ClockDate.now = now;
+    ClockDate.parse = RealDate.parse;
+    ClockDate.UTC = RealDate.UTC;
+    window.Date = ClockDate;
+}
+"""
+
+# Undoes CLOCK_OVERRIDE on the current document.
+CLOCK_RESET = """
+if (window.__qaRealDate) { window.Date = window.__qaRealDate; }
+"""
+
+
+class SystemClock:
+    """
+    The real time.
+    """
+
+    def time(self):
+        return time.time()
+
+    def now(self):
+        return datetime.now()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class FrozenClock:
+    """
+    Clock standing still until advance() or sleep() moves it. Sleeping returns right away.
+
+    :param start: datetime (naive datetimes are local time) or epoch seconds. Defaults to now.
+    """
+
+    def __init__(self, start=None):
+        self._time = to_timestamp(start) if start is not None else time.time()
+
+    def time(self):
+        return self._time
+
+    def now(self):
+        return datetime.fromtimestamp(self._time)
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self._time += seconds
+
+    def advance(self, seconds):
+        self._time += seconds
+
+    def set(self, when):
+        self._time = to_timestamp(when)
+
+
+def to_timestamp(when):
+    return when.timestamp() if isinstance(when, datetime) else float(when)
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    """
+    Replaces the clock of the session. Returns the previous one.
+    """
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+@contextlib.contextmanager
+def use_clock(clock):
+    """
+    Uses a clock for the duration of the block only.
+    """
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def seconds_until_boundary(unit=60, clock=None):
+    """
+    Seconds left until the local time is the next whole multiple of unit seconds, i.e.: the next minute for 60.
+    """
+    now = (clock or _clock).time()
+    local = now + time.localtime(now).tm_gmtoff
+    return unit - local % unit
+
+
+def sleep_until(timestamp, clock=None):
+    """
+    Sleeps until the clock reaches the epoch timestamp. Wakes up early by the OS are slept off, so the call never
+    returns before the timestamp.
+    """
+    clock = clock or _clock
+    remaining = timestamp - clock.time()
+    while remaining > 0:
+        clock.sleep(remaining)
+        remaining = timestamp - clock.time()
+
+
+def wait_until_boundary(unit=60, min_remaining=None, clock=None):
+    """
+    Sleeps until the next whole multiple of unit seconds of local time.
+
+    :param unit: boundary in seconds, i.e.: 60 for the next minute, 3600 for the next hour.
+    :param min_remaining: only wait if fewer seconds than this are left until the boundary, so a flow which needs that
+        long doesn't cross it. None always waits.
+    :param clock: clock to use. Defaults to the session clock.
+    :return: seconds slept, 0 if there was enough time left.
+    """
+    clock = clock or _clock
+    remaining = seconds_until_boundary(unit, clock)
+    if min_remaining is not None and remaining >= min_remaining:
+        return 0
+    sleep_until(clock.time() + remaining, clock)
+    return remaining
+
+
+class BrowserClock:
+    """
+    Overrides the time JavaScript of the application sees (Date) in one browser, for the current document & every
+    document loaded later. Chrome also gets the time zone through CDP. Other browsers only get the current document
+    overridden. A pooled browser keeps the override until DriverPool resets it, when the browser is acquired again.
+
+    :param driver: WebDriver of the browser.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.overridden = False
+        self._script_id = None
+        self._timezone = None
+
+    def set_time(self, when, frozen=False, timezone_id=None):
+        """
+        :param when: datetime (naive datetimes are local time) or epoch seconds the page's clock is set to.
+        :param frozen: stop the time at when. Otherwise it keeps running from when on.
+        :param timezone_id: IANA time zone i.e.: Europe/Berlin the page runs in. Only supported by Chrome.
+        """
+        timestamp = to_timestamp(when)
+        state = {'frozen': frozen, 'time': timestamp * 1000, 'offset': (timestamp - time.time()) * 1000}
+        source = f'({CLOCK_OVERRIDE})({json.dumps(state)});'
+
+        self._remove_script()
+        if hasattr(self.driver, 'execute_cdp_cmd'):
+            self._script_id = self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                                          {'source': source})['identifier']
+            if timezone_id != self._timezone:
+                self.driver.execute_cdp_cmd('Emulation.setTimezoneOverride', {'timezoneId': timezone_id or ''})
+                self._timezone = timezone_id
+        elif timezone_id:
+            raise RuntimeError('Time zones can only be overridden in Chromium based browsers.')
+        self.driver.execute_script(source)
+        self.overridden = True
+
+    def freeze(self, when):
+        self.set_time(when, frozen=True, timezone_id=self._timezone)
+
+    def sync(self, clock=None):
+        """
+        Makes the page see the time of a clock, the session clock by default. A FrozenClock freezes the page's time
+        too, the system clock removes the override.
+        """
+        clock = clock or _clock
+        if isinstance(clock, SystemClock):
+            self.reset()
+        else:
+            self.freeze(clock.time())
+
+    def reset(self):
+        """
+        Gives the page the real time & time zone back. Nothing is sent if the clock wasn't overridden.
+        """
+        if not self.overridden:
+            return
+        self._remove_script()
+        if self._timezone is not None:
+            self.driver.execute_cdp_cmd('Emulation.setTimezoneOverride', {'timezoneId': ''})
+            self._timezone = None
+        self.driver.execute_script(CLOCK_RESET)
+        self.overridden = False
+
+    def _remove_script(self):
+        if self._script_id is not None:
+            self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': self._script_id})
+            self._script_id = None
+
+
+def get_browser_clock(driver):
+    """
+    Returns the clock override of a driver, creating it on first use.
+    """
+    clock = getattr(driver, 'browser_clock', None)
+    if clock is None:
+        clock = BrowserClock(driver)
+        driver.browser_clock = clock
+    return clock
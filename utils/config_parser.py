@@ -1,54 +1,167 @@
-from io import StringIO
+"""
+Provides layered access to the .properties configs. Layers, lowest precedence first:
 
-from jproperties import Properties
+    1. defaults passed to the parser
+    2. added .properties files, in the order they were added
+    3. environment specific siblings of those files i.e.: system.local.properties for env 'local'
+    4. environment variables prefixed with QA_ i.e.: QA_BASE_URL overrides base_url
+    5. overrides set with set_config, i.e.: from the command line
 
-from utils.app_constants import AppConstant
+The layers are merged once into an immutable dict of stripped values. Setting or deleting a config afterwards
+produces a new merged dict on the next read.
+"""
+import os
+import re
+from types import MappingProxyType
 
+DURATION_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, None: 1}
+TRUE_VALUES = {'true', 'yes', 'on', '1'}
+FALSE_VALUES = {'false', 'no', 'off', '0'}
 
-class ConfigParser:
 
-    def __init__(self):
-        self.configs = Properties()
+class ConfigParser:
+    ENV_PREFIX = 'QA_'
+
+    def __init__(self, defaults=None, env=None, environ=None):
+        """
+        :param defaults: dict of configs used when no other layer provides a value.
+        :param env: environment name i.e.: dev, staging or local. Enables the environment specific files.
+        :param environ: mapping read for QA_ prefixed overrides. Defaults to os.environ.
+        """
+        self.defaults = dict(defaults or {})
+        self.env = env
+        self.environ = os.environ if environ is None else environ
         self.files = []
+        self._file_configs = {}
+        self._overrides = {}
+        self._deleted = set()
+        self._resolved = None
 
     def add_file(self, file_name):
         self.files.append(file_name)
         return self
 
     def load_configs(self):
-        for file in self.files:
-            try:
-                with open(file, 'rb') as config_file:
-                    temp_config = Properties()
-                    temp_config.load(config_file)
-
-                    for __item in temp_config.items():
-                        key = __item[0]
-                        value = __item[1].data
-
-                        self.set_config(key, value)
-            except FileNotFoundError:
-                print(f'Sorry, the file {file} does not exists.')
+        """
+        Reads every added file & its environment specific sibling once.
+        """
+        from jproperties import Properties
 
+        file_configs = {}
+        for file in self.files:
+            candidates = [(file, True)]
+            if self.env:
+                stem, extension = os.path.splitext(file)
+                candidates.append((f'{stem}.{self.env}{extension}', False))
+
+            for path, required in candidates:
+                try:
+                    with open(path, 'rb') as config_file:
+                        properties = Properties()
+                        properties.load(config_file)
+                        file_configs.update((key, value.data) for key, value in properties.items())
+                except FileNotFoundError:
+                    if required:
+                        print(f'Sorry, the file {path} does not exists.')
+
+        self._file_configs = file_configs
+        self._resolved = None
+        return self
 
-    def get_config(self, key):
-        value = self.configs.get(key)
-        return None if value is None else value.data.strip()
+    @property
+    def configs(self):
+        """
+        The merged, read only configs.
+        """
+        if self._resolved is None:
+            merged = dict(self.defaults)
+            merged.update(self._file_configs)
+            prefix_length = len(self.ENV_PREFIX)
+            merged.update((name[prefix_length:].lower(), value) for name, value in self.environ.items()
+                          if name.startswith(self.ENV_PREFIX))
+            merged.update(self._overrides)
+
+            self._resolved = MappingProxyType({key: str(value).strip() for key, value in merged.items()
+                                               if key not in self._deleted})
+        return self._resolved
+
+    def get_config(self, key, default=None):
+        return self.configs.get(key, default)
 
     def set_config(self, key, value):
-        self.configs[key] = value
+        self._overrides[key] = value
+        self._deleted.discard(key)
+        self._resolved = None
 
     def delete_config(self, key):
-        del self.configs[key]
+        if key not in self.configs:
+            raise KeyError(key)
+        self._overrides.pop(key, None)
+        self._deleted.add(key)
+        self._resolved = None
+
+    def get_int(self, key, default=None):
+        return self._convert(key, default, int)
+
+    def get_float(self, key, default=None):
+        return self._convert(key, default, float)
+
+    def get_bool(self, key, default=None):
+        def to_bool(value):
+            if value.lower() in TRUE_VALUES:
+                return True
+            if value.lower() in FALSE_VALUES:
+                return False
+            raise ValueError(f'expected one of {sorted(TRUE_VALUES | FALSE_VALUES)}')
+
+        return self._convert(key, default, to_bool)
+
+    def get_list(self, key, default=None, separator=','):
+        """
+        Splits a value like 'a, b, c' into ['a', 'b', 'c']. Empty items are dropped.
+        """
+        return self._convert(key, default,
+                             lambda value: [item.strip() for item in value.split(separator) if item.strip()])
+
+    def get_duration(self, key, default=None):
+        """
+        Returns a duration in seconds. Values may carry a unit: 500ms, 30s, 2m, 1h. Plain numbers are seconds.
+        """
+        def to_seconds(value):
+            match = DURATION_PATTERN.match(value)
+            if match is None:
+                raise ValueError('expected a number optionally followed by ms, s, m or h')
+            return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+        return self._convert(key, default, to_seconds)
+
+    def _convert(self, key, default, converter):
+        value = self.configs.get(key)
+        if value is None or value == '':
+            return default
+        try:
+            return converter(value)
+        except ValueError as e:
+            raise ValueError(f'Invalid value {value!r} for config {key}: {e}') from None
+
 
+class ConfigValue:
+    """
+    Class attribute read from the session configs (pytest.configs) when it is accessed instead of when the class is
+    defined, so page classes can be imported before the configs are loaded & always see overrides.
 
-conf = ConfigParser()
-conf.load_configs()
+    Usage:
+        class BasePage:
+            base_url = ConfigValue('base_url')
+    """
 
-count = -1
+    def __init__(self, key, default=None):
+        self.key = key
+        self.default = default
 
-for i in conf.configs:
-    if i.startswith('username'):
-        count = count + 1
+    def __get__(self, instance, owner):
+        import pytest
 
-print(count)
+        value = pytest.configs.get_config(self.key)
+        return self.default if value is None or value == '' else value
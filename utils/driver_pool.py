@@ -0,0 +1,198 @@
+"""
+Provides a bounded pool of warm WebDriver instances which are leased to test classes.
+"""
+import threading
+
+
+def add_document_script(driver, name, source):
+    """
+    Registers a script Chrome evaluates in every new document of the driver, at most once per driver & name. The CDP
+    identifiers are kept on the driver, so DriverPool removes the scripts before the driver is leased again.
+
+    :param name: name of the script i.e.: network_tracker.
+    :return: False for browsers without CDP, True otherwise.
+    """
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        return False
+    document_scripts = getattr(driver, 'document_scripts', None)
+    if document_scripts is None:
+        document_scripts = driver.document_scripts = {}
+    if name not in document_scripts:
+        document_scripts[name] = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                                        {'source': source})['identifier']
+    return True
+
+
+def remove_document_scripts(driver):
+    """
+    Removes every script add_document_script registered for the driver.
+    """
+    document_scripts = getattr(driver, 'document_scripts', None) or {}
+    while document_scripts:
+        _, identifier = document_scripts.popitem()
+        driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': identifier})
+
+
+class DriverPool:
+    """
+    Keeps up to `max_size` browsers alive for the whole session. Test classes acquire a driver, use it & release it
+    back to the pool. Before a driver is handed out again its state is reset (cookies, storage & url) so that test
+    classes do not leak state into each other.
+    """
+
+    RESET_STORAGE_SCRIPT = 'try { window.localStorage.clear(); } catch (e) {}' \
+                           'try { window.sessionStorage.clear(); } catch (e) {}'
+
+    def __init__(self, driver_factory, base_url, max_size=1):
+        """
+        :param driver_factory: callable receiving the pool slot (0 to max_size - 1) the new browser occupies &
+            returning a new WebDriver instance. A slot is only handed out again after its browser quit, so it can name
+            resources one browser must not share with another running at the same time, i.e.: a disk cache folder.
+        :param base_url: url every leased driver is navigated to before it is handed out.
+        :param max_size: maximum number of browsers the pool keeps alive at the same time.
+        """
+        if max_size < 1:
+            raise ValueError(f'Driver pool size must be at least 1, got {max_size}.')
+
+        self.driver_factory = driver_factory
+        self.base_url = base_url
+        self.max_size = max_size
+        self._idle = []
+        self._leased = set()
+        self._slots = {}
+        self._free_slots = list(range(max_size))
+        self._starting = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+    @property
+    def size(self):
+        """
+        Total number of browsers owned by the pool, both idle & leased.
+        """
+        with self._condition:
+            return len(self._idle) + len(self._leased) + self._starting
+
+    def acquire(self, timeout=None):
+        """
+        Leases a driver from the pool. An idle driver is reused if there is one, otherwise a new browser is started
+        as long as the pool is not full. If the pool is full the call blocks until a driver is released.
+
+        :param timeout: maximum time in seconds to wait for a free driver. None waits forever.
+        :return: a WebDriver instance pointing to the base url.
+        """
+        with self._condition:
+            if not self._condition.wait_for(self._can_lease, timeout):
+                raise TimeoutError(f'No driver was released within {timeout} seconds.')
+            if self._closed:
+                raise RuntimeError('Driver pool is already closed.')
+
+            driver = self._idle.pop() if self._idle else None
+            # Reserve the slot before leaving the lock so other threads respect the limit while we start a browser.
+            self._starting += 1
+
+        try:
+            if driver is not None and not self._reset(driver):
+                self._quit(driver)
+                driver = None
+            if driver is None:
+                driver = self._create()
+        finally:
+            with self._condition:
+                self._starting -= 1
+                if driver is not None:
+                    self._leased.add(id(driver))
+                self._condition.notify()
+
+        return driver
+
+    def release(self, driver):
+        """
+        Returns a leased driver back to the pool. If the pool is already closed the driver is quit instead.
+
+        :param driver: driver previously returned by acquire().
+        """
+        with self._condition:
+            self._leased.discard(id(driver))
+            keep = not self._closed
+            if keep:
+                self._idle.append(driver)
+            self._condition.notify()
+
+        if not keep:
+            self._quit(driver)
+
+    def quit_all(self):
+        """
+        Quits every idle browser & marks the pool as closed. Drivers still leased are quit when they are released.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+
+        for driver in idle:
+            self._quit(driver)
+
+    def _can_lease(self):
+        return self._closed or bool(self._idle) or len(self._leased) + self._starting < self.max_size
+
+    def _create(self):
+        with self._condition:
+            slot = self._free_slots.pop(0)
+        try:
+            driver = self.driver_factory(slot)
+        except BaseException:
+            self._free_slot(slot)
+            raise
+        with self._condition:
+            self._slots[id(driver)] = slot
+        try:
+            driver.get(self.base_url)
+        except BaseException:
+            # i.e.: the application is down. Don't leave the browser running & its slot taken.
+            self._quit(driver)
+            raise
+        return driver
+
+    def _free_slot(self, slot):
+        with self._condition:
+            self._free_slots.append(slot)
+            self._free_slots.sort()
+
+    def _reset(self, driver):
+        """
+        Restores the default network conditions & the real time, removes the scripts registered for new documents,
+        clears cookies & web storage of a previously leased driver & navigates it back to the base url.
+
+        :return: True if the driver is still usable, False if its session is broken.
+        """
+        try:
+            conditioner = getattr(driver, 'network_conditioner', None)
+            if conditioner is not None:
+                # Throttling or offline mode of the last lease would slow down or break the reset.
+                conditioner.reset()
+            clock = getattr(driver, 'browser_clock', None)
+            if clock is not None:
+                clock.reset()
+            remove_document_scripts(driver)
+            driver.switch_to.default_content()
+            # Cookies & storage can only be cleared for the origin currently loaded, so go back to it first.
+            driver.get(self.base_url)
+            driver.delete_all_cookies()
+            driver.execute_script(self.RESET_STORAGE_SCRIPT)
+            driver.refresh()
+            return True
+        except Exception as e:
+            print(f'Discarding broken driver from pool: {e}')
+            return False
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f'Failed to quit driver: {e}')
+        with self._condition:
+            slot = self._slots.pop(id(driver), None)
+        if slot is not None:
+            self._free_slot(slot)
@@ -0,0 +1,217 @@
+"""
+Resolves the chromedriver binary to use for a browser session. Resolved binaries are remembered in an on-disk index
+keyed by the major version of the downloaded chromedriver, so only the very first run on a machine needs to talk to the
+driver manager.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+
+from utils.app_constants import AppConstant
+from utils.file_lock import FileLock
+
+CHROME_BINARIES = (
+    'google-chrome',
+    'google-chrome-stable',
+    'chromium',
+    'chromium-browser',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+)
+
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+(?:\.\d+)?')
+
+
+class DriverResolutionError(RuntimeError):
+    """
+    Raised when no chromedriver binary can be found for the requested browser.
+    """
+
+
+class ChromeDriverResolver:
+    """
+    Finds the chromedriver binary for the installed (or requested) chrome version.
+
+    Lookup order:
+        1. in-process memo
+        2. explicitly provisioned driver (driver_path)
+        3. on-disk index in cache_dir, by chrome major version or, if no version can be detected, the driver indexed
+           last
+        4. chromedriver found on PATH, if it matches the chrome major version (offline mode only)
+        5. webdriver_manager download, guarded by an inter-process lock (online mode only)
+    """
+
+    INDEX_FILE = 'index.json'
+    LOCK_FILE = 'index.lock'
+
+    def __init__(self, cache_dir=AppConstant.DRIVER_CACHE_FOLDER, browser_version=None, offline=False,
+                 driver_path=None, browser_binary=None):
+        """
+        :param cache_dir: folder where the resolution index is persisted.
+        :param browser_version: requested chrome version i.e.: 120 or 120.0.6099.109. Detected if not provided.
+        :param offline: if True, never contact the network. Only cached or locally provisioned binaries are used.
+        :param driver_path: path to a locally provisioned chromedriver. Takes precedence over everything else.
+        :param browser_binary: chrome executable used for version detection. Searched on PATH if not provided.
+        """
+        self.cache_dir = cache_dir
+        self.browser_version = browser_version
+        self.offline = offline
+        self.driver_path = driver_path
+        self.browser_binary = browser_binary
+        self._resolved = None
+
+    @property
+    def index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def resolve(self):
+        """
+        :return: absolute path of the chromedriver binary.
+        """
+        if self._resolved is not None and os.path.isfile(self._resolved):
+            return self._resolved
+
+        if self.driver_path:
+            if not os.path.isfile(self.driver_path):
+                raise DriverResolutionError(f'Provisioned chromedriver {self.driver_path} does not exist.')
+            self._resolved = self.driver_path
+            return self._resolved
+
+        major_version = self.get_browser_major_version()
+        cached_path = self._cached_driver(major_version)
+
+        if cached_path and os.path.isfile(cached_path):
+            self._resolved = cached_path
+        elif self.offline:
+            self._resolved = self._resolve_offline(major_version)
+        else:
+            self._resolved = self._download(major_version)
+
+        return self._resolved
+
+    def get_browser_major_version(self):
+        """
+        Returns the chrome major version as string, or None if it can't be detected. The requested version wins,
+        otherwise the version of the installed binary is detected. Detection results are cached by binary path &
+        modification time, so the browser is only executed again after it was updated. Failed detections aren't cached.
+        """
+        if self.browser_version:
+            return str(self.browser_version).split('.')[0]
+
+        binary = self._find_browser_binary()
+        if binary is None:
+            return None
+
+        binary_key = f'{binary}|{os.path.getmtime(binary)}'
+        detected = self._read_index().get('browsers', {}).get(binary_key)
+        if detected is None:
+            detected = self._detect_version(binary)
+            if detected is not None:
+                self._update_index('browsers', binary_key, detected)
+        return detected
+
+    def _cached_driver(self, major_version):
+        """
+        Returns the indexed driver of the major version, or the driver indexed last if the version is unknown. None if
+        there is none or its binary is gone.
+        """
+        index = self._read_index()
+        drivers = index.get('drivers', {})
+        cached_path = drivers.get(major_version or index.get('latest_driver'))
+        return cached_path if cached_path and os.path.isfile(cached_path) else None
+
+    def _resolve_offline(self, major_version):
+        local_driver = shutil.which('chromedriver')
+        if local_driver is None:
+            raise DriverResolutionError(f'Offline mode: no cached chromedriver for chrome '
+                                        f'{major_version or "(unknown)"} in {self.cache_dir} & none found on PATH. '
+                                        f'Use --driver-path to provide one.')
+        if major_version:
+            driver_version = self._detect_version(local_driver)
+            if driver_version != major_version:
+                raise DriverResolutionError(f'Offline mode: chromedriver {driver_version or "(unknown version)"} on '
+                                            f'PATH ({local_driver}) does not match chrome {major_version}. Use '
+                                            f'--driver-path to provide a matching one.')
+        return local_driver
+
+    def _download(self, major_version):
+        """
+        Downloads chromedriver through webdriver_manager. A full requested version i.e.: 120.0.6099.109 is downloaded
+        as is, otherwise webdriver_manager picks the driver of the installed chrome. The binary is indexed under the
+        major version it reports itself, so a driver for another chrome never ends up under the requested key.
+
+        :raises DriverResolutionError: if the downloaded driver doesn't match the requested major version.
+        """
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        with FileLock(os.path.join(self.cache_dir, self.LOCK_FILE)):
+            # Another worker may have downloaded the driver while we were waiting for the lock.
+            cached_path = self._cached_driver(major_version)
+            if cached_path:
+                return cached_path
+
+            full_version = str(self.browser_version) if self.browser_version else ''
+            if VERSION_PATTERN.fullmatch(full_version):
+                driver_path = ChromeDriverManager(driver_version=full_version).install()
+            else:
+                driver_path = ChromeDriverManager().install()
+
+            driver_version = self._detect_version(driver_path)
+            if driver_version is not None:
+                self._write_index_entry('drivers', driver_version, driver_path)
+            if major_version and driver_version != major_version:
+                raise DriverResolutionError(
+                    f'Downloaded chromedriver {driver_version or "(unknown version)"} does not match the requested '
+                    f'chrome {major_version}. Request a full version as published by Chrome for Testing i.e.: '
+                    f'--browser-version 120.0.6099.109, or use --driver-path.')
+            return driver_path
+
+    def _find_browser_binary(self):
+        if self.browser_binary:
+            return self.browser_binary if os.path.isfile(self.browser_binary) else None
+
+        for candidate in CHROME_BINARIES:
+            binary = candidate if os.path.isfile(candidate) else shutil.which(candidate)
+            if binary:
+                return binary
+        return None
+
+    @staticmethod
+    def _detect_version(binary):
+        """
+        Returns the major version a chrome or chromedriver binary reports for --version, or None.
+        """
+        try:
+            output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+        match = VERSION_PATTERN.search(output)
+        return match.group(1) if match else None
+
+    def _read_index(self):
+        try:
+            with open(self.index_path) as index_file:
+                return json.load(index_file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _update_index(self, section, key, value):
+        with FileLock(os.path.join(self.cache_dir, self.LOCK_FILE)):
+            self._write_index_entry(section, key, value)
+
+    def _write_index_entry(self, section, key, value):
+        """
+        Writes a single entry into the index. Caller must hold the index lock.
+        """
+        index = self._read_index()
+        index.setdefault(section, {})[key] = value
+        if section == 'drivers':
+            # Used when the chrome version can't be detected.
+            index['latest_driver'] = key
+
+        temp_path = f'{self.index_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as index_file:
+            json.dump(index, index_file, indent=2)
+        os.replace(temp_path, self.index_path)
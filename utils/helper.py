@@ -1,36 +1,144 @@
-import time as sleep_time
-from datetime import datetime
+import functools
+import itertools
+import math
 import string
 import random
-from datetime import *
-from selenium.webdriver.support import expected_conditions as ec
-def wait_for_next_minute():
-    # Check the current second is between 40 to 59 seconds. If it is then waiting 20 seconds.
-    myobj = datetime.now()
-    print(myobj.second)
-    if (40 <= myobj.second and myobj.second <= 59):
-        print('waiting 20 seconds')
-        sleep_time.sleep(20)
+import secrets
+from utils.clock import wait_until_boundary
+from utils.time_utils import duration_to_seconds, time_difference
+
+
+def wait_for_next_minute(min_remaining=20, clock=None):
+    """
+    Waits for the next minute if less than min_remaining seconds are left of the current one, so a time sensitive
+    flow doesn't cross the minute. Sleeps only until the minute starts, with the session clock (see utils/clock.py),
+    so tests running on a FrozenClock only move it forward.
+
+    :return: seconds waited.
+    """
+    waited = wait_until_boundary(60, min_remaining, clock)
+    if waited:
+        print(f'waited {waited:.3f} seconds for the next minute')
+    return waited
+
+
+PASSWORD_CLASSES = (string.ascii_lowercase, string.ascii_uppercase, string.digits, string.punctuation)
+ID_ALPHABET = string.ascii_lowercase + string.digits
+ALPHANUMERIC = string.ascii_letters + string.digits
+
+
+def get_random_generator(seed=None, secure=False):
+    """
+    Returns the random generator of the batch helpers: the global random module by default, a generator of its own
+    for a seed, so batches can be reproduced, or one backed by the OS (secrets) for secure.
+    """
+    if secure:
+        if seed is not None:
+            raise ValueError('A secure generator can not be seeded.')
+        return secrets.SystemRandom()
+    return random if seed is None else random.Random(seed)
+
+
+def generate_strings(count, length, alphabet, required=(), unique=True, seed=None, secure=False, rng=None):
+    """
+    Generates count random strings at once. All characters of the batch are drawn in one call & cut into strings,
+    then every string gets one character of each required class at distinct random positions, so each class is
+    guaranteed without regenerating strings that miss one.
+
+    :param count: number of strings.
+    :param length: length of every string.
+    :param alphabet: characters strings are made of.
+    :param required: groups of characters every string contains at least one of i.e.: (digits, punctuation).
+    :param unique: no string is returned twice. Duplicates, which are rare for long strings, are replaced.
+    :param seed: seed for reproducible batches.
+    :param secure: use the OS random source (secrets) i.e.: for real passwords. Slower & can't be seeded.
+    :param rng: random generator to use instead of seed & secure.
+    :return: list of strings.
+    :raises ValueError: if length can't hold the required classes or more unique strings are asked for than exist.
+    """
+    rng = rng or get_random_generator(seed, secure)
+    if length < len(required):
+        raise ValueError(f'Length {length} can not hold one character of each of the {len(required)} classes.')
+    if unique and count > _count_strings(length, alphabet, required):
+        raise ValueError(f'There are less than {count} unique strings of length {length}.')
+
+    strings = []
+    seen = set()
+    while len(strings) < count:
+        missing = count - len(strings)
+        characters = rng.choices(alphabet, k=missing * length)
+        forced = [rng.choices(group, k=missing) for group in required]
+        table = _position_table(length, len(required))
+        if table is not None:
+            positions = rng.choices(table, k=missing)
+        else:
+            positions = [rng.sample(range(length), len(required)) for _ in range(missing)]
+        for index in range(missing):
+            start = index * length
+            for position, group in zip(positions[index], forced):
+                characters[start + position] = group[index]
+            generated = ''.join(characters[start:start + length])
+            if unique:
+                if generated in seen:
+                    continue
+                seen.add(generated)
+            strings.append(generated)
+    return strings
+
+
+@functools.lru_cache(maxsize=32)
+def _position_table(length, classes, max_size=50000):
+    """
+    Every way to place one character of each class at distinct positions, so the positions of a whole batch are
+    drawn in a single call. None if there are too many to keep.
+    """
+    if math.perm(length, classes) > max_size:
+        return None
+    return list(itertools.permutations(range(length), classes))
+
+
+def _count_strings(length, alphabet, required):
+    """
+    Number of strings of the length containing each required class, by inclusion-exclusion over the classes
+    missing.
+    """
+    total = 0
+    for size in range(len(required) + 1):
+        for missing in itertools.combinations(required, size):
+            total += (-1) ** size * (len(alphabet) - sum(len(group) for group in missing)) ** length
+    return total
+
+
+def generate_passwords(count, length=15, unique=True, seed=None, secure=False):
+    """
+    Generates count passwords, each with at least one lowercase letter, uppercase letter, digit & special character.
+    """
+    return generate_strings(count, length, ''.join(PASSWORD_CLASSES), PASSWORD_CLASSES, unique, seed, secure)
+
+
+def generate_custom_ids(count, length, unique=True, seed=None, secure=False):
+    """
+    Generates count ids of lowercase letters & digits.
+    """
+    return generate_strings(count, length, ID_ALPHABET, unique=unique, seed=seed, secure=secure)
+
+
+def generate_random_alphanumeric_strings(count, string_length=10, unique=True, seed=None, secure=False):
+    """
+    Generates count alphanumeric strings of the specified length.
+    """
+    return generate_strings(count, string_length, ALPHANUMERIC, unique=unique, seed=seed, secure=secure)
+
 
 def generate_password(length=15):
-    # define all possible characters
-    chars = string.ascii_letters + string.digits + string.punctuation
-    # ensure the password includes at least one lowercase letter, one uppercase letter, one special character, and one digit
-    while True:
-        password = ''.join(random.choice(chars) for _ in range(length))
-        if (any(char.islower() for char in password)
-                and any(char.isupper() for char in password)
-                and any(char in string.punctuation for char in password)
-                and any(char.isdigit() for char in password)):
-            break
-
-    return password
+    # includes at least one lowercase letter, one uppercase letter, one special character, and one digit
+    return generate_passwords(1, length)[0]
 
 def generate_custom_id(length: int) -> str:
     """
         Generates a custom id.
     """
-    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+    return generate_custom_ids(1, length)[0]
 
 def generate_random_alphanumeric_string(string_lenght=10):
     """
@@ -38,32 +146,21 @@ def generate_random_alphanumeric_string(string_lenght=10):
     :param string_lenght: length of the expected random string. Default length is 10.
     :return: alphanumeric string of specified length.
     """
-    alpha_numeric_string = string.ascii_letters + string.digits
-    return ''.join(random.choice(alpha_numeric_string) for _ in range(string_lenght))
+    return generate_random_alphanumeric_strings(1, string_lenght)[0]
 
 def get_time_difference(start_time, end_time):
-    m2 = start_time
-    m2 = datetime.strptime(m2, '%I:%M %p')
-    print(m2)
-    m3 = end_time
-    m3 = datetime.strptime(m3, '%I:%M %p')
-
-    print(m3 - m2)
-    difference = m3 - m2
-    hour_minute_array = str(difference).split(':')
+    """
+    Hours & minutes from start_time to end_time, both like '09:30 AM'. An end_time before start_time is on the next
+    day.
 
-    hour = hour_minute_array[0]+'h'
-    minute = hour_minute_array[1]+'m'
-    return hour, minute
+    :return: hours & minutes i.e.: ('1h', '05m').
+    """
+    hours, minutes = divmod(time_difference(start_time, end_time) // 60, 60)
+    return f'{hours}h', f'{minutes:02d}m'
 
 def time_to_seconds(time_str):
-    # Split the time string into hours, minutes, and seconds
-    time_components = reversed(time_str.split(':')) # seconds, mins, hours if any
-    
-    total_time_in_seconds = sum([60 ** index * int(item) 
-                                                     for index, item in enumerate(time_components)])
-
-    return total_time_in_seconds
+    # seconds of 'hh:mm:ss', 'mm:ss' or 'ss'
+    return duration_to_seconds(time_str)
 
 def seconds_to_mm_ss(seconds):
     if seconds < 0:
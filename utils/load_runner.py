@@ -0,0 +1,261 @@
+"""
+Asyncio based load generator. Every virtual user keeps its own keep-alive connection & sends requests back to back,
+optionally paced to a target request rate shared by all users.
+"""
+import asyncio
+import json
+import math
+import ssl
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+class ProtocolError(ValueError):
+    """
+    Raised for a response which isn't valid HTTP/1.x, i.e.: a connection closed in the middle of the status line.
+    Counts as a failed request like any other error.
+    """
+
+
+class AsyncHttpConnection:
+    """
+    Minimal HTTP/1.1 client for a single keep-alive connection, enough to drive JSON APIs without extra dependencies.
+    """
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.secure = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.secure else 80)
+        self.host_header = parts.netloc
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method, path, body=b'', headers=None):
+        """
+        Sends a request & returns (status, body). Reconnects if the previous response closed the connection.
+        """
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port, ssl=ssl.create_default_context() if self.secure else None)
+
+        head = [f'{method} {path} HTTP/1.1', f'Host: {self.host_header}', f'Content-Length: {len(body)}',
+                'Connection: keep-alive']
+        head.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+        self._writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+
+        try:
+            status, response_headers = await self._read_head()
+            response_body = await self._read_body(response_headers)
+        except BaseException:
+            await self.close()
+            raise
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_body
+
+    async def _read_head(self):
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by server.')
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith(b'HTTP/') or not (parts[1].isdigit() and len(parts[1]) == 3):
+            raise ProtocolError(f'Invalid status line {status_line!r}.')
+        status = int(parts[1])
+
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                return status, headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    async def _read_body(self, headers):
+        if 'content-length' in headers:
+            return await self._reader.readexactly(int(headers['content-length']))
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    return b''.join(chunks)
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+
+        body = await self._reader.read()
+        await self.close()
+        return body
+
+    async def close(self):
+        if self._writer is not None:
+            writer, self._writer, self._reader = self._writer, None, None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class LoadProfile:
+    """
+    :param concurrency: number of virtual users.
+    :param duration: seconds requests are sent for, ramp-up included.
+    :param ramp_up: seconds over which virtual users are started evenly.
+    :param target_rps: requests per second across all users. None sends as fast as the users can.
+    :param timeout: seconds after which a single request counts as failed.
+    """
+
+    def __init__(self, concurrency=10, duration=10, ramp_up=0, target_rps=None, timeout=10):
+        self.concurrency = concurrency
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.target_rps = target_rps
+        self.timeout = timeout
+
+
+class LoadReport:
+    """
+    Latency percentiles, throughput & error breakdown of a load run. Latencies are in milliseconds.
+    """
+
+    def __init__(self, latencies, outcomes, elapsed):
+        self.latencies = sorted(latencies)
+        self.outcomes = outcomes
+        self.elapsed = elapsed
+
+    @property
+    def total(self):
+        return sum(self.outcomes.values())
+
+    @property
+    def errors(self):
+        return {outcome: count for outcome, count in self.outcomes.items() if outcome != '200'}
+
+    @property
+    def error_rate(self):
+        return sum(self.errors.values()) / self.total if self.total else 0.0
+
+    @property
+    def throughput(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent):
+        """
+        Nearest-rank percentile of the latencies of all requests, failed ones included.
+        """
+        if not self.latencies:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * len(self.latencies)))
+        return self.latencies[rank - 1]
+
+    def to_dict(self):
+        return {
+            'requests': self.total,
+            'elapsed_s': round(self.elapsed, 3),
+            'throughput_rps': round(self.throughput, 2),
+            'p50_ms': round(self.percentile(50), 2),
+            'p95_ms': round(self.percentile(95), 2),
+            'p99_ms': round(self.percentile(99), 2),
+            'max_ms': round(self.latencies[-1], 2) if self.latencies else 0.0,
+            'error_rate': round(self.error_rate, 4),
+            'errors': self.errors,
+        }
+
+    def summary(self):
+        return ' '.join(f'{key}={value}' for key, value in self.to_dict().items())
+
+
+class LoadRunner:
+    """
+    Sends POST requests with JSON bodies to one url according to a LoadProfile.
+
+    :param url: endpoint under load.
+    :param payload_factory: callable(user_index, request_index) returning the JSON body of the next request.
+    :param profile: LoadProfile describing concurrency, ramp-up, duration & pacing.
+    """
+
+    HEADERS = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+
+    def __init__(self, url, payload_factory, profile):
+        self.url = url
+        parts = urlsplit(url)
+        self.path = parts.path + (f'?{parts.query}' if parts.query else '') or '/'
+        self.payload_factory = payload_factory
+        self.profile = profile
+
+    def run(self):
+        """
+        Runs the load & blocks until it is finished.
+        """
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        latencies = []
+        outcomes = Counter()
+        started = time.perf_counter()
+        deadline = started + self.profile.duration
+        pacer = _Pacer(self.profile.target_rps, started)
+
+        users = [self._virtual_user(index, started, deadline, pacer, latencies, outcomes)
+                 for index in range(self.profile.concurrency)]
+        await asyncio.gather(*users)
+
+        return LoadReport(latencies, outcomes, time.perf_counter() - started)
+
+    async def _virtual_user(self, index, started, deadline, pacer, latencies, outcomes):
+        if self.profile.ramp_up and self.profile.concurrency > 1:
+            await asyncio.sleep(self.profile.ramp_up * index / self.profile.concurrency)
+
+        connection = AsyncHttpConnection(self.url)
+        request_index = 0
+        try:
+            while True:
+                if not await pacer.wait(deadline):
+                    return
+                body = json.dumps(self.payload_factory(index, request_index)).encode()
+                request_index += 1
+
+                request_started = time.perf_counter()
+                try:
+                    status, _ = await asyncio.wait_for(connection.request('POST', self.path, body, self.HEADERS),
+                                                       self.profile.timeout)
+                    outcome = str(status)
+                except asyncio.TimeoutError:
+                    outcome = 'timeout'
+                    await connection.close()
+                except (OSError, ProtocolError, ValueError, asyncio.IncompleteReadError) as e:
+                    outcome = type(e).__name__
+                latencies.append((time.perf_counter() - request_started) * 1000)
+                outcomes[outcome] += 1
+        finally:
+            await connection.close()
+
+
+class _Pacer:
+    """
+    Hands out send slots spaced 1 / target_rps apart to all virtual users.
+    """
+
+    def __init__(self, target_rps, started):
+        self.interval = 1 / target_rps if target_rps else 0
+        self.next_slot = started
+
+    async def wait(self, deadline):
+        """
+        Waits for the next send slot. Returns False once the slot would be after the deadline.
+        """
+        now = time.perf_counter()
+        if self.interval:
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+            if slot >= deadline:
+                return False
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            return True
+        return now < deadline
@@ -0,0 +1,195 @@
+"""
+Per-browser network emulation through the Chrome DevTools protocol. Only the browser it is applied to is affected,
+so tests can go offline, throttle the connection or block requests while other browsers & workers run normally.
+"""
+
+# Bytes per second. Latency is the added round trip time in milliseconds.
+KBPS = 1000 / 8
+MBPS = 1000 * KBPS
+
+
+class NetworkProfile:
+    """
+    :param name: name used with --network-profile & the network marker.
+    :param latency: minimum round trip time in milliseconds.
+    :param download_throughput: bytes per second. -1 disables throttling.
+    :param upload_throughput: bytes per second. -1 disables throttling.
+    :param offline: fail every request like a disconnected machine.
+    """
+
+    def __init__(self, name, latency=0, download_throughput=-1, upload_throughput=-1, offline=False):
+        self.name = name
+        self.latency = latency
+        self.download_throughput = download_throughput
+        self.upload_throughput = upload_throughput
+        self.offline = offline
+
+    def to_cdp(self):
+        return {
+            'offline': self.offline,
+            'latency': self.latency,
+            'downloadThroughput': self.download_throughput,
+            'uploadThroughput': self.upload_throughput,
+        }
+
+
+# Throttling presets as used by Chrome DevTools & Lighthouse.
+NETWORK_PROFILES = {profile.name: profile for profile in (
+    NetworkProfile('no-throttling'),
+    NetworkProfile('offline', offline=True),
+    NetworkProfile('slow-3g', latency=2000, download_throughput=400 * KBPS, upload_throughput=400 * KBPS),
+    NetworkProfile('fast-3g', latency=562.5, download_throughput=1440 * KBPS, upload_throughput=675 * KBPS),
+    NetworkProfile('slow-4g', latency=150, download_throughput=1.6 * MBPS, upload_throughput=750 * KBPS),
+    NetworkProfile('4g', latency=20, download_throughput=4 * MBPS, upload_throughput=3 * MBPS),
+    NetworkProfile('dsl', latency=5, download_throughput=2 * MBPS, upload_throughput=1 * MBPS),
+    NetworkProfile('wifi', latency=2, download_throughput=30 * MBPS, upload_throughput=15 * MBPS),
+)}
+
+# URL patterns for Network.setBlockedURLs, * matches any characters.
+BLOCK_PRESETS = {
+    'analytics': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*segment.io*',
+                  '*segment.com/analytics*', '*hotjar.com*', '*mixpanel.com*', '*amplitude.com*', '*fullstory.com*',
+                  '*clarity.ms*', '*facebook.net*', '*intercom.io*', '*intercomcdn.com*'],
+    'fonts': ['*fonts.googleapis.com*', '*fonts.gstatic.com*', '*use.typekit.net*', '*.woff', '*.woff2', '*.ttf',
+              '*.otf', '*.eot'],
+    'images': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.ico'],
+    'media': ['*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav'],
+}
+
+
+def get_network_profile(name):
+    try:
+        return NETWORK_PROFILES[name]
+    except KeyError:
+        raise ValueError(f'Invalid network profile {name}. Please try with one of: '
+                         f'{", ".join(sorted(NETWORK_PROFILES))}.') from None
+
+
+def expand_block_patterns(patterns):
+    """
+    Replaces preset names (analytics, fonts, images, media) with their URL patterns. Other values are kept as patterns.
+    """
+    expanded = []
+    for pattern in patterns:
+        for url in BLOCK_PRESETS.get(pattern, [pattern]):
+            if url not in expanded:
+                expanded.append(url)
+    return expanded
+
+
+class NetworkConditioner:
+    """
+    Applies network profiles & blocked URLs to one Chrome browser.
+
+    :param driver: Chrome WebDriver.
+    :param default_profile: profile name restored by reset(). None leaves the network unthrottled.
+    :param default_blocked: URL patterns or preset names blocked by default & restored by reset().
+
+    Usage:
+        network = get_network_conditioner(driver)
+        with network.conditions('slow-3g', block=['fonts']):
+            driver.get(url)
+    """
+
+    def __init__(self, driver, default_profile=None, default_blocked=()):
+        if not hasattr(driver, 'execute_cdp_cmd'):
+            raise RuntimeError('Network conditions need a Chromium based browser supporting the DevTools protocol.')
+        self.driver = driver
+        self.default_profile = get_network_profile(default_profile or 'no-throttling')
+        self.default_blocked = expand_block_patterns(default_blocked)
+        self.profile = NETWORK_PROFILES['no-throttling']
+        self.blocked = []
+        self._enabled = False
+
+    @property
+    def modified(self):
+        """
+        True if the current conditions differ from the defaults.
+        """
+        return self.profile is not self.default_profile or self.blocked != self.default_blocked
+
+    def emulate(self, profile):
+        """
+        Applies a network profile, given by name or as NetworkProfile.
+        """
+        if isinstance(profile, str):
+            profile = get_network_profile(profile)
+        self._enable()
+        self.driver.execute_cdp_cmd('Network.emulateNetworkConditions', profile.to_cdp())
+        self.profile = profile
+
+    def go_offline(self):
+        self.emulate('offline')
+
+    def go_online(self):
+        """
+        Restores the default profile, or no throttling if the default is offline.
+        """
+        self.emulate(self.default_profile if not self.default_profile.offline else 'no-throttling')
+
+    def block(self, *patterns):
+        """
+        Fails requests to URLs matching any pattern. Preset names (analytics, fonts, images, media) can be used.
+        """
+        self._set_blocked(self.blocked + [url for url in expand_block_patterns(patterns) if url not in self.blocked])
+
+    def unblock(self, *patterns):
+        removed = expand_block_patterns(patterns)
+        self._set_blocked([url for url in self.blocked if url not in removed])
+
+    def reset(self):
+        """
+        Restores the default profile & blocked URLs. Nothing is sent if they are in place already.
+        """
+        if self.profile is not self.default_profile:
+            self.emulate(self.default_profile)
+        if self.blocked != self.default_blocked:
+            self._set_blocked(self.default_blocked)
+
+    def conditions(self, profile=None, block=()):
+        """
+        Context manager applying a profile & blocked URLs for the duration of the block only.
+        """
+        return _Conditions(self, profile, block)
+
+    def _set_blocked(self, urls):
+        self._enable()
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(urls)})
+        self.blocked = list(urls)
+
+    def _enable(self):
+        if not self._enabled:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self._enabled = True
+
+
+class _Conditions:
+
+    def __init__(self, conditioner, profile, block):
+        self.conditioner = conditioner
+        self.profile = profile
+        self.block = block
+
+    def __enter__(self):
+        if self.profile is not None:
+            self.conditioner.emulate(self.profile)
+        if self.block:
+            self.conditioner.block(*self.block)
+        return self.conditioner
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.conditioner.reset()
+
+
+def get_network_conditioner(driver, default_profile=None, default_blocked=()):
+    """
+    Returns the conditioner of a driver, creating it on first use. The defaults are only used when it is created &
+    applied right away.
+    """
+    conditioner = getattr(driver, 'network_conditioner', None)
+    if conditioner is None:
+        conditioner = NetworkConditioner(driver, default_profile, default_blocked)
+        driver.network_conditioner = conditioner
+        if conditioner.modified:
+            conditioner.reset()
+    return conditioner
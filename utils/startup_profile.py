@@ -0,0 +1,140 @@
+"""
+Startup profile of the suite. Runs a `--collect-only` with `python -X importtime` & reports the wall time & the modules
+which took longest to import, so slow imports creeping into collection are caught early.
+
+Usage:
+    python -m utils.startup_profile                                   # whole tree
+    python -m utils.startup_profile testcases/api --forbid selenium   # API-only runs must not import selenium
+    python -m utils.startup_profile --max-ms 1000 --json output/startup_profile.json
+
+Exits with 1 if the collection is slower than --max-ms or imports a forbidden package.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from utils.app_constants import AppConstant
+
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$')
+
+
+class ImportRecord:
+    """
+    One line of `-X importtime` output. Times are in microseconds, depth is the nesting level of the import.
+    """
+
+    def __init__(self, module, self_us, cumulative_us, depth):
+        self.module = module
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+    @property
+    def package(self):
+        return self.module.split('.')[0]
+
+
+def parse_import_times(stderr):
+    records = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def profile_collection(pytest_args=(), runs=3):
+    """
+    Collects the tests `runs` times, the first run only warms up the bytecode & file system caches.
+
+    :return: (median wall time in seconds of the measured runs, import records of the last run)
+    """
+    command = [sys.executable, '-X', 'importtime', '-m', 'pytest', '--collect-only', '-q', '-s', '-p', 'no:cacheprovider',
+               *pytest_args]
+    timings = []
+    result = None
+    for _ in range(max(runs, 2)):
+        started = time.perf_counter()
+        result = subprocess.run(command, cwd=AppConstant.PROJECT_ROOT, capture_output=True, text=True)
+        timings.append(time.perf_counter() - started)
+
+    if result.returncode not in (0, 5):
+        raise RuntimeError(f'Collection failed with exit code {result.returncode}:\n{result.stdout}{result.stderr}')
+
+    measured = sorted(timings[1:])
+    return measured[len(measured) // 2], parse_import_times(result.stderr)
+
+
+def top_packages(records, limit):
+    """
+    Cumulative import time per top level package, slowest first.
+    """
+    totals = {}
+    for record in records:
+        if record.depth == 0:
+            totals[record.package] = totals.get(record.package, 0) + record.cumulative_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def project_modules(records, limit):
+    """
+    Own import time of the modules of this project, slowest first.
+    """
+    project = {'conftest', 'pages', 'resources', 'testcases', 'utils'}
+    return sorted((record for record in records if record.package in project),
+                  key=lambda record: record.cumulative_us, reverse=True)[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Profile the import & collection time of the suite.')
+    parser.add_argument('pytest_args', nargs='*', help='arguments passed to pytest, i.e.: testcases/api')
+    parser.add_argument('--runs', type=int, default=3, help='number of collections, the first one is a warm up')
+    parser.add_argument('--top', type=int, default=15, help='number of packages & modules listed')
+    parser.add_argument('--max-ms', type=float, help='fail if the median collection time exceeds this')
+    parser.add_argument('--forbid', action='append', default=[], help='fail if this package is imported')
+    parser.add_argument('--json', help='also write the report to this file')
+    args = parser.parse_args(argv)
+
+    wall_time, records = profile_collection(args.pytest_args, args.runs)
+    total_us = sum(record.cumulative_us for record in records if record.depth == 0)
+    imported = {record.package for record in records}
+
+    print(f'Collection took {wall_time * 1000:.0f} ms (median of {max(args.runs, 2) - 1}), '
+          f'imports {total_us / 1000:.0f} ms in {len(records)} modules.')
+    print('\nSlowest packages (cumulative ms):')
+    for package, cumulative_us in top_packages(records, args.top):
+        print(f'  {cumulative_us / 1000:8.1f}  {package}')
+    print('\nSlowest project modules (cumulative ms):')
+    for record in project_modules(records, args.top):
+        print(f'  {record.cumulative_us / 1000:8.1f}  {record.module}')
+
+    failures = []
+    if args.max_ms is not None and wall_time * 1000 > args.max_ms:
+        failures.append(f'collection took {wall_time * 1000:.0f} ms, the limit is {args.max_ms:.0f} ms')
+    failures.extend(f'{package} was imported' for package in args.forbid if package in imported)
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w') as report_file:
+            json.dump({
+                'pytest_args': args.pytest_args,
+                'collection_ms': round(wall_time * 1000, 1),
+                'import_ms': round(total_us / 1000, 1),
+                'packages': {package: round(us / 1000, 2) for package, us in top_packages(records, args.top)},
+                'project_modules': {record.module: round(record.cumulative_us / 1000, 2)
+                                    for record in project_modules(records, args.top)},
+                'failures': failures,
+            }, report_file, indent=2)
+
+    for failure in failures:
+        print(f'\nFAILED: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
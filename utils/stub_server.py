@@ -0,0 +1,241 @@
+"""
+Local stand-in for the qa-assessment application, so tests can run without network access & without remote latency
+dominating their timings. Serves the login page, the dashboard & the login API with markup & responses matching what
+LoginPage, DashboardPage & login_response_schema.json expect.
+"""
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from resources.data import Data
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Login</title></head>
+<body>
+<form id="login-form" class="mantine-Paper-root">
+    <div class="mantine-TextInput-root">
+        <label for="email">Email</label>
+        <input id="email" class="mantine-Input-input mantine-TextInput-input" type="email" autocomplete="off">
+    </div>
+    <div class="mantine-PasswordInput-root">
+        <label for="password">Password</label>
+        <div class="mantine-PasswordInput-input">
+            <input id="password" class="mantine-PasswordInput-innerInput" type="password" autocomplete="off">
+        </div>
+    </div>
+    <p id="login-error" role="alert" hidden></p>
+    <button type="submit" class="mantine-Button-root"><span class="mantine-Button-label">Sign in</span></button>
+</form>
+<script>
+if (localStorage.getItem('token')) { location.replace('/dashboard'); }
+document.getElementById('login-form').addEventListener('submit', function (event) {
+    event.preventDefault();
+    fetch('/api/auth/login', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({email: document.getElementById('email').value,
+                              password: document.getElementById('password').value, rememberMe: true})
+    }).then(function (response) {
+        if (!response.ok) { throw new Error('Invalid email or password'); }
+        return response.json();
+    }).then(function (auth) {
+        localStorage.setItem('token', auth.token);
+        localStorage.setItem('user', JSON.stringify(auth));
+        location.assign('/dashboard');
+    }).catch(function (error) {
+        var message = document.getElementById('login-error');
+        message.textContent = error.message;
+        message.hidden = false;
+    });
+});
+</script>
+</body>
+</html>
+"""
+
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Dashboard</title></head>
+<body>
+<script>if (!localStorage.getItem('token')) { location.replace('/login'); }</script>
+<nav class="mantine-Navbar-root">
+    <a href="/dashboard">Dashboard</a>
+    <a href="/content-manager">Content Manager</a>
+</nav>
+<main><h1>Dashboard</h1></main>
+</body>
+</html>
+"""
+
+PAGES = {
+    '/': LOGIN_PAGE,
+    '/login': LOGIN_PAGE,
+    '/dashboard': DASHBOARD_PAGE,
+}
+
+
+def create_token(user_id, email, ttl=3600):
+    """
+    Creates an unsigned JWT shaped token carrying the user & an expiry claim.
+    """
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip('=')
+
+    claims = {'sub': email, 'id': user_id, 'exp': int(time.time()) + ttl}
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(claims)}.stub"
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers & body are written separately, Nagle's algorithm would hold the body back for a delayed ACK.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.inject_latency()
+        path = self.path.split('?')[0]
+        if path in PAGES:
+            self.send_content(200, PAGES[path].encode(), 'text/html; charset=utf-8')
+        elif path == '/favicon.ico':
+            self.send_content(204, b'', 'image/x-icon')
+        else:
+            self.send_json(404, {'message': 'Not Found'})
+
+    def do_POST(self):
+        self.server.inject_latency()
+        if self.path.split('?')[0] != '/api/auth/login':
+            self.send_json(404, {'message': 'Not Found'})
+        elif self.server.inject_error():
+            self.discard_body()
+            self.send_json(500, {'message': 'Injected error'})
+        else:
+            self.handle_login()
+
+    def handle_login(self):
+        try:
+            body = json.loads(self.discard_body() or b'{}')
+        except ValueError:
+            self.send_json(400, {'message': 'Malformed JSON request'})
+            return
+
+        user = self.server.users.get(body.get('email'))
+        if user is None or user['password'] != body.get('password'):
+            self.send_json(401, {'message': 'Bad credentials'})
+            return
+
+        self.send_json(200, {
+            'token': create_token(user['id'], body['email']),
+            'type': 'Bearer',
+            'id': user['id'],
+            'email': body['email'],
+            'fullName': user['fullName'],
+            'role': 'ROLE_USER',
+        })
+
+    def discard_body(self):
+        """
+        Reads the request body, so the keep-alive connection stays usable. Returns the body.
+        """
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def send_json(self, status, payload):
+        self.send_content(status, json.dumps(payload).encode(), 'application/json')
+
+    def send_content(self, status, content, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, users, latency=0.0, latency_jitter=0.0, error_rate=0.0, seed=None):
+        super().__init__(address, StubRequestHandler)
+        self.users = users
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def inject_latency(self):
+        if self.latency or self.latency_jitter:
+            with self._random_lock:
+                jitter = self._random.uniform(0, self.latency_jitter)
+            time.sleep(self.latency + jitter)
+
+    def inject_error(self):
+        if not self.error_rate:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+
+class StubServer:
+    """
+    Threaded HTTP server serving the application stand-in on localhost.
+
+    Usage:
+        with StubServer(latency=0.05, error_rate=0.01) as server:
+            requests.post(server.login_url, json=...)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, users=None, latency=0.0, latency_jitter=0.0, error_rate=0.0,
+                 seed=None):
+        """
+        :param host: interface to listen on.
+        :param port: port to listen on. 0 picks a free port.
+        :param users: dict of email -> password accepted by the login endpoint. Defaults to the user in Data.
+        :param latency: seconds added to every response.
+        :param latency_jitter: up to this many seconds are added randomly on top of latency.
+        :param error_rate: share of login requests answered with 500, between 0 & 1.
+        :param seed: seed for the latency jitter & error injection, for reproducible experiments.
+        """
+        if users is None:
+            data = Data()
+            users = {data.user_email: data.user_password}
+
+        self.httpd = StubHTTPServer((host, port), {
+            email: {'id': index + 1, 'password': password, 'fullName': email.split('@')[0]}
+            for index, (email, password) in enumerate(users.items())
+        }, latency, latency_jitter, error_rate, seed)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def login_page_url(self):
+        return f'{self.base_url}/login'
+
+    @property
+    def login_url(self):
+        return f'{self.base_url}/api/auth/login'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='stub-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,325 @@
+"""
+Streams test data, i.e.: user accounts, from CSV, JSONL & .properties files without loading them into memory.
+
+    CSV         header line with the field names, one record per row.
+    JSONL       one JSON object per line.
+    properties  <record>.<field>=<value> lines, the lines of a record next to each other:
+                    user1.email=first@example.com
+                    user1.password=secret
+
+A source indexes the byte offset of every record on first use, so single records can be read by number, pytest can
+be parametrized with record numbers instead of records & parallel workers can lease distinct accounts from a pool.
+"""
+import contextlib
+import csv
+import io
+import json
+import os
+import socket
+import time
+from array import array
+
+from utils.app_constants import AppConstant
+from utils.file_lock import FileLock
+
+FORMATS = ('.csv', '.jsonl', '.properties')
+
+
+class DataSource:
+    """
+    Records of one data file. Iterating streams the records from disk, everything else goes through the offset index.
+
+    :param path: path of a .csv, .jsonl or .properties file. Relative paths are resolved against resources/test_data.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.join(AppConstant.TEST_DATA_FOLDER, path)
+        self.name = os.path.basename(self.path)
+        self.format = os.path.splitext(self.path)[1].lower()
+        if self.format not in FORMATS:
+            raise ValueError(f'Unsupported test data file {path}. Please use one of: {", ".join(FORMATS)}.')
+        self._fields = None
+        self._offsets = None
+
+    @property
+    def fields(self):
+        """
+        Field names of a CSV file, read from its header line.
+        """
+        if self._fields is None and self.format == '.csv':
+            with open(self.path, 'rb') as data_file:
+                self._fields = next(csv.reader([data_file.readline().decode('utf-8-sig')]), [])
+        return self._fields
+
+    @property
+    def offsets(self):
+        """
+        Byte offset of every record, built by scanning the file once. Kept as an array of 8 byte integers.
+        """
+        if self._offsets is None:
+            with open(self.path, 'rb') as data_file:
+                self._offsets = array('q', (offset for offset, _ in self._scan(data_file)))
+        return self._offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self):
+        with open(self.path, 'rb') as data_file:
+            for _, lines in self._scan(data_file):
+                yield self._parse(lines)
+
+    def record_at(self, number):
+        """
+        Reads the record with the given number, counted from 0, by seeking to its offset.
+        """
+        with open(self.path, 'rb') as data_file:
+            data_file.seek(self.offsets[number])
+            _, lines = next(self._scan(data_file))
+        return self._parse(lines)
+
+    def refs(self, limit=None):
+        """
+        References to the records, which parametrize tests without reading the records during collection.
+        """
+        return [DataRef(self, number) for number in range(min(len(self), limit) if limit else len(self))]
+
+    def _scan(self, data_file):
+        """
+        Yields (offset, lines) of every record from the current position of a binary file.
+        """
+        if self.format == '.csv' and data_file.tell() == 0:
+            data_file.readline()
+
+        position = data_file.tell()
+        offset = position
+        record = []
+        quotes = 0
+        record_prefix = None
+        for line in data_file:
+            line_offset, position = position, position + len(line)
+            if self.format == '.csv':
+                if not record:
+                    offset = line_offset
+                record.append(line)
+                # A quoted value may hold line breaks, the record goes on until every quote is closed.
+                quotes += line.count(b'"')
+                if quotes % 2 == 0:
+                    if len(record) > 1 or line.strip():
+                        yield offset, record
+                    record = []
+                    quotes = 0
+            elif self.format == '.jsonl':
+                if line.strip():
+                    yield line_offset, [line]
+            else:
+                stripped = line.strip()
+                if not stripped or stripped.startswith((b'#', b'!')):
+                    continue
+                prefix = stripped.split(b'.', 1)[0]
+                if record and prefix != record_prefix:
+                    yield offset, record
+                    record = []
+                if not record:
+                    offset = line_offset
+                record_prefix = prefix
+                record.append(stripped)
+        if record and self.format == '.properties':
+            yield offset, record
+
+    def _parse(self, lines):
+        text = b''.join(lines).decode('utf-8') if self.format != '.properties' else None
+        if self.format == '.csv':
+            return dict(zip(self.fields, next(csv.reader(io.StringIO(text)))))
+        if self.format == '.jsonl':
+            return json.loads(text)
+
+        record = {}
+        for line in lines:
+            line = line.decode('utf-8')
+            separator = min((position for position in (line.find('='), line.find(':')) if position > -1),
+                            default=len(line))
+            key, value = line[:separator].strip(), line[separator + 1:].strip()
+            record[key.partition('.')[2] or key] = value
+        return record
+
+
+class DataRef:
+    """
+    Record of a data source by number. Its repr is used as test id i.e.: accounts.csv:42.
+    """
+
+    def __init__(self, source, number):
+        self.source = source
+        self.number = number
+
+    def load(self):
+        return self.source.record_at(self.number)
+
+    def __repr__(self):
+        return f'{self.source.name}:{self.number}'
+
+
+class AccountPool:
+    """
+    Leases the accounts of a data source to tests, so parallel workers & threads never use the same account at the
+    same time. Leases are kept by account number in a JSON file guarded by a FileLock, together with a cursor handing
+    the accounts out round-robin, so logins are spread over all accounts instead of hitting one until it gets locked
+    out. Picking a free number needs no record, the leased account is only read once the lock is released. Every
+    lease is stored as [owner, expires_at] to keep the file small.
+
+    Usage:
+        with pool.leased() as account:
+            login_page.login(account['email'], account['password'])
+
+    :param source: DataSource of the accounts.
+    :param lease_file: JSON file shared by everyone leasing from the pool.
+    :param key_field: field identifying an account handed to release().
+    :param lease_ttl: seconds after which a lease is considered abandoned, i.e.: by a crashed worker.
+    :param timeout: maximum time in seconds lease() waits for a free account.
+    :param poll_interval: time in seconds between two attempts to find a free account.
+    """
+
+    def __init__(self, source, lease_file, key_field='email', lease_ttl=600, timeout=300, poll_interval=0.5):
+        self.source = source
+        self.lease_file = lease_file
+        self.key_field = key_field
+        self.lease_ttl = lease_ttl
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+        self._numbers = {}
+
+    def lease(self):
+        """
+        Returns the next account nobody else holds.
+
+        :raises TimeoutError: if every account stays leased for timeout seconds.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            number = self._try_lease()
+            if number is not None:
+                try:
+                    account = self.source.record_at(number)
+                except BaseException:
+                    self._release_number(number)
+                    raise
+                self._numbers[str(account[self.key_field])] = number
+                return account
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f'All {len(self.source)} accounts of {self.source.name} stayed leased for '
+                                   f'{self.timeout} seconds.')
+            time.sleep(self.poll_interval)
+
+    def release(self, account):
+        number = self._numbers.pop(str(account[self.key_field]), None)
+        if number is not None:
+            self._release_number(number)
+
+    @contextlib.contextmanager
+    def leased(self):
+        account = self.lease()
+        try:
+            yield account
+        finally:
+            self.release(account)
+
+    def release_owned(self):
+        """
+        Releases every account leased by this process, i.e.: at the end of the session.
+        """
+        self._numbers.clear()
+        with self._state() as state:
+            state['leases'] = {number: lease for number, lease in state['leases'].items() if lease[0] != self.owner}
+
+    def _release_number(self, number):
+        with self._state() as state:
+            state['leases'].pop(str(number), None)
+
+    def _try_lease(self):
+        """
+        Leases the next free account number after the cursor. Returns None if every account is leased.
+        """
+        count = len(self.source)
+        if not count:
+            raise ValueError(f'{self.source.name} holds no accounts.')
+
+        with self._state() as state:
+            now = time.time()
+            # Leases of numbers the file doesn't hold (anymore) are dropped as well.
+            leases = {number: lease for number, lease in state['leases'].items()
+                      if lease[1] > now and number.isdigit() and int(number) < count}
+            state['leases'] = leases
+            if len(leases) >= count:
+                return None
+            # Accounts are leased round-robin, so the ones right after the cursor are usually free.
+            number = state['cursor'] % count
+            while str(number) in leases:
+                number = (number + 1) % count
+            leases[str(number)] = [self.owner, now + self.lease_ttl]
+            state['cursor'] = number + 1
+            return number
+
+    @contextlib.contextmanager
+    def _state(self):
+        """
+        Holds the lock of the lease file & writes the yielded state back if the block succeeded.
+        """
+        with FileLock(f'{self.lease_file}.lock'):
+            try:
+                with open(self.lease_file) as state_file:
+                    state = json.load(state_file)
+            except (FileNotFoundError, ValueError):
+                state = {'cursor': 0, 'leases': {}}
+
+            yield state
+
+            temp_path = f'{self.lease_file}.{os.getpid()}.tmp'
+            with open(temp_path, 'w') as state_file:
+                # dumps() runs the C encoder, dump() would encode the leases piece by piece in Python.
+                state_file.write(json.dumps(state))
+            os.replace(temp_path, self.lease_file)
+
+
+_sources = {}
+_account_pool = None
+
+
+def get_data_source(path):
+    """
+    Returns the session wide DataSource of a file, so its index is built only once.
+    """
+    if path not in _sources:
+        _sources[path] = DataSource(path)
+    return _sources[path]
+
+
+def get_account_pool():
+    """
+    Returns the session wide pool of the accounts_file config, or None if no accounts file is configured. The lease
+    file is shared by all workers of the machine.
+    """
+    global _account_pool
+    if _account_pool is None:
+        import pytest
+
+        configs = pytest.configs
+        accounts_file = configs.get_config('accounts_file')
+        if not accounts_file:
+            return None
+        source = get_data_source(accounts_file)
+        _account_pool = AccountPool(source, os.path.join(AppConstant.OUTPUT_FOLDER, 'leases', f'{source.name}.json'),
+                                    lease_ttl=configs.get_duration('account_lease_ttl', 600))
+    return _account_pool
+
+
+def close_account_pool():
+    """
+    Releases the accounts this process still holds, so other workers & sessions don't wait for their leases to
+    expire.
+    """
+    global _account_pool
+    if _account_pool is not None:
+        _account_pool.release_owned()
+        _account_pool = None
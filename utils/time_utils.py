@@ -0,0 +1,211 @@
+"""
+Parses & formats times of day & durations as plain seconds, without going through datetime or timedelta objects.
+
+A format such as '%I:%M %p' is compiled once into a regular expression & cached, so parsing thousands of values, i.e.:
+every row of a scraped schedule, costs one regex match & a few int() calls per value. Supported directives are %H,
+%I, %M, %S, %p & %%. Whitespace in the format matches any amount of whitespace, like strptime.
+
+Times of day are seconds since midnight. Differences & orderings can wrap past midnight: 11:30 PM to 12:15 AM is 45
+minutes, not -23:15.
+"""
+import functools
+import re
+
+DAY = 24 * 60 * 60
+TIME_FORMAT = '%I:%M %p'
+
+# Directive -> (pattern, field, lowest value, highest value)
+DIRECTIVES = {
+    'H': (r'(\d{1,2})', 'hour', 0, 23),
+    'I': (r'(\d{1,2})', 'hour12', 1, 12),
+    'M': (r'(\d{1,2})', 'minute', 0, 59),
+    'S': (r'(\d{1,2})', 'second', 0, 59),
+    'p': (r'([AaPp][Mm])', 'period', None, None),
+}
+
+
+@functools.lru_cache(maxsize=64)
+def get_time_parser(time_format=TIME_FORMAT):
+    """
+    Compiles a format into a function turning a string into seconds since midnight.
+
+    :raises ValueError: if the format holds unsupported directives or repeats one.
+    """
+    pattern = []
+    groups = {}
+    position = 0
+    while position < len(time_format):
+        character = time_format[position]
+        if character == '%':
+            directive = time_format[position + 1:position + 2]
+            position += 2
+            if directive == '%':
+                pattern.append('%')
+                continue
+            if directive not in DIRECTIVES or DIRECTIVES[directive][1] in groups:
+                raise ValueError(f'Unsupported or repeated directive %{directive} in time format {time_format!r}.')
+            directive_pattern, field, lowest, highest = DIRECTIVES[directive]
+            groups[field] = (len(groups) + 1, lowest, highest)
+            pattern.append(directive_pattern)
+        else:
+            pattern.append(r'\s*' if character.isspace() else re.escape(character))
+            position += 1
+
+    if 'hour' in groups and 'hour12' in groups:
+        raise ValueError(f'Time format {time_format!r} holds both %H & %I.')
+    fullmatch = re.compile(''.join(pattern)).fullmatch
+    hour = groups.get('hour') or groups.get('hour12')
+    minute = groups.get('minute')
+    second = groups.get('second')
+    period = groups['period'][0] if 'period' in groups else None
+    twelve_hour = 'hour12' in groups
+
+    def read(match, group, value):
+        number = int(match.group(group[0]))
+        if not group[1] <= number <= group[2]:
+            raise ValueError(f'time data {value!r} is out of range for format {time_format!r}')
+        return number
+
+    def parse(value):
+        match = fullmatch(value.strip())
+        if match is None:
+            raise ValueError(f'time data {value!r} does not match format {time_format!r}')
+        seconds = 0
+        if hour is not None:
+            hours = read(match, hour, value)
+            if twelve_hour:
+                hours %= 12
+                if period is not None and match.group(period).lower() == 'pm':
+                    hours += 12
+            seconds = hours * 3600
+        if minute is not None:
+            seconds += read(match, minute, value) * 60
+        if second is not None:
+            seconds += read(match, second, value)
+        return seconds
+
+    return parse
+
+
+@functools.lru_cache(maxsize=64)
+def get_time_formatter(time_format=TIME_FORMAT):
+    """
+    Compiles a format into a function turning seconds since midnight into a string. Values are taken modulo a day.
+    """
+    template = re.sub(r'[{}]', lambda match: match.group() * 2, time_format)
+    template = re.sub(r'%([%HIMSp])', lambda match: {
+        '%': '%', 'H': '{H:02d}', 'I': '{I:02d}', 'M': '{M:02d}', 'S': '{S:02d}', 'p': '{p}'}[match.group(1)], template)
+
+    def format_time(seconds):
+        seconds = int(seconds) % DAY
+        hours, rest = divmod(seconds, 3600)
+        return template.format(H=hours, I=hours % 12 or 12, M=rest // 60, S=rest % 60, p='AM' if hours < 12 else 'PM')
+
+    return format_time
+
+
+def parse_time(value, time_format=TIME_FORMAT):
+    """
+    Seconds since midnight of a time of day i.e.: '09:30 PM' -> 77400.
+    """
+    return get_time_parser(time_format)(value)
+
+
+def parse_times(values, time_format=TIME_FORMAT):
+    """
+    Seconds since midnight of every value, parsed with a single compiled parser.
+    """
+    parse = get_time_parser(time_format)
+    return [parse(value) for value in values]
+
+
+def format_time(seconds, time_format=TIME_FORMAT):
+    return get_time_formatter(time_format)(seconds)
+
+
+def format_times(values, time_format=TIME_FORMAT):
+    formatter = get_time_formatter(time_format)
+    return [formatter(seconds) for seconds in values]
+
+
+def time_difference(start, end, time_format=TIME_FORMAT, wrap=True):
+    """
+    Seconds from start to end, both times of day as strings.
+
+    :param wrap: an end before start is on the next day, i.e.: '11:30 PM' to '12:15 AM' is 2700. Otherwise such
+        differences are negative.
+    """
+    parse = get_time_parser(time_format)
+    difference = parse(end) - parse(start)
+    return difference % DAY if wrap else difference
+
+
+def time_differences(starts, ends, time_format=TIME_FORMAT, wrap=True):
+    """
+    time_difference of every start & end pair.
+    """
+    parse = get_time_parser(time_format)
+    if wrap:
+        return [(parse(end) - parse(start)) % DAY for start, end in zip(starts, ends)]
+    return [parse(end) - parse(start) for start, end in zip(starts, ends)]
+
+
+def to_timeline(values, time_format=TIME_FORMAT):
+    """
+    Seconds of consecutive times of day counted from the midnight before the first one. A time earlier than the one
+    before it starts the next day, so a schedule running past midnight keeps increasing: 11 PM, 1 AM -> 82800, 90000.
+    """
+    parse = get_time_parser(time_format)
+    timeline = []
+    day = 0
+    previous = None
+    for value in values:
+        seconds = parse(value)
+        if previous is not None and seconds < previous:
+            day += DAY
+        previous = seconds
+        timeline.append(seconds + day)
+    return timeline
+
+
+def is_chronological(values, time_format=TIME_FORMAT, strict=False, max_day_wraps=0):
+    """
+    Checks times of day are in order, i.e.: the rows of a schedule.
+
+    :param strict: equal consecutive times are out of order too.
+    :param max_day_wraps: how often the times may run past midnight, i.e.: 1 for a schedule ending the next day.
+    """
+    parse = get_time_parser(time_format)
+    wraps = 0
+    previous = None
+    for value in values:
+        seconds = parse(value)
+        if previous is not None and (seconds < previous or strict and seconds == previous):
+            wraps += 1
+            if seconds == previous or wraps > max_day_wraps:
+                return False
+        previous = seconds
+    return True
+
+
+def duration_to_seconds(value):
+    """
+    Seconds of a duration like '1:02:03', '02:03' or '45'. Every ':' separated part counts 60 times the next one.
+    """
+    total = 0
+    for part in value.split(':'):
+        total = total * 60 + int(part)
+    return total
+
+
+def durations_to_seconds(values):
+    """
+    duration_to_seconds of every value, with the conversion inlined for long lists.
+    """
+    seconds = []
+    for value in values:
+        total = 0
+        for part in value.split(':'):
+            total = total * 60 + int(part)
+        seconds.append(total)
+    return seconds
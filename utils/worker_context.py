@@ -0,0 +1,53 @@
+"""
+Holds the settings & scratch folders owned by a single test worker. When tests run in parallel with pytest-xdist
+every worker gets its own context, so browsers started by different workers never share profiles or downloads.
+"""
+import os
+import shutil
+import tempfile
+
+from utils.app_constants import AppConstant
+
+
+def get_worker_id(config=None):
+    """
+    Returns the pytest-xdist worker id (gw0, gw1, ...) or 'master' when tests are not distributed.
+    """
+    worker_input = getattr(config, 'workerinput', None)
+    if worker_input is not None:
+        return worker_input['workerid']
+    return os.environ.get('PYTEST_XDIST_WORKER', 'master')
+
+
+class WorkerContext:
+    """
+    Worker local replacement for the settings cached on the pytest module. Browser versions reported by started
+    drivers are recorded here instead of in process wide environment variables.
+    """
+
+    def __init__(self, worker_id, configs, url, browser, browser_version=None,
+                 output_root=AppConstant.WORKER_OUTPUT_FOLDER):
+        self.worker_id = worker_id
+        self.configs = configs
+        self.url = url
+        self.browser = browser
+        self.browser_version = browser_version
+        self.started_browser_version = None
+        self.root_dir = os.path.join(output_root, worker_id)
+        self.downloads_dir = os.path.join(self.root_dir, 'downloads')
+        self.profiles_dir = os.path.join(self.root_dir, 'profiles')
+
+        os.makedirs(self.downloads_dir, exist_ok=True)
+        os.makedirs(self.profiles_dir, exist_ok=True)
+
+    def new_profile_dir(self):
+        """
+        Creates a fresh, empty browser profile folder owned by this worker.
+        """
+        return tempfile.mkdtemp(prefix='profile-', dir=self.profiles_dir)
+
+    def cleanup(self):
+        """
+        Removes the browser profiles created by this worker. Downloads are kept for inspection.
+        """
+        shutil.rmtree(self.profiles_dir, ignore_errors=True)